@@ -0,0 +1,211 @@
+"""User-scoped index of the codes offered as code options.
+
+Codes are indexed per user, over the computers the user configured, such that
+listing a user's codes does not scan the codes of other users in a shared
+profile. An index is checked against the count and latest modification time of
+the user's codes on each lookup, and only the codes modified since the last
+lookup are fetched. Deleted codes (detected by a count mismatch) and changes to
+the user's computers trigger a rebuild of the user's index.
+"""
+
+from __future__ import annotations
+
+import datetime
+import threading
+import typing as t
+
+from aiida import orm
+
+# The extra marking a code as hidden (see `AbstractCode.is_hidden`)
+_HIDDEN_KEY = "hidden"
+
+
+class CodeEntry(t.NamedTuple):
+    """An indexed code."""
+
+    uuid: str
+    label: str
+    computer_pk: int
+    input_plugin: str | None
+    is_hidden: bool
+
+
+class UserCodes:
+    """The index of the codes on the computers configured by a user.
+
+    Attributes
+    ----------
+    `computers` : `dict[int, tuple[str, bool]]`
+        The label and enabled state of each configured computer, keyed by pk.
+    `codes` : `dict[str, CodeEntry]`
+        The codes on the configured computers, keyed by uuid, in pk order.
+    `num_codes` : `int`
+        The number of codes on the configured computers when last checked.
+    `mtime` : `datetime.datetime | None`
+        The latest modification time of the indexed codes.
+    """
+
+    def __init__(self, user_pk: int):
+        self.user_pk = user_pk
+        self.computers: dict[int, tuple[str, bool]] = {}
+        self.codes: dict[str, CodeEntry] = {}
+        self.num_codes = 0
+        self.mtime: datetime.datetime | None = None
+
+    def refresh(self):
+        """Brings the index up to date with the database."""
+        computers = self._fetch_computers()
+        if computers.keys() != self.computers.keys():
+            self.computers = computers
+            self._rebuild()
+            return
+        self.computers = computers  # labels and enabled states may change
+
+        num_codes, mtime = self._fetch_stamp()
+        if (num_codes, mtime) == (self.num_codes, self.mtime):
+            return
+        if self.mtime is not None and mtime is not None and mtime > self.mtime:
+            self._add_codes(self._fetch_codes(modified_after=self.mtime))
+            if len(self.codes) == num_codes:
+                self.num_codes, self.mtime = num_codes, mtime
+                return
+        self._rebuild()
+
+    def get_options(
+        self,
+        input_plugin: str | None = None,
+        allow_hidden: bool = False,
+        allow_disabled: bool = False,
+    ) -> list[tuple[str, str]]:
+        """Returns the `(label@computer, uuid)` options of the indexed codes."""
+        options = []
+        for entry in self.codes.values():
+            if input_plugin and entry.input_plugin != input_plugin:
+                continue
+            if entry.is_hidden and not allow_hidden:
+                continue
+            computer_label, enabled = self.computers[entry.computer_pk]
+            if not (enabled or allow_disabled):
+                continue
+            options.append((f"{entry.label}@{computer_label}", entry.uuid))
+        return options
+
+    def _rebuild(self):
+        self.codes = {}
+        self.num_codes, self.mtime = self._fetch_stamp()
+        self._add_codes(self._fetch_codes())
+
+    def _add_codes(self, rows: list[list]):
+        for uuid, label, computer_pk, input_plugin, is_hidden in rows:
+            self.codes[uuid] = CodeEntry(
+                uuid=uuid,
+                label=label,
+                computer_pk=computer_pk,
+                input_plugin=input_plugin,
+                is_hidden=bool(is_hidden),
+            )
+
+    def _fetch_computers(self) -> dict[int, tuple[str, bool]]:
+        qb = orm.QueryBuilder()
+        qb.append(orm.Computer, project=["id", "label"], tag="computer")
+        qb.append(
+            orm.AuthInfo,
+            with_computer="computer",
+            filters={"aiidauser_id": self.user_pk},
+            project=["enabled"],
+        )
+        return {pk: (label, enabled) for pk, label, enabled in qb.iterall()}
+
+    def _code_filters(self) -> dict:
+        return {"dbcomputer_id": {"in": list(self.computers) or [-1]}}
+
+    def _fetch_stamp(self) -> tuple[int, datetime.datetime | None]:
+        qb = orm.QueryBuilder()
+        qb.append(
+            orm.Code,
+            filters=self._code_filters(),
+            project=[{"id": {"func": "count"}}, {"mtime": {"func": "max"}}],
+        )
+        num_codes, mtime = qb.one()
+        return num_codes, mtime
+
+    def _fetch_codes(
+        self,
+        modified_after: datetime.datetime | None = None,
+    ) -> list[list]:
+        filters = self._code_filters()
+        if modified_after is not None:
+            filters["mtime"] = {">": modified_after}
+        qb = orm.QueryBuilder()
+        qb.append(
+            orm.Code,
+            filters=filters,
+            project=[
+                "uuid",
+                "label",
+                "dbcomputer_id",
+                "attributes.input_plugin",
+                f"extras.{_HIDDEN_KEY}",
+            ],
+        )
+        qb.order_by({orm.Code: {"id": "asc"}})
+        return qb.all()
+
+
+class CodeIndex:
+    """A thread-safe index of the codes of each user, keyed by email."""
+
+    def __init__(self):
+        self._users: dict[str, UserCodes] = {}
+        self._lock = threading.Lock()
+
+    def get_options(
+        self,
+        user_email: str,
+        input_plugin: str | None = None,
+        allow_hidden: bool = False,
+        allow_disabled: bool = False,
+    ) -> list[tuple[str, str]]:
+        """Returns the code options of the user.
+
+        Parameters
+        ----------
+        `user_email` : `str`
+            The email of the user.
+        `input_plugin` : `str`, optional
+            If provided, only codes of this calculation plugin are returned.
+        `allow_hidden` : `bool`
+            Whether hidden codes are returned.
+        `allow_disabled` : `bool`
+            Whether codes on computers disabled for the user are returned.
+
+        Returns
+        -------
+        `list[tuple[str, str]]`
+            The `(label@computer, uuid)` code options, in creation order.
+
+        Raises
+        ------
+        `NotExistent`
+            If no user has the given email.
+        """
+        with self._lock:
+            user_codes = self._users.get(user_email)
+            if user_codes is None:
+                user = orm.User.collection.get(email=user_email)
+                user_codes = self._users[user_email] = UserCodes(user.pk)
+            user_codes.refresh()
+            return user_codes.get_options(input_plugin, allow_hidden, allow_disabled)
+
+    def clear(self):
+        """Clears the index of all users."""
+        with self._lock:
+            self._users.clear()
+
+
+_index = CodeIndex()
+
+
+def get_code_index() -> CodeIndex:
+    """Returns the kernel-wide code index."""
+    return _index
@@ -0,0 +1,30 @@
+"""Opt-in instrumentation of database queries and widget traffic."""
+
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .comms import CommRecorder, CommSnapshot, CommStats
+    from .queries import QueryRecorder, QueryStats, track_queries
+
+__all__ = [
+    "CommRecorder",
+    "CommSnapshot",
+    "CommStats",
+    "QueryRecorder",
+    "QueryStats",
+    "track_queries",
+]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "CommRecorder": ".comms",
+        "CommSnapshot": ".comms",
+        "CommStats": ".comms",
+        "QueryRecorder": ".queries",
+        "QueryStats": ".queries",
+        "track_queries": ".queries",
+    },
+)
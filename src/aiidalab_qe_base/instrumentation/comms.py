@@ -0,0 +1,235 @@
+"""Accounting of the widget comm traffic sent to the frontend.
+
+While a `CommRecorder` is recording, the widgets opened and the messages sent
+to their frontend models (trait sync updates and custom messages) are counted
+per widget class. Snapshots of the counts can be diffed around an operation,
+e.g. rendering a panel, to measure its frontend-bound traffic without a
+browser. Messages are counted when sent by the kernel, whether or not a
+frontend is connected.
+
+Example::
+
+    with CommRecorder() as recorder:
+        before = recorder.snapshot()
+        panel.render()
+        traffic = recorder.snapshot() - before
+    traffic.total.num_updates
+"""
+
+from __future__ import annotations
+
+import functools
+import json
+import threading
+import typing as t
+
+import ipywidgets as ipw
+
+
+class CommStats:
+    """The comm traffic of a widget class.
+
+    Attributes
+    ----------
+    `num_created` : `int`
+        The number of widgets opened (comms created).
+    `num_updates` : `int`
+        The number of trait sync (`update`) messages.
+    `num_custom` : `int`
+        The number of custom messages.
+    `num_bytes` : `int`
+        The approximate size of the messages, JSON content and binary buffers.
+    """
+
+    FIELDS = ("num_created", "num_updates", "num_custom", "num_bytes")
+
+    def __init__(self, **counts: int):
+        for field in self.FIELDS:
+            setattr(self, field, counts.get(field, 0))
+
+    @property
+    def num_messages(self) -> int:
+        """The number of messages sent, including the comm opening."""
+        return self.num_created + self.num_updates + self.num_custom
+
+    def as_dict(self) -> dict[str, int]:
+        return {field: getattr(self, field) for field in self.FIELDS}
+
+    def __add__(self, other: CommStats) -> CommStats:
+        return CommStats(
+            **{
+                field: getattr(self, field) + getattr(other, field)
+                for field in self.FIELDS
+            }
+        )
+
+    def __sub__(self, other: CommStats) -> CommStats:
+        return CommStats(
+            **{
+                field: getattr(self, field) - getattr(other, field)
+                for field in self.FIELDS
+            }
+        )
+
+    def __eq__(self, other):
+        if not isinstance(other, CommStats):
+            return NotImplemented
+        return self.as_dict() == other.as_dict()
+
+    def __bool__(self):
+        return any(self.as_dict().values())
+
+    def __repr__(self):
+        counts = ", ".join(f"{key}={value}" for key, value in self.as_dict().items())
+        return f"CommStats({counts})"
+
+
+class CommSnapshot:
+    """Immutable comm traffic counts per widget class.
+
+    Subtracting snapshots yields the traffic between them, omitting widget
+    classes without traffic.
+    """
+
+    def __init__(self, stats: dict[str, CommStats]):
+        self._stats = {name: CommStats(**s.as_dict()) for name, s in stats.items()}
+
+    def __getitem__(self, widget_class: str) -> CommStats:
+        return CommStats(**self._stats.get(widget_class, CommStats()).as_dict())
+
+    def __iter__(self):
+        return iter(self._stats)
+
+    def __len__(self):
+        return len(self._stats)
+
+    @property
+    def total(self) -> CommStats:
+        """The traffic of all widget classes."""
+        return sum(self._stats.values(), CommStats())
+
+    def diff(self, other: CommSnapshot) -> CommSnapshot:
+        """Returns the traffic from the other (earlier) snapshot to this one."""
+        stats = {}
+        for name in self._stats.keys() | other._stats.keys():
+            if delta := self[name] - other[name]:
+                stats[name] = delta
+        return CommSnapshot(stats)
+
+    def __sub__(self, other: CommSnapshot) -> CommSnapshot:
+        return self.diff(other)
+
+    def as_dict(self) -> dict[str, dict[str, int]]:
+        return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def __repr__(self):
+        return f"CommSnapshot({self.as_dict()})"
+
+
+class CommRecorder:
+    """Records the comm traffic of all widgets while active.
+
+    Recorders may be nested, in which case each records all traffic.
+    """
+
+    def __init__(self):
+        self._stats: dict[str, CommStats] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> CommRecorder:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def total(self) -> CommStats:
+        """The recorded traffic of all widget classes."""
+        return self.snapshot().total
+
+    def snapshot(self) -> CommSnapshot:
+        """Returns a snapshot of the recorded traffic per widget class."""
+        with self._lock:
+            return CommSnapshot(self._stats)
+
+    def start(self):
+        """Starts recording."""
+        _activate(self)
+
+    def stop(self):
+        """Stops recording. The recorded traffic is kept."""
+        _deactivate(self)
+
+    def reset(self):
+        """Clears the recorded traffic."""
+        with self._lock:
+            self._stats.clear()
+
+    def _record(self, widget_class: str, **increments: int):
+        with self._lock:
+            stats = self._stats.setdefault(widget_class, CommStats())
+            for key, value in increments.items():
+                setattr(stats, key, getattr(stats, key) + value)
+
+
+_recorders: list[CommRecorder] = []
+_recorders_lock = threading.Lock()
+_originals: dict[str, t.Callable] = {}
+
+
+def _record(widget: ipw.Widget, **increments: int):
+    widget_class = type(widget).__qualname__
+    for recorder in list(_recorders):
+        recorder._record(widget_class, **increments)
+
+
+def _message_size(msg: dict, buffers) -> int:
+    size = len(json.dumps(msg, default=str))
+    for buffer in buffers or []:
+        size += memoryview(buffer).nbytes
+    return size
+
+
+def _open(open: t.Callable) -> t.Callable:
+    @functools.wraps(open)
+    def wrapper(self: ipw.Widget):
+        if self.comm is None:
+            state = {"state": self.get_state()}
+            _record(self, num_created=1, num_bytes=_message_size(state, None))
+        return open(self)
+
+    return wrapper
+
+
+def _send(send: t.Callable) -> t.Callable:
+    @functools.wraps(send)
+    def wrapper(self: ipw.Widget, msg: dict, buffers=None):
+        kind = "num_updates" if msg.get("method") == "update" else "num_custom"
+        _record(self, **{kind: 1, "num_bytes": _message_size(msg, buffers)})
+        return send(self, msg, buffers=buffers)
+
+    return wrapper
+
+
+def _activate(recorder: CommRecorder):
+    with _recorders_lock:
+        if recorder in _recorders:
+            return
+        if not _recorders:
+            _originals["open"] = ipw.Widget.open
+            _originals["_send"] = ipw.Widget._send
+            ipw.Widget.open = _open(_originals["open"])  # type: ignore
+            ipw.Widget._send = _send(_originals["_send"])  # type: ignore
+        _recorders.append(recorder)
+
+
+def _deactivate(recorder: CommRecorder):
+    with _recorders_lock:
+        if recorder not in _recorders:
+            return
+        _recorders.remove(recorder)
+        if not _recorders:
+            for name, method in _originals.items():
+                setattr(ipw.Widget, name, method)
+            _originals.clear()
@@ -0,0 +1,214 @@
+"""Counting and timing of the database queries issued by components.
+
+Methods decorated with `track_queries` are attributed the SQL queries (counted
+via SQLAlchemy engine events) and the node loads (`load_node`, `load_code`)
+they issue while a `QueryRecorder` is recording. Node loads are counted by
+wrapping the entity loader shared by `load_node` and `load_code`, however these
+were imported, and only while recording. Outside of recording, the decorator
+only costs a check of the number of active recorders.
+
+Example::
+
+    with QueryRecorder() as recorder:
+        model.update(user_email)
+    recorder.stats["CodeModel._get_codes"].num_queries
+"""
+
+from __future__ import annotations
+
+import functools
+import threading
+import time
+import typing as t
+
+from aiida.orm.utils import loaders
+
+UNTRACKED = "<untracked>"
+
+F = t.TypeVar("F", bound=t.Callable)
+
+
+class QueryStats:
+    """The queries attributed to a method (or to `UNTRACKED` code).
+
+    Attributes
+    ----------
+    `num_calls` : `int`
+        The number of calls of the method.
+    `num_queries` : `int`
+        The number of SQL queries.
+    `query_time` : `float`
+        The total duration of the SQL queries, in seconds.
+    `num_loads` : `int`
+        The number of `load_node`/`load_code` calls.
+    """
+
+    def __init__(self):
+        self.num_calls = 0
+        self.num_queries = 0
+        self.query_time = 0.0
+        self.num_loads = 0
+
+    def __iadd__(self, other: QueryStats) -> QueryStats:
+        self.num_calls += other.num_calls
+        self.num_queries += other.num_queries
+        self.query_time += other.query_time
+        self.num_loads += other.num_loads
+        return self
+
+    def __repr__(self):
+        return (
+            f"QueryStats(num_calls={self.num_calls}, "
+            f"num_queries={self.num_queries}, "
+            f"query_time={self.query_time:.4f}, "
+            f"num_loads={self.num_loads})"
+        )
+
+
+class QueryRecorder:
+    """Records the queries issued while active, per tracked method.
+
+    Queries are attributed to the innermost tracked method on the stack of the
+    issuing thread, or to `UNTRACKED`. Recorders may be nested, in which case
+    each records all queries.
+    """
+
+    def __init__(self):
+        self.stats: dict[str, QueryStats] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> QueryRecorder:
+        self.start()
+        return self
+
+    def __exit__(self, *_):
+        self.stop()
+
+    @property
+    def total(self) -> QueryStats:
+        """The sum of the stats of all methods."""
+        total = QueryStats()
+        with self._lock:
+            for stats in self.stats.values():
+                total += stats
+        return total
+
+    @property
+    def num_queries(self) -> int:
+        """The total number of SQL queries."""
+        return self.total.num_queries
+
+    @property
+    def num_loads(self) -> int:
+        """The total number of node loads."""
+        return self.total.num_loads
+
+    def start(self):
+        """Starts recording."""
+        _activate(self)
+
+    def stop(self):
+        """Stops recording. The recorded stats are kept."""
+        _deactivate(self)
+
+    def reset(self):
+        """Clears the recorded stats."""
+        with self._lock:
+            self.stats.clear()
+
+    def _record(self, name: str, **increments):
+        with self._lock:
+            stats = self.stats.setdefault(name, QueryStats())
+            for key, value in increments.items():
+                setattr(stats, key, getattr(stats, key) + value)
+
+
+def track_queries(method: F) -> F:
+    """Attributes the queries issued by `method` to its qualified name."""
+    name = method.__qualname__
+
+    @functools.wraps(method)
+    def wrapper(*args, **kwargs):
+        if not _recorders:
+            return method(*args, **kwargs)
+        _record(name, num_calls=1)
+        stack = _get_stack()
+        stack.append(name)
+        try:
+            return method(*args, **kwargs)
+        finally:
+            stack.pop()
+
+    return t.cast(F, wrapper)
+
+
+_recorders: list[QueryRecorder] = []
+_recorders_lock = threading.Lock()
+_local = threading.local()
+_original_load_entity: t.Callable | None = None
+
+
+def _get_stack() -> list[str]:
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _record(name: str | None = None, **increments):
+    name = name or next(reversed(_get_stack()), UNTRACKED)
+    for recorder in list(_recorders):
+        recorder._record(name, **increments)
+
+
+def _before_cursor_execute(conn, *_):
+    conn.info.setdefault("query_start_times", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, *_):
+    start_times = conn.info.get("query_start_times")
+    duration = time.perf_counter() - start_times.pop() if start_times else 0.0
+    _record(num_queries=1, query_time=duration)
+
+
+def _count_loads(load_entity: t.Callable) -> t.Callable:
+    @functools.wraps(load_entity)
+    def wrapper(entity_loader=None, *args, **kwargs):
+        if entity_loader in (loaders.NodeEntityLoader, loaders.CodeEntityLoader):
+            _record(num_loads=1)
+        return load_entity(entity_loader, *args, **kwargs)
+
+    return wrapper
+
+
+def _activate(recorder: QueryRecorder):
+    global _original_load_entity
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    with _recorders_lock:
+        if recorder in _recorders:
+            return
+        if not _recorders:
+            event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+            # `load_node` and `load_code` look up `load_entity` on each call
+            _original_load_entity = loaders.load_entity
+            loaders.load_entity = _count_loads(_original_load_entity)
+        _recorders.append(recorder)
+
+
+def _deactivate(recorder: QueryRecorder):
+    global _original_load_entity
+    from sqlalchemy import event
+    from sqlalchemy.engine import Engine
+
+    with _recorders_lock:
+        if recorder not in _recorders:
+            return
+        _recorders.remove(recorder)
+        if not _recorders:
+            event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+            event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+            if _original_load_entity is not None:
+                loaders.load_entity = _original_load_entity
+                _original_load_entity = None
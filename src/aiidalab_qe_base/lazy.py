@@ -0,0 +1,45 @@
+"""Helpers for lazily resolved package attributes (PEP 562).
+
+Keeps `import aiidalab_qe_base.<package>` cheap by deferring the import of
+submodules (and their dependencies, e.g., the widget stack) until one of
+their attributes is first accessed.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import typing as t
+
+
+def lazy_attributes(
+    package: str,
+    attributes: dict[str, str],
+) -> tuple[t.Callable[[str], t.Any], t.Callable[[], list[str]]]:
+    """Returns module-level `__getattr__` and `__dir__` functions for a package.
+
+    Parameters
+    ----------
+    `package` : `str`
+        The `__name__` of the package.
+    `attributes` : `dict[str, str]`
+        The lazily resolved attributes, mapped to their (relative) submodule.
+
+    Returns
+    -------
+    `tuple[t.Callable[[str], t.Any], t.Callable[[], list[str]]]`
+        The `__getattr__` and `__dir__` functions of the package.
+    """
+
+    def __getattr__(name: str) -> t.Any:
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name], package), name)
+        # Cache on the package to bypass `__getattr__` on subsequent access
+        setattr(sys.modules[package], name, value)
+        return value
+
+    def __dir__() -> list[str]:
+        return sorted({*vars(sys.modules[package]), *attributes})
+
+    return __getattr__, __dir__
@@ -2,39 +2,88 @@ from __future__ import annotations
 
 import typing as t
 
+import numpy as np
 import traitlets as tl
 from aiida import orm
 from aiida.common.exceptions import NotExistent
-from aiida_quantumespresso.data.hubbard_structure import HubbardStructureData
-
-from .models import Model
 
+from .instrumentation.queries import track_queries
+from .models import Model, ModelLink
+from .structures import StructureDescriptors, get_structure_descriptors
 from .utils import HasTraits
 
 
 class HasInputStructure(HasTraits):
-    input_structure = tl.Union(
-        [
-            tl.Instance(orm.StructureData),
-            tl.Instance(HubbardStructureData),
-        ],
-        allow_none=True,
-    )
+    # Also accepts `HubbardStructureData`, a `StructureData` subclass
+    input_structure = tl.Instance(orm.StructureData, allow_none=True)
 
     @property
     def has_structure(self):
         return self.input_structure is not None
 
+    # Cached per assignment of `input_structure`
+    _structure_descriptors: StructureDescriptors | None = None
+
     @property
-    def has_pbc(self):
-        return self.has_structure and any(self.input_structure.pbc)
+    def structure_descriptors(self) -> StructureDescriptors | None:
+        """The cached descriptors of the input structure (see `structures`).
+
+        Computed once per assignment of `input_structure`. Call
+        `invalidate_structure_descriptors` after modifying an unstored input
+        structure in place.
+        """
+        if self.input_structure is None:
+            return None
+        if self._structure_descriptors is None:
+            self._structure_descriptors = get_structure_descriptors(
+                self.input_structure
+            )
+        return self._structure_descriptors
+
+    def invalidate_structure_descriptors(self):
+        """Clears the cached descriptors of the input structure."""
+        self._structure_descriptors = None
 
     @property
-    def has_tags(self):
-        return self.has_structure and any(
-            not kind_name.isalpha()
-            for kind_name in self.input_structure.get_kind_names()
-        )
+    def structure_positions(self) -> np.ndarray | None:
+        """The (read-only) Nx3 site positions of the input structure."""
+        return self._get_structure_array("positions")
+
+    @property
+    def structure_cell(self) -> np.ndarray | None:
+        """The (read-only) 3x3 cell of the input structure."""
+        return self._get_structure_array("cell")
+
+    @property
+    def structure_species(self) -> np.ndarray | None:
+        """The (read-only) kind index of each site of the input structure."""
+        return self._get_structure_array("species")
+
+    @property
+    def structure_kind_masses(self) -> np.ndarray | None:
+        """The (read-only) mass of each kind of the input structure."""
+        return self._get_structure_array("kind_masses")
+
+    @property
+    def has_pbc(self) -> bool:
+        descriptors = self.structure_descriptors
+        return descriptors is not None and any(descriptors.pbc)
+
+    @property
+    def has_tags(self) -> bool:
+        descriptors = self.structure_descriptors
+        return descriptors is not None and descriptors.has_tags
+
+    def _get_structure_array(self, name: str) -> np.ndarray | None:
+        descriptors = self.structure_descriptors
+        return None if descriptors is None else getattr(descriptors, name)
+
+    @tl.observe("input_structure")
+    def _compute_structure_descriptors(self, change):
+        self.invalidate_structure_descriptors()
+        # Computed once per stored structure, shared by all dependent models
+        if change["new"] is not None and change["new"].is_stored:
+            self._structure_descriptors = get_structure_descriptors(change["new"])
 
 
 M = t.TypeVar("M", bound=Model)
@@ -72,10 +121,16 @@ class HasModels(t.Generic[M]):
     def get_models(self) -> t.Iterable[tuple[str, M]]:
         return self._models.items()
 
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)  # type: ignore
+        # Trait links are not pickled, so they are restored on unpickling
+        for _, model in self.get_models():
+            self._link_model(model)
+
     def _link_model(self, model: M):
         assert isinstance(model, Model), "HasModels only works with Model instances."
         if isinstance(model, HasBlockers):
-            tl.dlink(
+            ModelLink(
                 (model, "blockers"),
                 (self, "blockers"),
             )
@@ -87,7 +142,7 @@ class HasModels(t.Generic[M]):
             else:  # from sibling
                 sibling, trait = dependency_parts
                 target_model = self.get_model(sibling)
-            tl.dlink(
+            ModelLink(
                 (target_model, trait),
                 (model, trait),
             )
@@ -122,6 +177,7 @@ class HasProcess(HasTraits):
         process_node = self.fetch_process_node()
         return process_node.outputs if process_node else []
 
+    @track_queries
     def fetch_process_node(self) -> orm.ProcessNode | None:
         try:
             return orm.load_node(self.process_uuid) if self.process_uuid else None  # type: ignore
@@ -180,3 +236,173 @@ class HasBlockers(HasTraits):
 
     def _check_blockers(self):
         raise NotImplementedError
+
+
+class Subscription:
+    """A disposable registration of an observer or a link.
+
+    Can be used as a context manager, in which case it is disposed on exit.
+    The number of live (not yet disposed) subscriptions across all components
+    is available via `Subscription.live_count` for debugging purposes.
+    """
+
+    _live_count = 0
+
+    def __init__(self, dispose: t.Callable[[], t.Any], group: str | None = None):
+        self._dispose: t.Callable[[], t.Any] | None = dispose
+        self.group = group
+        Subscription._live_count += 1
+
+    @classmethod
+    def live_count(cls) -> int:
+        return cls._live_count
+
+    @property
+    def is_disposed(self):
+        return self._dispose is None
+
+    def dispose(self):
+        if self._dispose is None:
+            return
+        self._dispose()
+        self._dispose = None
+        Subscription._live_count -= 1
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *_):
+        self.dispose()
+
+
+class _DispatchedLink(tl.link):
+    """A link whose updates are dispatched by its owner."""
+
+    def __init__(self, source, target, dispatch: t.Callable, **kwargs):
+        self._dispatch = dispatch
+        super().__init__(source, target, **kwargs)
+
+    def _update_target(self, change):
+        self._dispatch(super()._update_target, change)
+
+    def _update_source(self, change):
+        self._dispatch(super()._update_source, change)
+
+
+class _DispatchedDirectionalLink(tl.directional_link):
+    """A directional link whose updates are dispatched by its owner."""
+
+    def __init__(self, source, target, transform, dispatch: t.Callable):
+        self._dispatch = dispatch
+        super().__init__(source, target, transform)
+
+    def _update(self, change):
+        self._dispatch(super()._update, change)
+
+
+class HasSubscriptions:
+    """Tracks the observers and links registered by a component.
+
+    Observers and links registered via `subscribe`, `link`, and `dlink` are
+    disposed together on `dispose_subscriptions`, such that the component
+    does not remain reachable from longer-lived objects. Subscriptions may be
+    tagged with a `group`, to dispose of them separately (e.g. widget links
+    re-established on each refresh).
+
+    Their callbacks can be queued with `defer_callbacks` and replayed with
+    `flush_callbacks`, e.g. to update the component's widgets from the kernel
+    thread after its model was updated in a worker thread.
+    """
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        if "_subscriptions" not in self.__dict__:
+            self._subscriptions: list[Subscription] = []
+        return self._subscriptions
+
+    def subscribe(
+        self,
+        owner: tl.HasTraits,
+        handler: t.Callable,
+        names: str | list[str] | t.Any = tl.All,
+        group: str | None = None,
+    ) -> Subscription:
+        """Observes traits of `owner` until disposed."""
+
+        def dispatch(change):
+            self._dispatch(handler, change)
+
+        owner.observe(dispatch, names)
+        return self._track(lambda: owner.unobserve(dispatch, names), group)
+
+    def link(
+        self,
+        source: tuple,
+        target: tuple,
+        group: str | None = None,
+    ) -> Subscription:
+        """Links two traits until disposed."""
+        link = _DispatchedLink(source, target, self._dispatch)
+        return self._track(link.unlink, group)
+
+    def dlink(
+        self,
+        source: tuple,
+        target: tuple,
+        transform: t.Callable | None = None,
+        group: str | None = None,
+    ) -> Subscription:
+        """Directionally links two traits until disposed."""
+        link = _DispatchedDirectionalLink(source, target, transform, self._dispatch)
+        return self._track(link.unlink, group)
+
+    def get_subscriptions(self, group: str | None = None) -> list[Subscription]:
+        """Returns the tracked subscriptions, optionally of a single group."""
+        if group is None:
+            return list(self.subscriptions)
+        return [item for item in self.subscriptions if item.group == group]
+
+    def dispose_subscriptions(self, group: str | None = None):
+        """Disposes of all tracked subscriptions, or of those of a group."""
+        disposed = self.get_subscriptions(group)
+        for subscription in disposed:
+            subscription.dispose()
+        self.subscriptions[:] = [
+            item for item in self.subscriptions if item not in disposed
+        ]
+
+    def defer_callbacks(self):
+        """Queues the callbacks of subscriptions until `flush_callbacks`.
+
+        Repeated changes of a trait are collapsed into a single change, from
+        the first old value to the latest new value, such that links are synced
+        to the current value rather than replaying outdated updates.
+        """
+        self._deferred_callbacks: dict[tuple, tuple[t.Callable, t.Any]] | None = {}
+
+    def flush_callbacks(self):
+        """Calls the queued callbacks, in order, and stops queuing."""
+        deferred = self.__dict__.get("_deferred_callbacks") or {}
+        self._deferred_callbacks = None
+        for callback, change in deferred.values():
+            callback(change)
+
+    def _dispatch(self, callback: t.Callable, change):
+        deferred = self.__dict__.get("_deferred_callbacks")
+        if deferred is None:
+            callback(change)
+            return
+        change = tl.Bunch(change)
+        key = (callback, id(change.owner), change.name, change.type)
+        if (queued := deferred.pop(key, None)) is not None and "old" in change:
+            change.old = queued[1].old
+        deferred[key] = (callback, change)
+
+    def _track(
+        self,
+        dispose: t.Callable[[], t.Any],
+        group: str | None = None,
+    ) -> Subscription:
+        subscription = Subscription(dispose, group)
+        self.subscriptions.append(subscription)
+        return subscription
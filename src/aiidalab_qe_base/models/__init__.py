@@ -1,10 +1,28 @@
-from .model import Model
-from .code import CodeModel, CodesDict, PluginCodes, PwCodeModel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .code import CodeModel, CodesDict, PluginCodes, PwCodeModel
+    from .model import Model, ModelLink
 
 __all__ = [
     "Model",
+    "ModelLink",
     "CodeModel",
     "CodesDict",
     "PluginCodes",
     "PwCodeModel",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "Model": ".model",
+        "ModelLink": ".model",
+        "CodeModel": ".code",
+        "CodesDict": ".code",
+        "PluginCodes": ".code",
+        "PwCodeModel": ".code",
+    },
+)
@@ -1,12 +1,14 @@
-import ipywidgets as ipw
+from __future__ import annotations
+
+import typing as t
+
 import traitlets as tl
 from aiida import orm
 from aiida.common import NotExistent
 
-from ..widgets import (
-    PwCodeResourceSetupWidget,
-    QEAppComputationalResourcesWidget,
-)
+from aiidalab_qe_base.codes import get_code_index
+from aiidalab_qe_base.instrumentation.queries import track_queries
+
 from .model import Model
 
 
@@ -29,13 +31,17 @@ class CodeModel(Model):
 
     _WARNING_TEMPLATE = "<span style='color: red;'>{warning}</span>"
 
+    # Resolved lazily from `aiidalab_qe_base.widgets` to keep the model layer
+    # free of widget imports
+    _DEFAULT_CODE_WIDGET_CLASS = "QEAppComputationalResourcesWidget"
+
     def __init__(
         self,
         *,
         name: str = "",
         description: str,
         default_calc_job_plugin: str,
-        code_widget_class=QEAppComputationalResourcesWidget,
+        code_widget_class=None,
     ):
         self.name = name
         self.description = description
@@ -43,10 +49,17 @@ class CodeModel(Model):
         self.code_widget_class = code_widget_class
         self.is_rendered = False
 
-        ipw.dlink(
-            (self, "num_cpus"),
-            (self, "ntasks_per_node"),
-        )
+    @property
+    def code_widget_class(self):
+        if self._code_widget_class is None:
+            from aiidalab_qe_base import widgets
+
+            self._code_widget_class = getattr(widgets, self._DEFAULT_CODE_WIDGET_CLASS)
+        return self._code_widget_class
+
+    @code_widget_class.setter
+    def code_widget_class(self, code_widget_class):
+        self._code_widget_class = code_widget_class
 
     @property
     def is_ready(self):
@@ -62,20 +75,66 @@ class CodeModel(Model):
     def deactivate(self):
         self.is_active = False
 
+    @track_queries
     def update(self, user_email="", default_code=None, refresh=False):
         if not self.options or refresh:
-            self.options = self._get_codes(user_email)
-            if default_code:
-                try:
-                    selected = orm.load_code(default_code).uuid
-                except NotExistent:
-                    selected = None
-                    self.warning = self._WARNING_TEMPLATE.format(
-                        warning=f"Code '{default_code}' not found"
-                    )
-            else:
-                selected = self.first_option
+            self.set_code_options(*self.fetch_code_options(user_email, default_code))
+
+    def fetch_code_options(
+        self,
+        user_email="",
+        default_code=None,
+    ) -> tuple[list[tuple[str, str]], str | None, str | None]:
+        """Queries the code options, without modifying the model.
+
+        Safe to call from a worker thread. Apply the result with `set_code_options`.
+
+        Parameters
+        ----------
+        `user_email` : `str`
+            The email of the user whose codes are offered.
+        `default_code` : `str`, optional
+            The identifier (label, uuid, or pk) of the code to select.
+
+        Returns
+        -------
+        `tuple[list[tuple[str, str]], str | None, str | None]`
+            The code options, the uuid of the code to select, and a warning if
+            the default code was not found.
+        """
+        options = self._get_codes(user_email)
+        if not default_code:
+            return options, options[0][1] if options else None, None
+        selected = next(
+            (uuid for label, uuid in options if default_code in (label, uuid)),
+            None,
+        )
+        if selected:
+            return options, selected, None
+        try:
+            return options, orm.load_code(default_code).uuid, None
+        except NotExistent:
+            warning = self._WARNING_TEMPLATE.format(
+                warning=f"Code '{default_code}' not found"
+            )
+            return options, None, warning
+
+    def set_code_options(
+        self,
+        options: list[tuple[str, str]],
+        selected: str | None,
+        warning: str | None = None,
+    ):
+        """Sets the code options and selected code together.
+
+        Observers are notified once both are set, such that they never see a
+        selection missing from the options.
+        """
+        with self.hold_trait_notifications():
+            self.options = options
             self.selected = selected
+            if warning:
+                self.warning = warning
 
     def get_model_state(self) -> dict:
         return {
@@ -89,68 +148,115 @@ class CodeModel(Model):
         }
 
     def set_model_state(self, parameters: dict):
-        self.selected = (
-            self._get_uuid(identifier)
-            if (identifier := parameters.get("code"))
-            else self.first_option
+        self.update_model_state(parameters)
+
+    def update_model_state(self, parameters: dict) -> list[str]:
+        """Sets the model state, skipping traits whose value is unchanged.
+
+        Missing parameters are set to their defaults, as in `set_model_state`.
+
+        Parameters
+        ----------
+        `parameters` : `dict`
+            The model state, as produced by `get_model_state`.
+
+        Returns
+        -------
+        `list[str]`
+            The names of the changed traits, in the order of change.
+        """
+        changed = []
+        # Values are computed lazily, after any previous change (and its
+        # observers, e.g. `num_cpus` setting `ntasks_per_node`) took effect
+        for trait, value in self._get_state_values(parameters):
+            if getattr(self, trait) != value:
+                setattr(self, trait, value)
+                changed.append(trait)
+        return changed
+
+    def _get_state_values(self, parameters: dict) -> t.Iterator[tuple[str, t.Any]]:
+        identifier = parameters.get("code")
+        if not identifier:
+            yield "selected", self.first_option
+        elif identifier != self.selected or not self._find_option(identifier):
+            # Unless already selected from the present options
+            yield "selected", self._get_uuid(identifier)
+        yield "num_nodes", parameters.get("nodes", 1)
+        yield "num_cpus", parameters.get("cpus", 1)
+        yield "ntasks_per_node", parameters.get("ntasks_per_node", 1)
+        yield "cpus_per_task", parameters.get("cpus_per_task", 1)
+        yield (
+            "max_wallclock_seconds",
+            parameters.get("max_wallclock_seconds", 3600 * 12),
         )
-        self.num_nodes = parameters.get("nodes", 1)
-        self.num_cpus = parameters.get("cpus", 1)
-        self.ntasks_per_node = parameters.get("ntasks_per_node", 1)
-        self.cpus_per_task = parameters.get("cpus_per_task", 1)
-        self.max_wallclock_seconds = parameters.get("max_wallclock_seconds", 3600 * 12)
 
+    @tl.observe("num_cpus")
+    def _on_num_cpus_change(self, change):
+        # Observed at the class level (rather than linked) to survive pickling
+        self.ntasks_per_node = change["new"]
+
+    @tl.observe("options")
+    def _on_options_change(self, _):
+        self._index_options()
+
+    @track_queries
     def _get_uuid(self, identifier):
+        if uuid := self._find_option(identifier):
+            return uuid
         try:
-            uuid = orm.load_code(identifier).uuid
+            code = orm.load_code(identifier)
         except NotExistent:
-            uuid = None
+            return None
+        uuid = code.uuid
+        if isinstance(identifier, int) or str(identifier).isdigit():
+            self._pk_to_uuid[int(identifier)] = uuid
         # If the code was imported from another user, it is not usable
         # in the app and thus will not be considered as an option!
-        return uuid if uuid in [opt[1] for opt in self.options] else None
+        return uuid if uuid in self._uuid_to_label else None
 
-    def _get_codes(self, user_email: str = ""):
-        user = orm.User.collection.get(email=user_email)
+    def _find_option(self, identifier) -> str | None:
+        """Resolves a uuid, previously resolved pk, or full label
+        (`label@computer`) to the uuid of a code option, without querying
+        the database."""
+        if "_uuid_to_label" not in self.__dict__:
+            self._index_options()
+        if isinstance(identifier, int) or str(identifier).isdigit():
+            uuid = self._pk_to_uuid.get(int(identifier))
+        elif identifier in self._uuid_to_label:
+            uuid = identifier
+        else:
+            uuid = self._label_to_uuid.get(identifier)
+        return uuid if uuid in self._uuid_to_label else None
 
-        filters = (
-            {"attributes.input_plugin": self.default_calc_job_plugin}
-            if self.default_calc_job_plugin
-            else {}
-        )
+    def _index_options(self):
+        self._uuid_to_label = {uuid: label for label, uuid in self.options}  # type: ignore
+        self._label_to_uuid = {label: uuid for label, uuid in self.options}  # type: ignore
+        # pks never change, so resolved pks are kept across option changes
+        self.__dict__.setdefault("_pk_to_uuid", {})
 
-        codes = (
-            orm.QueryBuilder()
-            .append(
-                orm.Code,
-                filters=filters,
-            )
-            .all(flat=True)
+    @track_queries
+    def _get_codes(self, user_email: str = ""):
+        return get_code_index().get_options(
+            user_email,
+            input_plugin=self.default_calc_job_plugin,
+            allow_hidden=self.allow_hidden_codes,
+            allow_disabled=self.allow_disabled_computers,
         )
 
-        return [
-            (self._full_code_label(code), code.uuid)
-            for code in codes
-            if code.computer.is_user_configured(user)
-            and (self.allow_hidden_codes or not code.is_hidden)
-            and (self.allow_disabled_computers or code.computer.is_user_enabled(user))
-        ]
-
-    @staticmethod
-    def _full_code_label(code):
-        return f"{code.label}@{code.computer.label}"
-
 
 class PwCodeModel(CodeModel):
     parallelization_override = tl.Bool(False)
     npool = tl.Int(1)
 
+    _DEFAULT_CODE_WIDGET_CLASS = "PwCodeResourceSetupWidget"
+
     def __init__(
         self,
         *,
         name="",
         description="pw.x",
         default_calc_job_plugin="quantumespresso.pw",
-        code_widget_class=PwCodeResourceSetupWidget,
+        code_widget_class=None,
     ):
         super().__init__(
             name=name,
@@ -170,13 +276,13 @@ class PwCodeModel(CodeModel):
         )
         return parameters
 
-    def set_model_state(self, parameters):
-        super().set_model_state(parameters)
+    def _get_state_values(self, parameters: dict) -> t.Iterator[tuple[str, t.Any]]:
+        yield from super()._get_state_values(parameters)
         if "parallelization" in parameters and "npool" in parameters["parallelization"]:
-            self.parallelization_override = True
-            self.npool = parameters["parallelization"].get("npool", 1)
+            yield "parallelization_override", True
+            yield "npool", parameters["parallelization"].get("npool", 1)
         else:
-            self.parallelization_override = False
+            yield "parallelization_override", False
 
 
 CodesDict = dict[str, CodeModel]
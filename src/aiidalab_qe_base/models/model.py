@@ -1,3 +1,5 @@
+import typing as t
+
 import traitlets as tl
 
 from aiidalab_qe_base.utils import HasTraits
@@ -16,6 +18,14 @@ class MetaHasTraitsLast(tl.MetaHasTraits):
         return super().__new__(cls, name, bases, classdict)
 
 
+class ModelLink(tl.directional_link):
+    """A directional link between models of a model tree (see `HasModels`).
+
+    Notified immediately while a model defers its observers (see
+    `Model.defer_observers`).
+    """
+
+
 class Model(HasTraits, metaclass=MetaHasTraitsLast):
     """A parent class for all MVC models.
 
@@ -26,3 +36,75 @@ class Model(HasTraits, metaclass=MetaHasTraitsLast):
     """
 
     dependencies: list[str] = []
+
+    def defer_observers(self):
+        """Queues the notification of observers outside of the model tree
+        (e.g. panels and widgets) until `flush_observers`.
+
+        Observers within the model tree, i.e. the model's own observers and
+        the `ModelLink`s between the model and its sub-models (see
+        `HasModels`), are still notified immediately. Sub-models also defer
+        their observers. Repeated changes of a trait are collapsed into a
+        single change, from the first old value to the latest new value.
+        """
+        self._deferred_changes: dict[tuple, tl.Bunch] | None = {}
+        for model in self._get_sub_models():
+            model.defer_observers()
+
+    def flush_observers(self):
+        """Notifies the deferred observers of the queued changes, in order,
+        then those of the sub-models, and stops queuing."""
+        deferred = self.__dict__.get("_deferred_changes") or {}
+        self._deferred_changes = None
+        try:
+            for change in deferred.values():
+                for observer in self._get_foreign_observers(change):
+                    observer(change)
+        finally:
+            for model in self._get_sub_models():
+                model.flush_observers()
+
+    def _get_sub_models(self) -> list["Model"]:
+        from aiidalab_qe_base.mixins import HasModels
+
+        if not isinstance(self, HasModels):
+            return []
+        return [model for _, model in self.get_models()]
+
+    def _notify_observers(self, event):
+        deferred = self.__dict__.get("_deferred_changes")
+        if deferred is None:
+            super()._notify_observers(event)
+            return
+        notifiers = self._trait_notifiers
+        self._trait_notifiers = {
+            name: {
+                type_: [item for item in observers if self._is_tree_observer(item)]
+                for type_, observers in by_type.items()
+            }
+            for name, by_type in notifiers.items()
+        }
+        try:
+            super()._notify_observers(event)
+        finally:
+            self._trait_notifiers = notifiers
+        change = tl.Bunch(event)
+        key = (change.name, change.type)
+        if (queued := deferred.pop(key, None)) is not None and "old" in queued:
+            change.old = queued.old
+        deferred[key] = change
+
+    def _get_foreign_observers(self, change: tl.Bunch) -> list[t.Callable]:
+        observers = []
+        for name in (change.name, tl.All):
+            for type_ in (change.type, tl.All):
+                observers.extend(self._trait_notifiers.get(name, {}).get(type_, []))
+        return [item for item in observers if not self._is_tree_observer(item)]
+
+    def _is_tree_observer(self, observer) -> bool:
+        owner = getattr(observer, "__self__", None)
+        return (
+            isinstance(observer, tl.EventHandler)
+            or owner is self
+            or isinstance(owner, ModelLink)
+        )
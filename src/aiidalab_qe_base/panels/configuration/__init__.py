@@ -1,7 +1,25 @@
-from .configuration import ConfigurationSettingsPanel
-from .model import ConfigurationSettingsModel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .configuration import ConfigurationSettingsPanel
+    from .model import ConfigurationSettingsModel
+    from .refresher import ConfigurationPanelRefresher, RefreshReport
 
 __all__ = [
     "ConfigurationSettingsPanel",
     "ConfigurationSettingsModel",
+    "ConfigurationPanelRefresher",
+    "RefreshReport",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "ConfigurationSettingsPanel": ".configuration",
+        "ConfigurationSettingsModel": ".model",
+        "ConfigurationPanelRefresher": ".refresher",
+        "RefreshReport": ".refresher",
+    },
+)
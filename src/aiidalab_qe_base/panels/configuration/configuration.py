@@ -1,5 +1,6 @@
 import os
 import typing as t
+import warnings
 
 from aiidalab_qe_base.mixins import HasInputStructure
 
@@ -10,7 +11,13 @@ CSM = t.TypeVar("CSM", bound=ConfigurationSettingsModel)
 
 
 class ConfigurationSettingsPanel(SettingsPanel[CSM]):
-    """Base class for configuration settings panels."""
+    """Base class for configuration settings panels.
+
+    Subscriptions registered in the `REFRESH_GROUP` group (e.g. widget links)
+    are disposed of on each refresh.
+    """
+
+    REFRESH_GROUP = "refresh"
 
     def refresh(self, specific=""):
         """Refreshes the settings panel.
@@ -24,8 +31,25 @@ class ConfigurationSettingsPanel(SettingsPanel[CSM]):
         `specific` : `str`, optional
             If provided, specifies the level of refresh.
         """
+        self._prepare_refresh()
+        self._refresh_model(specific)
+
+    def _prepare_refresh(self):
+        """Marks the panel as outdated and unlinks its widgets."""
         self.updated = False
-        self._unsubscribe()
+        if type(self)._unsubscribe is not ConfigurationSettingsPanel._unsubscribe:
+            self._unsubscribe()  # deprecated override
+        else:
+            self.dispose_subscriptions(self.REFRESH_GROUP)
+            self._unlink_links()
+
+    def _refresh_model(self, specific=""):
+        """Updates or resets the model.
+
+        May run in a worker thread (see `ConfigurationPanelRefresher`), in which
+        case only observers within the model tree are notified in the worker thread,
+        and widgets must only be updated via the panel's subscriptions.
+        """
         if self._model.include:
             self.update(specific)
         if "PYTEST_CURRENT_TEST" in os.environ:
@@ -35,24 +59,33 @@ class ConfigurationSettingsPanel(SettingsPanel[CSM]):
             self._reset()
 
     def update(self, specific=""):
-        """Updates the model if not yet updated.
+        """Updates the model if not yet updated, or if any of its declared
+        defaults is outdated (see `ConfigurationSettingsModel.default_dependencies`).
 
         Parameters
         ----------
         `specific` : `str`, optional
             If provided, specifies the level of update.
         """
-        if self.updated:
+        if self.updated and not self._model.dirty_defaults:
             return
         if not self._model.loaded_from_process:
             self._model.update(specific)
         self.updated = True
 
     def _unsubscribe(self):
-        """Unlinks any linked widgets."""
-        for link in self.links:
-            link.unlink()
-        self.links.clear()
+        """Unlinks any linked widgets.
+
+        Deprecated - use `dispose_subscriptions(REFRESH_GROUP)` instead.
+        """
+        warnings.warn(
+            "`ConfigurationSettingsPanel._unsubscribe` is deprecated. Use "
+            "`dispose_subscriptions(REFRESH_GROUP)` instead.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        self.dispose_subscriptions(self.REFRESH_GROUP)
+        self._unlink_links()
 
     def _reset(self):
         """Resets the model to present defaults."""
@@ -1,29 +1,179 @@
+import copy
+import json
+import threading
 import typing as t
+from collections import OrderedDict
+
+from aiida import orm
 
 from aiidalab_qe_base.mixins import Confirmable
+from aiidalab_qe_base.structures import get_structure_fingerprint
 
 from ..settings import SettingsModel
 
 
+class DefaultsCache:
+    """A bounded, thread-safe LRU cache of computed defaults.
+
+    Shared by all configuration models in the kernel, such that defaults
+    computed for recently seen inputs (e.g. a structure loaded again) are
+    reused across refreshes and panels.
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._values: OrderedDict[t.Hashable, t.Any] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._values)
+
+    def get(self, key: t.Hashable) -> tuple[bool, t.Any]:
+        """Returns whether the key is cached and a copy of its value."""
+        with self._lock:
+            if key not in self._values:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+            self._values.move_to_end(key)
+            value = self._values[key]
+        return True, copy.deepcopy(value)
+
+    def set(self, key: t.Hashable, value: t.Any):
+        """Caches a copy of the value."""
+        value = copy.deepcopy(value)
+        with self._lock:
+            self._values[key] = value
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+
+    def clear(self):
+        """Clears the cache and its statistics."""
+        with self._lock:
+            self._values.clear()
+            self.hits = self.misses = 0
+
+
 class ConfigurationSettingsModel(SettingsModel, Confirmable):
-    """Base model for configuration settings models."""
+    """Base model for configuration settings models.
+
+    Defaults may be declared in `default_dependencies`, mapping each default
+    (trait name) to the traits it is computed from (e.g. `input_structure`,
+    `protocol`, `spin_type`). Declared defaults are computed by
+    `_compute_default` and cached in `_defaults` until any of their inputs
+    change, such that an update only recomputes outdated defaults.
+
+    Computed defaults may also be memoized in a kernel-wide `DefaultsCache`,
+    keyed by the model class, the default, and a fingerprint of its inputs
+    (structures are fingerprinted by uuid or content). Memoization is opt-in:
+    only set `memoize_defaults` to `True` if `_compute_default` depends on
+    nothing but the declared inputs (e.g. not on codes or the database).
+    """
 
     title = "Configuration"
     identifier = "configuration"
 
+    default_dependencies: dict[str, list[str]] = {}
+    memoize_defaults = False
+
+    _defaults_cache = DefaultsCache()
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self._defaults: dict[str, t.Any] = {}
+        self._dirty_defaults: set[str] = set(self.default_dependencies)
+        self._observe_default_inputs()
+
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        # Instance observers are not pickled, so they are restored on unpickling
+        self._observe_default_inputs()
+
+    @property
+    def dirty_defaults(self) -> set[str]:
+        """The declared defaults whose inputs changed since last computed."""
+        return set(self._dirty_defaults)
 
     def update(self, specific=""):
         """Updates the model.
 
+        Recomputes the declared defaults whose inputs changed.
+
         Parameters
         ----------
         `specific` : `str`, optional
             If provided, specifies the level of update.
         """
-        pass
+        self._update_defaults()
+
+    def _update_defaults(self) -> set[str]:
+        """Recomputes the outdated declared defaults and returns their names."""
+        outdated = self.dirty_defaults
+        for trait in outdated:
+            self._update_default(trait)
+        return outdated
+
+    def _update_default(self, trait: str):
+        # Marked clean first, such that an input change during the computation
+        # marks the default as outdated again
+        self._dirty_defaults.discard(trait)
+        if not self.memoize_defaults:
+            self._defaults[trait] = self._compute_default(trait)
+            return
+        key = self._get_default_key(trait)
+        cached, value = self._defaults_cache.get(key)
+        if not cached:
+            value = self._compute_default(trait)
+            self._defaults_cache.set(key, value)
+        self._defaults[trait] = value
+
+    def _compute_default(self, trait: str) -> t.Any:
+        """Computes the value of a declared default from its inputs."""
+        raise NotImplementedError()
 
     def _get_default(self, trait):
+        if trait in self._dirty_defaults:
+            self._update_default(trait)
         return self._defaults.get(trait, self.traits()[trait].default_value)
+
+    def _get_default_key(self, trait: str) -> tuple:
+        model_class = type(self)
+        return (
+            f"{model_class.__module__}.{model_class.__qualname__}",
+            trait,
+            *(
+                _fingerprint(getattr(self, name))
+                for name in self.default_dependencies[trait]
+            ),
+        )
+
+    def _observe_default_inputs(self):
+        inputs = {
+            name for names in self.default_dependencies.values() for name in names
+        }
+        if unknown := [name for name in inputs if not self.has_trait(name)]:
+            raise ValueError(f"Unknown default dependencies: {', '.join(unknown)}")
+        if inputs:
+            self.observe(self._on_default_input_change, list(inputs))
+
+    def _on_default_input_change(self, change):
+        self._dirty_defaults.update(
+            trait
+            for trait, inputs in self.default_dependencies.items()
+            if change["name"] in inputs
+        )
+
+
+def _fingerprint(value: t.Any) -> t.Hashable:
+    if isinstance(value, orm.StructureData):
+        return ("structure", get_structure_fingerprint(value))
+    if isinstance(value, orm.Node):
+        return ("node", value.uuid)
+    try:
+        hash(value)
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+    return value
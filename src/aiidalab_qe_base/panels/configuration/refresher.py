@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import time
+import typing as t
+from concurrent.futures import ThreadPoolExecutor
+
+from .configuration import ConfigurationSettingsPanel
+
+
+class RefreshReport:
+    """The outcome of a `ConfigurationPanelRefresher.refresh` call.
+
+    Attributes
+    ----------
+    `timings` : `dict[str, float]`
+        The duration (in seconds) of each refreshed model's update, keyed by
+        model identifier.
+    `skipped` : `list[str]`
+        The identifiers of the panels skipped as excluded from the calculation.
+    `errors` : `dict[str, Exception]`
+        The errors raised by model updates, keyed by model identifier.
+    """
+
+    def __init__(self):
+        self.timings: dict[str, float] = {}
+        self.skipped: list[str] = []
+        self.errors: dict[str, Exception] = {}
+
+    @property
+    def total_time(self) -> float:
+        """The sum of the model update durations."""
+        return sum(self.timings.values())
+
+    def __repr__(self):
+        timings = ", ".join(
+            f"{key}={value:.3f}s" for key, value in self.timings.items()
+        )
+        return f"RefreshReport({timings}, skipped={self.skipped})"
+
+
+class ConfigurationPanelRefresher:
+    """Refreshes configuration panels concurrently.
+
+    Panels whose model is included in the calculation have their model
+    refreshed (see `ConfigurationSettingsPanel.refresh`) in a thread pool.
+    Meanwhile, the models only notify observers within their model tree (e.g.
+    sub-model dependencies). Other observers (e.g. links to widgets and the
+    panels' subscriptions) are notified on the calling
+    (kernel) thread once all models are refreshed (see `Model.defer_observers`
+    and `HasSubscriptions.defer_callbacks`), such that widgets and other
+    components are only updated from the kernel thread.
+
+    Excluded panels are only marked as outdated, and are updated on inclusion.
+    """
+
+    def __init__(self, max_workers: int | None = None):
+        self.max_workers = max_workers
+
+    def refresh(
+        self,
+        panels: t.Iterable[ConfigurationSettingsPanel],
+        specific: str = "",
+    ) -> RefreshReport:
+        """Refreshes the panels.
+
+        Parameters
+        ----------
+        `panels` : `t.Iterable[ConfigurationSettingsPanel]`
+            The panels to refresh.
+        `specific` : `str`, optional
+            If provided, specifies the level of refresh.
+
+        Returns
+        -------
+        `RefreshReport`
+            The per-panel timings and skipped panels.
+
+        Raises
+        ------
+        `Exception`
+            The first error raised by a model update or a deferred callback,
+            once all panels are refreshed and their deferred callbacks replayed.
+        """
+        report = RefreshReport()
+        included: list[ConfigurationSettingsPanel] = []
+        for panel in panels:
+            panel._prepare_refresh()
+            if panel._model.include:
+                included.append(panel)
+            else:
+                report.skipped.append(panel._model.identifier)
+
+        for panel in included:
+            panel.defer_callbacks()
+            panel._model.defer_observers()
+        try:
+            if included:
+                with ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="configuration-refresh",
+                ) as executor:
+                    futures = [
+                        executor.submit(self._refresh_model, panel, specific)
+                        for panel in included
+                    ]
+                for panel, future in zip(included, futures):
+                    identifier = panel._model.identifier
+                    duration, error = future.result()
+                    report.timings[identifier] = duration
+                    if error is not None:
+                        report.errors[identifier] = error
+        finally:
+            for panel in included:
+                self._apply_changes(panel, report)
+
+        if report.errors:
+            raise next(iter(report.errors.values()))
+        return report
+
+    @staticmethod
+    def _apply_changes(panel: ConfigurationSettingsPanel, report: RefreshReport):
+        # Always stops deferring, such that a failing panel leaves others intact
+        try:
+            try:
+                panel._model.flush_observers()
+            finally:
+                panel.flush_callbacks()
+        except Exception as error:
+            report.errors.setdefault(panel._model.identifier, error)
+
+    @staticmethod
+    def _refresh_model(
+        panel: ConfigurationSettingsPanel,
+        specific: str,
+    ) -> tuple[float, Exception | None]:
+        start = time.perf_counter()
+        try:
+            panel._refresh_model(specific)
+        except Exception as error:
+            return time.perf_counter() - start, error
+        return time.perf_counter() - start, None
@@ -1,7 +1,20 @@
-from .model import PanelModel
-from .panel import Panel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .model import PanelModel
+    from .panel import Panel
 
 __all__ = [
     "PanelModel",
     "Panel",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "PanelModel": ".model",
+        "Panel": ".panel",
+    },
+)
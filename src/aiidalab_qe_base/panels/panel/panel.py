@@ -4,6 +4,8 @@ import typing as t
 import ipywidgets as ipw
 from aiidalab_widgets_base import LoadingWidget
 
+from aiidalab_qe_base.mixins import HasSubscriptions
+
 from .model import PanelModel
 
 if sys.version_info >= (3, 11):
@@ -15,8 +17,13 @@ else:
 PM = t.TypeVar("PM", bound=PanelModel)
 
 
-class Panel(ipw.VBox, t.Generic[PM]):
-    """Base class for all panels."""
+class Panel(ipw.VBox, HasSubscriptions, t.Generic[PM]):
+    """Base class for all panels.
+
+    Observers and links on longer-lived objects (models, global managers)
+    should be registered via `subscribe`, `link`, and `dlink`, such that
+    they are disposed of when the panel is closed.
+    """
 
     rendered = False
     _loading_message = "Loading {identifier} panel"
@@ -36,3 +43,8 @@ class Panel(ipw.VBox, t.Generic[PM]):
 
     def render(self):
         raise NotImplementedError()
+
+    def close(self):
+        """Disposes of the panel's subscriptions and closes the panel."""
+        self.dispose_subscriptions()
+        super().close()
@@ -1,7 +1,20 @@
-from .model import ResourceSettingsModel
-from .resources import ResourceSettingsPanel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .model import ResourceSettingsModel
+    from .resources import ResourceSettingsPanel
 
 __all__ = [
     "ResourceSettingsModel",
     "ResourceSettingsPanel",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "ResourceSettingsModel": ".model",
+        "ResourceSettingsPanel": ".resources",
+    },
+)
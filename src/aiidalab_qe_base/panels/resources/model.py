@@ -1,3 +1,10 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import typing as t
+from concurrent.futures import Future
+
 import traitlets as tl
 from aiida import orm
 
@@ -6,6 +13,9 @@ from aiidalab_qe_base.models import CodeModel
 
 from ..settings import SettingsModel
 
+_Dispatcher = t.Callable[..., t.Any]
+_AnyFuture = Future | asyncio.Future
+
 
 class ResourceSettingsModel(SettingsModel, HasModels[CodeModel]):
     """Base model for resource setting models."""
@@ -20,6 +30,9 @@ class ResourceSettingsModel(SettingsModel, HasModels[CodeModel]):
 
     warning_messages = tl.Unicode("")
 
+    refreshing_codes = tl.Bool(False)
+    code_refresh_progress = tl.Float(1.0)  # fraction of code models fetched
+
     def __init__(self, *args, **kwargs):
         self.default_codes: dict[str, dict] = kwargs.pop("default_codes", {})
 
@@ -28,23 +41,143 @@ class ResourceSettingsModel(SettingsModel, HasModels[CodeModel]):
         # Used by the code-setup thread to fetch code options
         self.DEFAULT_USER_EMAIL = orm.User.collection.get_default().email
 
+        self._init_code_refresh()
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        # Locks and futures are not picklable, and refreshes are not resumed
+        for key in ("_code_refresh_lock", "_code_refresh", "_pending_code_refresh"):
+            state.pop(key, None)
+        return state
+
+    def __setstate__(self, state: dict):
+        super().__setstate__(state)
+        self._init_code_refresh()
+
     def add_model(self, identifier: str, model: CodeModel):
         super().add_model(identifier, model)
-        code_key = model.default_calc_job_plugin.split(".")[-1]
         model.update(
             self.DEFAULT_USER_EMAIL,
-            default_code=self.default_codes.get(code_key, {}).get("code"),
+            default_code=self._get_default_code(model),
         )
 
     def refresh_codes(self):
         for _, code_model in self.get_models():
-            code_key = code_model.default_calc_job_plugin.split(".")[-1]
             code_model.update(
                 self.DEFAULT_USER_EMAIL,
-                default_code=self.default_codes.get(code_key, {}).get("code"),
+                default_code=self._get_default_code(code_model),
                 refresh=True,
             )
 
+    def refresh_codes_async(self) -> Future | asyncio.Future:
+        """Refreshes the code options of all code models in a worker thread.
+
+        Requests made while a refresh is running are coalesced into a single
+        follow-up refresh, such that codes added meanwhile are discovered. The
+        worker thread only fetches the codes. The options and selected codes of
+        all models are then set together on the calling thread, via its running
+        event loop (e.g. the kernel's), or in the worker thread if the caller
+        runs no event loop. Progress is reported by `refreshing_codes` and
+        `code_refresh_progress`.
+
+        Returns
+        -------
+        `Future | asyncio.Future`
+            Resolves (to `None`) once a refresh started after the request
+            completes, or raises the refresh error. If the caller runs an event
+            loop (e.g. in a kernel cell or a widget callback), an
+            `asyncio.Future` of that loop, to be awaited or given a done
+            callback. The refresh completes on the loop's thread, so it must
+            not be waited for by blocking that thread. Otherwise, a
+            `concurrent.futures.Future`.
+        """
+        loop = _get_running_loop()
+        with self._code_refresh_lock:
+            if self._code_refresh is not None:
+                if self._pending_code_refresh is None:
+                    self._pending_code_refresh = _create_future(loop)
+                return self._pending_code_refresh
+            self._code_refresh = future = _create_future(loop)
+            self.refreshing_codes = True
+        self._start_code_refresh(future, _get_dispatcher(loop))
+        return future
+
+    def _start_code_refresh(self, future: _AnyFuture, dispatch: _Dispatcher):
+        requests = [
+            (code_model, self._get_default_code(code_model))
+            for _, code_model in self.get_models()
+        ]
+        self.code_refresh_progress = 0.0
+        threading.Thread(
+            target=self._fetch_code_options,
+            args=(future, requests, dispatch),
+            daemon=True,
+        ).start()
+
+    def _fetch_code_options(
+        self,
+        future: _AnyFuture,
+        requests: list[tuple[CodeModel, str | None]],
+        dispatch: _Dispatcher,
+    ):
+        # Runs in the worker thread, and thus only sets traits via `dispatch`
+        results, error = None, None
+        if not future.cancelled():
+            try:
+                results = []
+                for index, (code_model, default_code) in enumerate(requests, 1):
+                    results.append(
+                        code_model.fetch_code_options(
+                            self.DEFAULT_USER_EMAIL,
+                            default_code=default_code,
+                        )
+                    )
+                    dispatch(self._set_code_refresh_progress, index / len(requests))
+            except Exception as exception:
+                results, error = None, exception
+        dispatch(self._finish_code_refresh, future, requests, results, error, dispatch)
+
+    def _set_code_refresh_progress(self, progress: float):
+        self.code_refresh_progress = progress
+
+    def _finish_code_refresh(
+        self,
+        future: _AnyFuture,
+        requests: list[tuple[CodeModel, str | None]],
+        results: list[tuple] | None,
+        error: Exception | None,
+        dispatch: _Dispatcher,
+    ):
+        try:
+            for (code_model, _), result in zip(requests, results or []):
+                code_model.set_code_options(*result)
+        except Exception as exception:
+            error = error or exception
+        # The flag is set and cleared under the lock, such that a request
+        # coalesced meanwhile cannot leave it in the wrong state
+        with self._code_refresh_lock:
+            pending = self._pending_code_refresh
+            self._pending_code_refresh = None
+            self._code_refresh = pending
+            if pending is None:
+                self.refreshing_codes = False
+        if pending is None:
+            self.code_refresh_progress = 1.0
+        else:
+            self._start_code_refresh(pending, dispatch)
+        # Resolved once the state is final, such that waiters see it
+        _resolve_future(future, error)
+
+    def _init_code_refresh(self):
+        # Reentrant, as observers of `refreshing_codes` may request a refresh
+        self._code_refresh_lock = threading.RLock()
+        self._code_refresh: _AnyFuture | None = None
+        self._pending_code_refresh: _AnyFuture | None = None
+
+    def _get_default_code(self, code_model: CodeModel) -> str | None:
+        code_key = code_model.default_calc_job_plugin.split(".")[-1]
+        return self.default_codes.get(code_key, {}).get("code")
+
     def get_model_state(self):
         return {
             "codes": {
@@ -62,3 +195,38 @@ class ResourceSettingsModel(SettingsModel, HasModels[CodeModel]):
 
     def _check_blockers(self):
         return []
+
+
+def _get_running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _get_dispatcher(loop: asyncio.AbstractEventLoop | None) -> _Dispatcher:
+    """Returns a function calling a callback (with arguments) on the thread of
+    the event loop, or immediately if there is none."""
+    if loop is not None:
+        return loop.call_soon_threadsafe
+    return lambda callback, *args: callback(*args)
+
+
+def _create_future(loop: asyncio.AbstractEventLoop | None) -> _AnyFuture:
+    return Future() if loop is None else loop.create_future()
+
+
+def _resolve_future(future: _AnyFuture, error: Exception | None):
+    def resolve():
+        if future.done():  # e.g. cancelled
+            return
+        if error is None:
+            future.set_result(None)
+        else:
+            future.set_exception(error)
+
+    if isinstance(future, asyncio.Future):
+        # Not thread-safe, and thus resolved on the thread of its loop
+        future.get_loop().call_soon_threadsafe(resolve)
+    else:
+        resolve()
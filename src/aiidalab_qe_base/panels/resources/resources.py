@@ -26,14 +26,16 @@ class ResourceSettingsPanel(SettingsPanel[RSM]):
     def register_code_trait_callbacks(self, code_model: CodeModel):
         """Registers event handlers on code model traits."""
         if code_model.default_calc_job_plugin == "quantumespresso.pw":
-            code_model.observe(
+            self.subscribe(
+                code_model,
                 self._on_code_resource_change,
                 [
                     "parallelization_override",
                     "npool",
                 ],
             )
-        code_model.observe(
+        self.subscribe(
+            code_model,
             self._on_code_resource_change,
             [
                 "selected",
@@ -45,6 +47,12 @@ class ResourceSettingsPanel(SettingsPanel[RSM]):
             ],
         )
 
+    def close(self):
+        for code_widget in self.code_widgets.values():
+            code_widget.close()
+        self.code_widgets.clear()
+        super().close()
+
     def _on_code_resource_change(self, _):
         pass
 
@@ -78,44 +86,44 @@ class ResourceSettingsPanel(SettingsPanel[RSM]):
         code_model: CodeModel,
         code_widget: QEAppComputationalResourcesWidget,
     ):
-        ipw.dlink(
+        self.dlink(
             (code_model, "options"),
             (code_widget.code_selection.code_select_dropdown, "options"),
         )
-        ipw.link(
+        self.link(
             (code_model, "warning"),
             (code_widget.code_selection.output, "value"),
         )
-        ipw.link(
+        self.link(
             (code_model, "selected"),
             (code_widget, "value"),
         )
-        ipw.link(
+        self.link(
             (code_model, "num_cpus"),
             (code_widget.num_cpus, "value"),
         )
-        ipw.link(
+        self.link(
             (code_model, "num_nodes"),
             (code_widget.num_nodes, "value"),
         )
-        ipw.link(
+        self.link(
             (code_model, "ntasks_per_node"),
             (code_widget.resource_detail.ntasks_per_node, "value"),
         )
-        ipw.link(
+        self.link(
             (code_model, "cpus_per_task"),
             (code_widget.resource_detail.cpus_per_task, "value"),
         )
-        ipw.link(
+        self.link(
             (code_model, "max_wallclock_seconds"),
             (code_widget.resource_detail.max_wallclock_seconds, "value"),
         )
         if isinstance(code_widget, PwCodeResourceSetupWidget):
-            ipw.link(
+            self.link(
                 (code_model, "parallelization_override"),
                 (code_widget.parallelization.override, "value"),
             )
-            ipw.link(
+            self.link(
                 (code_model, "npool"),
                 (code_widget.parallelization.npool, "value"),
             )
@@ -1,7 +1,20 @@
-from .model import ResultsModel
-from .results import ResultsPanel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .model import ResultsModel
+    from .results import ResultsPanel
 
 __all__ = [
     "ResultsModel",
     "ResultsPanel",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "ResultsModel": ".model",
+        "ResultsPanel": ".results",
+    },
+)
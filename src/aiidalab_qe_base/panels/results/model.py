@@ -4,6 +4,7 @@ import traitlets as tl
 from aiida import orm
 from aiida.common.extendeddicts import AttributeDict
 
+from aiidalab_qe_base.instrumentation.queries import track_queries
 from aiidalab_qe_base.mixins import HasProcess
 
 from ..settings import SettingsModel
@@ -54,6 +55,7 @@ class ResultsModel(SettingsModel, HasProcess):
         if "success" in status:
             self._completed_process = True
 
+    @track_queries
     def fetch_child_process_node(self, which="this") -> orm.ProcessNode | None:
         if not self.process_uuid:
             return
@@ -22,11 +22,13 @@ class ResultsPanel(Panel[RM]):
 
     def __init__(self, model: RM, **kwargs):
         super().__init__(model=model, **kwargs)
-        self._model.observe(
+        self.subscribe(
+            self._model,
             self._on_process_change,
             "process_uuid",
         )
-        self._model.observe(
+        self.subscribe(
+            self._model,
             self._on_monitor_counter_change,
             "monitor_counter",
         )
@@ -84,6 +86,11 @@ class ResultsPanel(Panel[RM]):
 
         self.rendered = True
 
+    def close(self):
+        if hasattr(self, "guide"):
+            self.guide.close()
+        super().close()
+
     def _on_process_change(self, _):
         self._model.update()
 
@@ -101,7 +108,7 @@ class ResultsPanel(Panel[RM]):
 
     def _get_controls_section(self) -> ipw.VBox:
         self.process_status_notification = ipw.HTML()
-        ipw.dlink(
+        self.dlink(
             (self._model, "process_status_notification"),
             (self.process_status_notification, "value"),
         )
@@ -112,7 +119,7 @@ class ResultsPanel(Panel[RM]):
             tooltip="Load the results",
             icon="refresh",
         )
-        ipw.dlink(
+        self.dlink(
             (self._model, "monitor_counter"),
             (self.load_results_button, "disabled"),
             lambda _: not self._model.has_results,
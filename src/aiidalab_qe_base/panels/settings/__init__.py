@@ -1,7 +1,20 @@
-from .model import SettingsModel
-from .settings import SettingsPanel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .model import SettingsModel
+    from .settings import SettingsPanel
 
 __all__ = [
     "SettingsModel",
     "SettingsPanel",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "SettingsModel": ".model",
+        "SettingsPanel": ".settings",
+    },
+)
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import typing as t
+import warnings
+
 import traitlets as tl
 
 from ..panel import Panel
@@ -16,4 +18,23 @@ class SettingsPanel(Panel[SM]):
 
     def __init__(self, model: SM, **kwargs):
         super().__init__(model=model, **kwargs)
+        # Deprecated - register links via `link` and `dlink` instead
         self.links: list[tl.dlink | tl.link] = []
+
+    def close(self):
+        """Unlinks any linked widgets and closes the panel."""
+        self._unlink_links()
+        super().close()
+
+    def _unlink_links(self):
+        if not self.links:
+            return
+        warnings.warn(
+            "`SettingsPanel.links` is deprecated. Register links via `link` or "
+            "`dlink`, such that they are disposed of with the panel.",
+            DeprecationWarning,
+            stacklevel=3,
+        )
+        for link in self.links:
+            link.unlink()
+        self.links.clear()
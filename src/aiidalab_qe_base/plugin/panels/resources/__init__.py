@@ -1,7 +1,22 @@
-from .model import PluginResourceSettingsModel
-from .resources import PluginResourceSettingsPanel
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .model import PluginResourceSettingsModel, sync_plugin_codes
+    from .resources import PluginResourceSettingsPanel
 
 __all__ = [
     "PluginResourceSettingsModel",
     "PluginResourceSettingsPanel",
+    "sync_plugin_codes",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "PluginResourceSettingsModel": ".model",
+        "PluginResourceSettingsPanel": ".resources",
+        "sync_plugin_codes": ".model",
+    },
+)
@@ -1,3 +1,7 @@
+from __future__ import annotations
+
+import typing as t
+
 import traitlets as tl
 
 from aiidalab_qe_base.models import CodeModel
@@ -23,13 +27,30 @@ class PluginResourceSettingsModel(ResourceSettingsModel):
         Skips synchronization with global resources if the user has chosen to override
         the resources for the plugin codes.
         """
+        self.sync_codes()
+
+    def sync_codes(self) -> dict[str, list[str]]:
+        """Applies the changed global resources to the code models.
+
+        Only the traits whose value differs from the global resources are set,
+        such that unchanged codes do not trigger any observer.
+
+        Returns
+        -------
+        `dict[str, list[str]]`
+            The changed traits, keyed by code model identifier. Codes without
+            changes are omitted.
+        """
+        changes = {}
         if self.override:
-            return
-        for _, code_model in self.get_models():
+            return changes
+        for identifier, code_model in self.get_models():
             model_key = code_model.default_calc_job_plugin.replace(".", "__")
             if model_key in self.global_codes:
                 code_resources: dict = self.global_codes[model_key]  # type: ignore
-                code_model.set_model_state(code_resources)
+                if changed := code_model.update_model_state(code_resources):
+                    changes[identifier] = changed
+        return changes
 
     def get_model_state(self):
         return {
@@ -46,3 +67,21 @@ class PluginResourceSettingsModel(ResourceSettingsModel):
             (self, "override"),
             (model, "override"),
         )
+
+
+def sync_plugin_codes(
+    models: t.Iterable[PluginResourceSettingsModel],
+) -> dict[str, dict[str, list[str]]]:
+    """Applies the changed global resources to the codes of all plugin models.
+
+    Returns
+    -------
+    `dict[str, dict[str, list[str]]]`
+        The changed traits per code (see `PluginResourceSettingsModel.sync_codes`),
+        keyed by plugin model identifier. Plugins without changes are omitted.
+    """
+    changes = {}
+    for model in models:
+        if changed := model.sync_codes():
+            changes[model.identifier] = changed
+    return changes
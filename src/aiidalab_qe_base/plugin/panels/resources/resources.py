@@ -17,11 +17,13 @@ class PluginResourceSettingsPanel(ResourceSettingsPanel[PRSM]):
     def __init__(self, model: PRSM, **kwargs):
         super().__init__(model, **kwargs)
 
-        self._model.observe(
+        self.subscribe(
+            self._model,
             self._on_global_codes_change,
             "global_codes",
         )
-        self._model.observe(
+        self.subscribe(
+            self._model,
             self._on_override_change,
             "override",
         )
@@ -38,7 +40,7 @@ class PluginResourceSettingsPanel(ResourceSettingsPanel[PRSM]):
             indent=False,
             layout=ipw.Layout(max_width="3%"),
         )
-        ipw.link(
+        self.link(
             (self._model, "override"),
             (self.override, "value"),
         )
@@ -81,33 +83,33 @@ class PluginResourceSettingsPanel(ResourceSettingsPanel[PRSM]):
     ):
         """Links the override attribute of the code model to the disable attribute
         of subwidgets of the code widget."""
-        ipw.dlink(
+        self.dlink(
             (code_model, "override"),
             (code_widget.code_selection.code_select_dropdown, "disabled"),
             lambda override: not override,
         )
-        ipw.dlink(
+        self.dlink(
             (code_model, "override"),
             (code_widget.num_cpus, "disabled"),
             lambda override: not override,
         )
-        ipw.dlink(
+        self.dlink(
             (code_model, "override"),
             (code_widget.num_nodes, "disabled"),
             lambda override: not override,
         )
-        ipw.dlink(
+        self.dlink(
             (code_model, "override"),
             (code_widget.btn_setup_resource_detail, "disabled"),
             lambda override: not override,
         )
         if isinstance(code_widget, widgets.PwCodeResourceSetupWidget):
-            ipw.dlink(
+            self.dlink(
                 (code_model, "override"),
                 (code_widget.parallelization.override, "disabled"),
                 lambda override: not override,
             )
-            ipw.dlink(
+            self.dlink(
                 (code_model, "override"),
                 (code_widget.parallelization.npool, "disabled"),
                 lambda override: not override,
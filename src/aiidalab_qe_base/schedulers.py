@@ -0,0 +1,153 @@
+"""Scheduler adapters translating app resource settings into job resources.
+
+Each AiiDA scheduler plugin expects its own shape of `metadata.options.resources`.
+Adapters are registered per `computer.scheduler_type`, such that support for new
+schedulers can be added without modifying `utils.set_component_resources`.
+"""
+
+from __future__ import annotations
+
+import warnings
+
+
+class SchedulerAdapter:
+    """Base class for scheduler adapters.
+
+    Subclasses translate the code info produced by the app's resource settings
+    (`nodes`, `ntasks_per_node`, `cpus_per_task`, ...) into the `resources`
+    dictionary expected by the scheduler's job resource class.
+    """
+
+    def get_resources(self, code_info: dict) -> dict:
+        """Returns the validated job resources for the given code info.
+
+        Parameters
+        ----------
+        `code_info` : `dict`
+            The code info, as produced by the code model state.
+
+        Returns
+        -------
+        `dict`
+            The job resources.
+
+        Raises
+        ------
+        `ValueError`
+            If the code info does not describe valid resources for the scheduler.
+        """
+        self.validate(code_info)
+        return self._translate(code_info)
+
+    def validate(self, code_info: dict):
+        """Validates the code info against the scheduler's requirements.
+
+        Parameters
+        ----------
+        `code_info` : `dict`
+            The code info, as produced by the code model state.
+
+        Raises
+        ------
+        `ValueError`
+            If any of the resource values is missing or smaller than one.
+        """
+        for key in ("nodes", "ntasks_per_node", "cpus_per_task"):
+            value = code_info.get(key)
+            if not isinstance(value, int) or isinstance(value, bool) or value < 1:
+                raise ValueError(f"`{key}` must be an integer greater than zero")
+
+    def _translate(self, code_info: dict) -> dict:
+        raise NotImplementedError
+
+
+class NodeNumberSchedulerAdapter(SchedulerAdapter):
+    """Adapter for schedulers using a node-number job resource (SLURM, PBS, direct)."""
+
+    def _translate(self, code_info: dict) -> dict:
+        return {
+            "num_machines": code_info["nodes"],
+            "num_mpiprocs_per_machine": code_info["ntasks_per_node"],
+            "num_cores_per_mpiproc": code_info["cpus_per_task"],
+        }
+
+
+class LsfSchedulerAdapter(SchedulerAdapter):
+    """Adapter for the LSF scheduler, which requests a total number of processes.
+
+    LSF job resources have no equivalent of `cpus_per_task`, so a warning is
+    issued if more than one CPU per task is requested.
+    """
+
+    def _translate(self, code_info: dict) -> dict:
+        if code_info["cpus_per_task"] > 1:
+            warnings.warn(
+                "LSF job resources do not support `cpus_per_task`; "
+                f"the requested {code_info['cpus_per_task']} CPUs per task "
+                "are ignored",
+                UserWarning,
+                stacklevel=3,
+            )
+        resources = {
+            "tot_num_mpiprocs": code_info["nodes"] * code_info["ntasks_per_node"],
+        }
+        if code_info["nodes"] > 1:
+            resources |= {
+                "use_num_machines": True,
+                "num_machines": code_info["nodes"],
+            }
+        return resources
+
+
+class HyperQueueSchedulerAdapter(SchedulerAdapter):
+    """Adapter for the HyperQueue scheduler (`aiida-hyperqueue`).
+
+    HyperQueue jobs request a number of CPUs rather than nodes, so the
+    requested nodes, tasks and CPUs per task are packed into `num_cpus`.
+    """
+
+    def _translate(self, code_info: dict) -> dict:
+        return {
+            "num_cpus": code_info["nodes"]
+            * code_info["ntasks_per_node"]
+            * code_info["cpus_per_task"]
+        }
+
+
+_DEFAULT_ADAPTER = NodeNumberSchedulerAdapter()
+
+_ADAPTERS: dict[str, SchedulerAdapter] = {
+    "core.direct": _DEFAULT_ADAPTER,
+    "core.slurm": _DEFAULT_ADAPTER,
+    "core.pbspro": _DEFAULT_ADAPTER,
+    "core.torque": _DEFAULT_ADAPTER,
+    "core.lsf": LsfSchedulerAdapter(),
+    "hyperqueue": HyperQueueSchedulerAdapter(),
+}
+
+
+def register_scheduler_adapter(scheduler_type: str, adapter: SchedulerAdapter):
+    """Registers an adapter for the given scheduler type.
+
+    Registering an adapter for an already registered scheduler type
+    replaces the existing adapter.
+
+    Parameters
+    ----------
+    `scheduler_type` : `str`
+        The scheduler entry point name, e.g. `core.slurm`.
+    `adapter` : `SchedulerAdapter`
+        The adapter instance.
+    """
+    if not isinstance(adapter, SchedulerAdapter):
+        raise TypeError("The adapter must be a `SchedulerAdapter` instance")
+    _ADAPTERS[scheduler_type] = adapter
+
+
+def get_scheduler_adapter(scheduler_type: str | None) -> SchedulerAdapter:
+    """Returns the adapter registered for the given scheduler type.
+
+    Unregistered (or undefined) scheduler types fall back to the node-number
+    adapter, which fits most batch schedulers.
+    """
+    return _ADAPTERS.get(scheduler_type or "", _DEFAULT_ADAPTER)
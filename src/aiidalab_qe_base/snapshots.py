@@ -0,0 +1,415 @@
+"""Versioned, hashable snapshots of model states.
+
+A snapshot captures the `get_model_state` of a model, or of every sub-model of
+a `HasModels` tree, as flattened and frozen `(path, value)` leaves. Snapshots
+can be compared, diffed, serialized, and restored, in which case only the
+models whose state differs from the current one are touched.
+
+A `StateStore` keeps recently used snapshots addressed by the hash of their
+canonicalized content, sharing identical model states across snapshots.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import typing as t
+from collections import OrderedDict
+from collections.abc import Mapping
+
+from .mixins import HasModels
+from .models import Model
+from .utils import FrozenNestedDict
+
+Leaf = tuple[tuple[str, ...], t.Any]
+
+
+class _EmptyDict:
+    """Marker leaf preserving empty (sub-)states when flattening."""
+
+    def __repr__(self):
+        return "{}"
+
+
+EMPTY_DICT = _EmptyDict()
+
+
+def freeze(value: t.Any) -> t.Any:
+    """Returns a hashable version of a (nested) state value.
+
+    Lists and tuples are frozen into tuples, and dictionaries (e.g. within
+    lists) into `FrozenNestedDict` mappings, such that they are thawed back
+    into lists and dictionaries.
+
+    Raises
+    ------
+    `TypeError`
+        If the value, or any nested item, is not hashable (e.g. a set).
+    """
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    if isinstance(value, Mapping):
+        return FrozenNestedDict({key: freeze(item) for key, item in value.items()})
+    try:
+        hash(value)
+    except TypeError:
+        raise TypeError(
+            f"Unsupported state value of type `{type(value).__name__}`: state "
+            "values must be hashable, or lists, tuples, or dicts of such values"
+        ) from None
+    return value
+
+
+def flatten(state: dict, prefix: tuple[str, ...] = ()) -> list[Leaf]:
+    """Flattens a nested state into sorted `(path, value)` leaves.
+
+    Raises
+    ------
+    `TypeError`
+        If a state value is not supported (see `freeze`).
+    """
+    if not state:
+        return [(prefix, EMPTY_DICT)]
+    leaves = []
+    for key in sorted(state):
+        value = state[key]
+        if isinstance(value, dict):
+            leaves += flatten(value, (*prefix, key))
+            continue
+        try:
+            leaves.append(((*prefix, key), freeze(value)))
+        except TypeError as error:
+            path = ".".join(map(str, (*prefix, key)))
+            raise TypeError(f"{error} (at `{path}`)") from None
+    return leaves
+
+
+def unflatten(leaves: t.Iterable[Leaf]) -> dict:
+    """Rebuilds a nested state from `(path, value)` leaves."""
+    state: dict = {}
+    for path, value in leaves:
+        if not path:
+            continue
+        node = state
+        for key in path[:-1]:
+            node = node.setdefault(key, {})
+        node[path[-1]] = {} if value is EMPTY_DICT else _thaw(value)
+    return state
+
+
+def _thaw(value: t.Any) -> t.Any:
+    if isinstance(value, tuple):
+        return [_thaw(item) for item in value]
+    if isinstance(value, FrozenNestedDict):
+        return {key: _thaw(item) for key, item in value.items()}
+    return value
+
+
+class SnapshotDiff:
+    """The structural difference between two snapshots.
+
+    Attributes
+    ----------
+    `changed` : `dict[tuple[str, str, ...], t.Any]`
+        The added or modified leaves, keyed by `(model path, *state path)`.
+    `removed` : `set[tuple[str, str, ...]]`
+        The paths of removed leaves.
+    `models` : `set[str]`
+        The paths of the models whose state differs.
+    """
+
+    def __init__(self, changed: dict, removed: set, models: set[str]):
+        self.changed = changed
+        self.removed = removed
+        self.models = models
+
+    def __bool__(self):
+        return bool(self.models)
+
+    def __repr__(self):
+        return f"SnapshotDiff(models={sorted(self.models)})"
+
+
+class ModelSnapshot:
+    """A versioned, hashable snapshot of the state of a model tree.
+
+    Models providing `get_model_state` are captured as a whole. Models that do
+    not (`NotImplementedError` or no such method) are traversed for sub-models
+    if they are `HasModels` containers. Sub-model states are keyed by their
+    dotted path w.r.t the captured root (the root itself being `""`).
+    """
+
+    VERSION = 1
+
+    def __init__(self, states: dict[str, dict]):
+        self._init_leaves(
+            {path: tuple(flatten(state)) for path, state in states.items()}
+        )
+
+    @classmethod
+    def capture(cls, model: Model) -> ModelSnapshot:
+        """Captures the current state of the model tree.
+
+        Parameters
+        ----------
+        `model` : `Model`
+            The root of the model tree.
+
+        Returns
+        -------
+        `ModelSnapshot`
+            The snapshot.
+        """
+        states: dict[str, dict] = {}
+        cls._capture(model, "", states)
+        return cls(states)
+
+    @classmethod
+    def from_dict(cls, data: dict) -> ModelSnapshot:
+        """Loads a snapshot serialized with `to_dict`.
+
+        Raises
+        ------
+        `ValueError`
+            If the snapshot version is not supported.
+        """
+        version = data.get("version")
+        if version != cls.VERSION:
+            raise ValueError(f"Unsupported snapshot version: {version}")
+        return cls(data["states"])
+
+    def to_dict(self) -> dict:
+        """Returns a JSON-serializable representation of the snapshot."""
+        return {
+            "version": self.VERSION,
+            "states": {path: self.get_state(path) for path in self._leaves},
+        }
+
+    @property
+    def paths(self) -> list[str]:
+        """The paths of the captured models."""
+        return list(self._leaves)
+
+    def get_state(self, path: str = "") -> dict:
+        """Returns a (fresh) copy of the captured state of a model.
+
+        Raises
+        ------
+        `KeyError`
+            If no state was captured for the model.
+        """
+        return unflatten(self._leaves[path])
+
+    def diff(self, other: ModelSnapshot) -> SnapshotDiff:
+        """Computes the changes from this snapshot to the other.
+
+        Only the leaves of models whose frozen states differ are compared.
+        """
+        changed, removed, models = {}, set(), set()
+        if self == other:
+            return SnapshotDiff(changed, removed, models)
+        for path in self._leaves.keys() | other._leaves.keys():
+            old = self._leaves.get(path, ())
+            new = other._leaves.get(path, ())
+            if old == new:
+                continue
+            models.add(path)
+            old_leaves, new_leaves = dict(old), dict(new)
+            for key, value in new_leaves.items():
+                if key not in old_leaves or old_leaves[key] != value:
+                    changed[(path, *key)] = value
+            removed.update((path, *key) for key in old_leaves.keys() - new_leaves)
+        return SnapshotDiff(changed, removed, models)
+
+    def restore(
+        self,
+        model: Model,
+        current: ModelSnapshot | None = None,
+    ) -> SnapshotDiff:
+        """Restores the snapshot onto the model tree.
+
+        Only the models whose current state differs from the snapshot are
+        updated, and traits set to unchanged values do not notify observers.
+
+        Parameters
+        ----------
+        `model` : `Model`
+            The root of the model tree.
+        `current` : `ModelSnapshot`, optional
+            The current snapshot of the model tree, if known. Captured if
+            not provided.
+
+        Returns
+        -------
+        `SnapshotDiff`
+            The applied changes.
+        """
+        current = current or self.capture(model)
+        diff = current.diff(self)
+        for path in sorted(diff.models):
+            if path not in self._leaves:
+                continue  # model not part of the snapshot
+            target = model if not path else t.cast(HasModels, model).get_model(path)
+            target.set_model_state(self.get_state(path))  # type: ignore
+        return diff
+
+    def __eq__(self, other):
+        if not isinstance(other, ModelSnapshot):
+            return NotImplemented
+        return self._hash == other._hash and self._leaves == other._leaves
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"ModelSnapshot(version={self.VERSION}, models={self.paths})"
+
+    @classmethod
+    def _from_leaves(cls, leaves: dict[str, tuple[Leaf, ...]]) -> ModelSnapshot:
+        snapshot = cls.__new__(cls)
+        snapshot._init_leaves(leaves)
+        return snapshot
+
+    def _init_leaves(self, leaves: dict[str, tuple[Leaf, ...]]):
+        self._leaves = leaves
+        self._hash = hash(tuple(sorted(leaves.items())))
+
+    @classmethod
+    def _capture(cls, model: Model, path: str, states: dict[str, dict]):
+        get_model_state = getattr(model, "get_model_state", None)
+        if get_model_state is not None:
+            try:
+                states[path] = get_model_state()
+                return
+            except NotImplementedError:
+                pass
+        if isinstance(model, HasModels):
+            for identifier, sub_model in model.get_models():
+                sub_path = f"{path}.{identifier}" if path else identifier
+                cls._capture(sub_model, sub_path, states)
+
+
+def state_key(state: dict) -> str:
+    """Returns the content address of a model state.
+
+    The address is the SHA-256 digest of the canonical JSON representation of
+    the state, such that equal states share an address regardless of key order
+    or of the use of lists or tuples.
+    """
+    canonical = json.dumps(state, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class StateStore:
+    """A bounded, content-addressed store of recently used model snapshots.
+
+    Each snapshot is stored as a mapping of model paths to state addresses.
+    Identical model states (e.g. the same resources used across calculations
+    with different settings) are stored once and shared. When more than
+    `max_size` snapshots are stored, the least recently used is evicted,
+    together with any state no longer referenced by a stored snapshot.
+    """
+
+    def __init__(self, max_size: int = 20):
+        if max_size < 1:
+            raise ValueError("`max_size` must be greater than zero")
+        self.max_size = max_size
+        self._states: dict[str, tuple[Leaf, ...]] = {}
+        self._references: dict[str, int] = {}
+        self._snapshots: OrderedDict[str, dict[str, str]] = OrderedDict()
+
+    def __contains__(self, key: str):
+        return key in self._snapshots
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def keys(self) -> list[str]:
+        """The keys of the stored snapshots, most recently used first."""
+        return list(reversed(self._snapshots))
+
+    @property
+    def num_states(self) -> int:
+        """The number of distinct model states in the store."""
+        return len(self._states)
+
+    def add(self, snapshot: ModelSnapshot | Model) -> str:
+        """Stores a snapshot, or the current snapshot of a model tree.
+
+        Parameters
+        ----------
+        `snapshot` : `ModelSnapshot | Model`
+            The snapshot, or the root of the model tree to capture.
+
+        Returns
+        -------
+        `str`
+            The key of the stored snapshot.
+        """
+        if not isinstance(snapshot, ModelSnapshot):
+            snapshot = ModelSnapshot.capture(snapshot)
+        addresses = {
+            path: state_key(snapshot.get_state(path)) for path in snapshot.paths
+        }
+        key = state_key(addresses)
+        if key in self._snapshots:
+            self._snapshots.move_to_end(key)
+            return key
+        for path, address in addresses.items():
+            if address not in self._states:
+                self._states[address] = snapshot._leaves[path]
+                self._references[address] = 0
+            self._references[address] += 1
+        self._snapshots[key] = addresses
+        while len(self._snapshots) > self.max_size:
+            self._evict()
+        return key
+
+    def get(self, key: str) -> ModelSnapshot:
+        """Returns a stored snapshot, marking it as recently used.
+
+        Raises
+        ------
+        `KeyError`
+            If no snapshot is stored under the key.
+        """
+        addresses = self._snapshots[key]
+        self._snapshots.move_to_end(key)
+        return ModelSnapshot._from_leaves(
+            {path: self._states[address] for path, address in addresses.items()}
+        )
+
+    def apply(
+        self,
+        key: str,
+        model: Model,
+        current: ModelSnapshot | None = None,
+    ) -> SnapshotDiff:
+        """Restores a stored snapshot onto the model tree.
+
+        See `ModelSnapshot.restore`.
+        """
+        return self.get(key).restore(model, current)
+
+    def remove(self, key: str):
+        """Removes a stored snapshot.
+
+        Raises
+        ------
+        `KeyError`
+            If no snapshot is stored under the key.
+        """
+        for address in self._snapshots.pop(key).values():
+            self._references[address] -= 1
+            if not self._references[address]:
+                del self._references[address]
+                del self._states[address]
+
+    def clear(self):
+        """Removes all stored snapshots."""
+        self._states.clear()
+        self._references.clear()
+        self._snapshots.clear()
+
+    def _evict(self):
+        self.remove(next(iter(self._snapshots)))
@@ -0,0 +1,170 @@
+"""Cached descriptors of input structures.
+
+Descriptors, including NumPy arrays of positions, species and masses, are
+computed in a single pass over the raw node attributes, rather than through the
+`StructureData` properties, which rebuild `Kind` and `Site` objects on each
+access. Descriptors of stored (immutable) structures are cached
+by uuid and thus shared by all models holding the same structure. Descriptors
+of unstored structures are cached by the holding model, per assignment (see
+`HasInputStructure.structure_descriptors`).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+
+import numpy as np
+from aiida import orm
+
+# The default k-points distance (in 1/Angstrom) of the app's workflows
+DEFAULT_KPOINTS_DISTANCE = 0.15
+
+
+class StructureDescriptors:
+    """Descriptors of a `StructureData` node.
+
+    Array attributes are read-only and shared by all users of the descriptors.
+
+    Attributes
+    ----------
+    `cell` : `np.ndarray`
+        The 3x3 cell, in Angstrom.
+    `positions` : `np.ndarray`
+        The Nx3 site positions, in Angstrom.
+    `species` : `np.ndarray`
+        The index of the kind of each site in `kind_names`.
+    `kind_masses` : `np.ndarray`
+        The mass of each kind in `kind_names`.
+    `pbc` : `tuple[bool, bool, bool]`
+        The periodic boundary conditions.
+    `has_tags` : `bool`
+        Whether any kind name is tagged (not purely alphabetic).
+    `kind_names` : `list[str]`
+        The kind names, in the order of definition.
+    `kind_counts` : `dict[str, int]`
+        The number of sites per kind.
+    `num_atoms` : `int`
+        The number of sites.
+    `composition` : `dict[str, int]`
+        The number of sites hosting each element.
+    `cell_volume` : `float`
+        The cell volume in Angstrom^3.
+    `num_kpoints` : `int`
+        The number of k-points of the mesh at the default k-points distance.
+    """
+
+    def __init__(self, attributes: dict):
+        cell = np.asarray(attributes.get("cell", np.eye(3)), dtype=float)
+        kinds = attributes.get("kinds", [])
+        sites = attributes.get("sites", [])
+
+        self.pbc = tuple(bool(attributes.get(f"pbc{i}", True)) for i in (1, 2, 3))
+        self.kind_names = [kind["name"] for kind in kinds]
+        self.has_tags = any(not name.isalpha() for name in self.kind_names)
+
+        kind_indices = {name: index for index, name in enumerate(self.kind_names)}
+        positions = np.array(
+            [site["position"] for site in sites],
+            dtype=float,
+        ).reshape(-1, 3)
+        species = np.fromiter(
+            (kind_indices[site["kind_name"]] for site in sites),
+            dtype=np.intp,
+            count=len(sites),
+        )
+        kind_masses = np.array([kind["mass"] for kind in kinds], dtype=float)
+
+        self.cell = _read_only(cell)
+        self.positions = _read_only(positions)
+        self.species = _read_only(species)
+        self.kind_masses = _read_only(kind_masses)
+
+        counts = np.bincount(species, minlength=len(kinds)).tolist()
+        self.kind_counts = dict(zip(self.kind_names, counts))
+        self.num_atoms = len(sites)
+
+        composition: Counter = Counter()
+        for kind in kinds:
+            for symbol in kind["symbols"]:
+                composition[symbol] += self.kind_counts[kind["name"]]
+        self.composition = dict(composition)
+
+        self.cell_volume = float(abs(np.linalg.det(cell)))
+        self.num_kpoints = self.estimate_num_kpoints()
+
+    @classmethod
+    def from_structure(cls, structure: orm.StructureData) -> StructureDescriptors:
+        """Computes the descriptors of the structure."""
+        return cls(structure.base.attributes.all)
+
+    def get_kpoints_mesh(
+        self,
+        distance: float = DEFAULT_KPOINTS_DISTANCE,
+    ) -> list[int]:
+        """Returns the k-points mesh for the given k-points distance.
+
+        Follows `KpointsData.set_kpoints_mesh_from_density`, without creating
+        a node. Non-periodic directions have a single k-point.
+        """
+        if not self.cell_volume:
+            return [1, 1, 1]
+        reciprocal_cell = 2 * np.pi * np.linalg.inv(self.cell).T
+        return [
+            max(int(np.ceil(round(np.linalg.norm(b) / distance, 5))), 1) if pbc else 1
+            for pbc, b in zip(self.pbc, reciprocal_cell)
+        ]
+
+    def estimate_num_kpoints(self, distance: float = DEFAULT_KPOINTS_DISTANCE) -> int:
+        """Returns the number of k-points of the mesh (without symmetry reduction)."""
+        return int(np.prod(self.get_kpoints_mesh(distance)))
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+_CACHE_SIZE = 32
+_cache: OrderedDict[str, StructureDescriptors] = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def get_structure_descriptors(structure: orm.StructureData) -> StructureDescriptors:
+    """Returns the descriptors of the structure.
+
+    Descriptors of stored structures are cached by uuid. Unstored structures
+    may still be modified in place and are therefore always recomputed.
+    """
+    if not structure.is_stored:
+        return StructureDescriptors.from_structure(structure)
+    with _cache_lock:
+        if (descriptors := _cache.get(structure.uuid)) is not None:
+            _cache.move_to_end(structure.uuid)
+            return descriptors
+    descriptors = StructureDescriptors.from_structure(structure)
+    with _cache_lock:
+        _cache[structure.uuid] = descriptors
+        while len(_cache) > _CACHE_SIZE:
+            _cache.popitem(last=False)
+    return descriptors
+
+
+def get_structure_fingerprint(structure: orm.StructureData) -> str:
+    """Returns a fingerprint identifying the content of the structure.
+
+    Stored structures are identified by their uuid. Unstored structures are
+    identified by a digest of their attributes, such that equal unstored
+    structures share a fingerprint.
+    """
+    if structure.is_stored:
+        return structure.uuid
+    canonical = json.dumps(
+        structure.base.attributes.all,
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode()).hexdigest()
@@ -1,11 +1,18 @@
+from __future__ import annotations
+
 import sys
 import typing as t
-from datetime import datetime
+from collections.abc import Mapping, MutableMapping
+from datetime import datetime, tzinfo
+from functools import lru_cache
 
+import numpy as np
 import traitlets as tl
 from aiida import orm
 from dateutil.relativedelta import relativedelta
 
+from .schedulers import get_scheduler_adapter
+
 if sys.version_info >= (3, 11):
     from typing import Self
 else:
@@ -23,25 +30,17 @@ class HasTraits(tl.HasTraits):
 
 
 def set_component_resources(component, code_info):
-    """Set the resources for a given component based on the code info."""
+    """Set the resources for a given component based on the code info.
+
+    The shape of the resources is delegated to the adapter registered for the
+    scheduler type of the code's computer (see `schedulers`).
+    """
     # Ensure code_info is not None or empty
     # ? XXX: from jyu, need to pop a warning to plugin developer or what?
     if code_info:
         code: orm.Code = code_info["code"]
-        if code.computer.scheduler_type == "hyperqueue":
-            component.metadata.options.resources = {
-                "num_cpus": code_info["nodes"]
-                * code_info["ntasks_per_node"]
-                * code_info["cpus_per_task"]
-            }
-        else:
-            # XXX: jyu should properly deal with None type of scheduler_type which can
-            # be "core.direct" (will be replaced by hyperqueue) and "core.slurm" ...
-            component.metadata.options.resources = {
-                "num_machines": code_info["nodes"],
-                "num_mpiprocs_per_machine": code_info["ntasks_per_node"],
-                "num_cores_per_mpiproc": code_info["cpus_per_task"],
-            }
+        adapter = get_scheduler_adapter(code.computer.scheduler_type)
+        component.metadata.options.resources = adapter.get_resources(code_info)
 
         max_wallclock_seconds = code_info["max_wallclock_seconds"]
         component.metadata.options["max_wallclock_seconds"] = max_wallclock_seconds
@@ -57,12 +56,222 @@ def enable_pencil_decomposition(component):
 
 
 def shallow_copy_nested_dict(d):
-    """Recursively copies only the dictionary structure but keeps value references."""
+    """Recursively copies only the dictionary structure but keeps value references.
+
+    Rebuilds every level of the structure. For large trees copied repeatedly,
+    consider `NestedDict`, whose copies share structure until modified.
+    """
     if isinstance(d, dict):
         return {key: shallow_copy_nested_dict(value) for key, value in d.items()}
     return d
 
 
+class FrozenNestedDict(Mapping):
+    """An immutable nested mapping, sharing unchanged branches between versions.
+
+    Nested dictionaries are converted to `FrozenNestedDict`, and lists to
+    tuples, on construction, such that the mapping is hashable. Other values
+    are kept by reference. Use `thaw` to obtain a mutable (copy-on-write)
+    `NestedDict` in constant time.
+    """
+
+    __slots__ = ("_data", "_hash")
+
+    def __init__(self, data: Mapping | None = None):
+        if isinstance(data, FrozenNestedDict):
+            self._data = data._data
+        else:
+            self._data = {
+                key: _freeze_value(value) for key, value in (data or {}).items()
+            }
+        self._hash = None
+
+    def __getitem__(self, key):
+        return self._data[key]
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __eq__(self, other):
+        if isinstance(other, NestedDict):
+            other = other.freeze()
+        if isinstance(other, FrozenNestedDict):
+            if self._data is other._data:
+                return True
+            other = other._data
+        if not isinstance(other, Mapping):
+            return NotImplemented
+        return self._data == other
+
+    def __hash__(self):
+        if self._hash is None:
+            self._hash = hash(frozenset(self._data.items()))
+        return self._hash
+
+    def __repr__(self):
+        return f"FrozenNestedDict({self.to_dict()!r})"
+
+    def thaw(self) -> NestedDict:
+        """Returns a mutable copy-on-write version of the mapping."""
+        return NestedDict(self)
+
+    def to_dict(self) -> dict:
+        """Returns a plain nested dictionary copy of the mapping.
+
+        Frozen lists are returned as lists.
+        """
+        return {key: _thaw_value(value) for key, value in self._data.items()}
+
+
+class NestedDict(MutableMapping):
+    """A copy-on-write nested dictionary.
+
+    Copies (see `copy`) share their structure with the original until either
+    is modified, at which point only the levels along the modified path are
+    copied. `freeze` returns an immutable snapshot, cached until the next
+    modification, and equality is structural.
+
+    Nested dictionaries are returned as `NestedDict` branches, such that
+    `nested["a"]["b"] = value` only copies the `a` branch and the root level.
+    Reading a branch copies nothing. Assigning a mapping stores a copy of it,
+    never a reference, and lists are stored frozen (as tuples).
+    """
+
+    __slots__ = ("_base", "_data", "_frozen", "_parent", "_key", "_branches")
+
+    def __init__(self, data: Mapping | None = None):
+        if isinstance(data, NestedDict):
+            data = data.freeze()
+        self._base = (
+            data if isinstance(data, FrozenNestedDict) else FrozenNestedDict(data)
+        )
+        self._data: dict | None = None  # own top level, once modified
+        self._frozen: FrozenNestedDict | None = self._base
+        self._parent: NestedDict | None = None
+        self._key: t.Any = None
+        self._branches: dict[t.Any, NestedDict] | None = None  # unmodified branches
+
+    def __getitem__(self, key):
+        value = self._level[key]
+        if isinstance(value, FrozenNestedDict):
+            # Wrapped (once) in a branch that is only stored in this level
+            # once modified (see `_modified`)
+            if self._branches is None:
+                self._branches = {}
+            branch = self._branches.get(key)
+            if branch is None or branch._base is not value:
+                branch = self._branches[key] = self._adopt(NestedDict(value), key)
+            value = branch
+        return value
+
+    def __setitem__(self, key, value):
+        if isinstance(value, Mapping):
+            value = self._adopt(NestedDict(value), key)
+        else:
+            value = _freeze_value(value)
+        self._own()[key] = value
+        self._drop_branch(key)
+        self._modified()
+
+    def __delitem__(self, key):
+        del self._own()[key]
+        self._drop_branch(key)
+        self._modified()
+
+    def __iter__(self):
+        return iter(self._level)
+
+    def __len__(self):
+        return len(self._level)
+
+    def __eq__(self, other):
+        return self.freeze() == other
+
+    __hash__ = None  # type: ignore
+
+    def __repr__(self):
+        return f"NestedDict({self.to_dict()!r})"
+
+    def copy(self) -> NestedDict:
+        """Returns a copy sharing the structure of this dictionary."""
+        return NestedDict(self.freeze())
+
+    def freeze(self) -> FrozenNestedDict:
+        """Returns an immutable snapshot of the dictionary."""
+        if self._frozen is None:
+            frozen = FrozenNestedDict()
+            frozen._data = {
+                key: value.freeze() if isinstance(value, NestedDict) else value
+                for key, value in t.cast(dict, self._data).items()
+            }
+            self._frozen = frozen
+        return self._frozen
+
+    def to_dict(self) -> dict:
+        """Returns a plain nested dictionary copy of the dictionary."""
+        return self.freeze().to_dict()
+
+    @property
+    def _level(self) -> Mapping:
+        return self._base if self._data is None else self._data
+
+    def _own(self) -> dict:
+        if self._data is None:
+            self._data = dict(self._base._data)
+        return self._data
+
+    def _drop_branch(self, key):
+        if self._branches:
+            self._branches.pop(key, None)
+
+    def _adopt(self, child: NestedDict, key) -> NestedDict:
+        child._parent = self
+        child._key = key
+        return child
+
+    def _modified(self):
+        # Invalidates the modified level and its ancestors, storing unmodified
+        # branches along the path in their parent level
+        node = self
+        while (parent := node._parent) is not None:
+            stored = parent._level.get(node._key)
+            if stored is not node:
+                if stored is not node._base:
+                    # The branch was replaced or deleted, so it is detached
+                    node._parent = None
+                    break
+                parent._own()[node._key] = node
+                parent._drop_branch(node._key)
+            elif node._frozen is None:
+                return  # ancestors are already invalidated
+            node._frozen = None
+            node = parent
+        node._frozen = None
+
+
+def _freeze_value(value):
+    if isinstance(value, NestedDict):
+        return value.freeze()
+    if isinstance(value, FrozenNestedDict):
+        return value
+    if isinstance(value, Mapping):
+        return FrozenNestedDict(value)
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze_value(item) for item in value)
+    return value
+
+
+def _thaw_value(value):
+    if isinstance(value, FrozenNestedDict):
+        return value.to_dict()
+    if isinstance(value, tuple):
+        return [_thaw_value(item) for item in value]
+    return value
+
+
 def format_time(time: datetime):
     return time.strftime("%Y-%m-%d %H:%M:%S")
 
@@ -83,3 +292,157 @@ def relative_time(time: datetime):
         return f"{delta.minutes} minute{'s' if delta.minutes > 1 else ''} ago"
     else:
         return f"{delta.seconds} second{'s' if delta.seconds > 1 else ''} ago"
+
+
+def format_times(times: t.Iterable[datetime] | np.ndarray) -> list[str]:
+    """Formats many times at once, as `format_time` would.
+
+    Parameters
+    ----------
+    `times` : `t.Iterable[datetime] | np.ndarray`
+        The times, as datetimes (formatted in their own timezone) or a NumPy
+        `datetime64` array.
+
+    Returns
+    -------
+    `list[str]`
+        The formatted times.
+    """
+    if not isinstance(times, np.ndarray):
+        times = list(times)
+    # Times sharing a timezone are converted in bulk (see `_as_datetime64`)
+    timezones = {time.tzinfo for time in times if isinstance(time, datetime)}
+    timezone = timezones.pop() if len(timezones) == 1 else None
+    values = _as_datetime64(times, timezone)
+    strings = np.datetime_as_string(values, unit="s")
+    if strings.size:
+        # Replaces the ISO "T" separator in place (NaT strings are left as is)
+        characters = strings.view(np.uint32).reshape(strings.size, -1)
+        characters[~np.isnat(values), 10] = ord(" ")
+    return strings.tolist()
+
+
+_TIME_UNITS = ("year", "month", "day", "hour", "minute", "second")
+
+
+def relative_times(
+    times: t.Iterable[datetime] | np.ndarray,
+    now: datetime | np.datetime64 | None = None,
+) -> list[str]:
+    """Returns the time elapsed since each of many times, as `relative_time` would.
+
+    Elapsed times are computed in bulk with NumPy (calendar years and months as
+    by `relativedelta`), and each distinct label is formatted once, such that
+    thousands of times (e.g. process creation times) are labeled in milliseconds.
+
+    Parameters
+    ----------
+    `times` : `t.Iterable[datetime] | np.ndarray`
+        The past times, as datetimes or a NumPy `datetime64` array. Timezone-aware
+        datetimes are converted to the timezone of `now`. Naive datetimes and
+        `datetime64` values are taken as wall times in that timezone.
+    `now` : `datetime | np.datetime64`, optional
+        The reference time. Defaults to the current local time.
+
+    Returns
+    -------
+    `list[str]`
+        The `"N units ago"` labels. Future times are labeled `"0 second ago"`.
+    """
+    if now is None:
+        now = datetime.now().astimezone()
+    timezone = now.tzinfo if isinstance(now, datetime) else None
+    values = _as_datetime64(times, timezone)
+    if not values.size:
+        return []
+    reference = _as_datetime64([now], timezone)[0]
+
+    # Calendar months, less one if `now` precedes the anniversary of the time
+    # in its month (clamped to the end of the month, as by `relativedelta`)
+    reference_month = reference.astype("M8[M]")
+    value_months = values.astype("M8[M]")
+    months = (reference_month - value_months).astype(np.int64)
+    value_days = values.astype("M8[D]")
+    days_in_month = (reference_month + 1).astype("M8[D]") - reference_month.astype(
+        "M8[D]"
+    )
+    anniversaries = (
+        reference_month.astype("M8[D]")
+        + np.minimum(value_days - value_months.astype("M8[D]"), days_in_month - 1)
+        + (values - value_days)
+    )
+    months -= anniversaries > reference
+    months = np.maximum(months, 0)
+
+    seconds = np.maximum((reference - values) // np.timedelta64(1, "s"), 0)
+    conditions = [
+        months >= 12,
+        months > 0,
+        seconds >= 86400,
+        seconds >= 3600,
+        seconds >= 60,
+    ]
+    units = np.select(conditions, np.arange(5), default=5)
+    counts = np.select(
+        conditions,
+        [months // 12, months, seconds // 86400, seconds // 3600, seconds // 60],
+        default=seconds,
+    )
+
+    # Each distinct (unit, count) bucket is labeled once
+    buckets, inverse = np.unique(
+        counts * len(_TIME_UNITS) + units,
+        return_inverse=True,
+    )
+    labels = np.array(
+        [
+            _relative_label(
+                _TIME_UNITS[bucket % len(_TIME_UNITS)], int(bucket) // len(_TIME_UNITS)
+            )
+            for bucket in buckets
+        ],
+        dtype=object,
+    )
+    return labels[inverse.reshape(-1)].tolist()
+
+
+@lru_cache(maxsize=1024)
+def _relative_label(unit: str, count: int) -> str:
+    return f"{count} {unit}{'s' if count > 1 else ''} ago"
+
+
+def _as_datetime64(
+    times: t.Iterable[datetime | np.datetime64] | np.ndarray,
+    timezone: tzinfo | None = None,
+) -> np.ndarray:
+    if isinstance(times, np.ndarray) and np.issubdtype(times.dtype, np.datetime64):
+        return times.astype("M8[us]")
+    times = list(times)
+    offset = timezone.utcoffset(None) if timezone is not None else None
+    if offset is not None and all(
+        isinstance(time, datetime) and time.tzinfo is not None for time in times
+    ):
+        # Aware times are converted in bulk through POSIX timestamps, which is
+        # exact for a fixed-offset target timezone
+        timestamps = np.fromiter(
+            (time.timestamp() for time in times),
+            dtype=float,
+            count=len(times),
+        )
+        microseconds = np.rint(timestamps * 1e6).astype(np.int64)
+        return microseconds.astype("M8[us]") + np.timedelta64(offset)
+    return np.array(
+        [_to_wall_time(time, timezone) for time in times],
+        dtype="M8[us]",
+    ).reshape(-1)
+
+
+def _to_wall_time(
+    time: datetime | np.datetime64,
+    timezone: tzinfo | None,
+) -> datetime | np.datetime64:
+    if not isinstance(time, datetime):
+        return time
+    if time.tzinfo is not None and timezone is not None:
+        time = time.astimezone(timezone)
+    return time.replace(tzinfo=None)
@@ -1,16 +1,21 @@
-from .table_widget import TableWidget
-from .widgets import (
-    HBoxWithUnits,
-    InAppGuide,
-    InfoBox,
-    LazyLoader,
-    LinkButton,
-    ParallelizationSettings,
-    ProgressBar,
-    PwCodeResourceSetupWidget,
-    QEAppComputationalResourcesWidget,
-    ResourceDetailSettings,
-)
+import typing as t
+
+from aiidalab_qe_base.lazy import lazy_attributes
+
+if t.TYPE_CHECKING:
+    from .table_widget import TableWidget
+    from .widgets import (
+        HBoxWithUnits,
+        InAppGuide,
+        InfoBox,
+        LazyLoader,
+        LinkButton,
+        ParallelizationSettings,
+        ProgressBar,
+        PwCodeResourceSetupWidget,
+        QEAppComputationalResourcesWidget,
+        ResourceDetailSettings,
+    )
 
 __all__ = [
     "TableWidget",
@@ -25,3 +30,20 @@ __all__ = [
     "QEAppComputationalResourcesWidget",
     "ResourceDetailSettings",
 ]
+
+__getattr__, __dir__ = lazy_attributes(
+    __name__,
+    {
+        "TableWidget": ".table_widget",
+        "HBoxWithUnits": ".widgets",
+        "InAppGuide": ".widgets",
+        "InfoBox": ".widgets",
+        "LazyLoader": ".widgets",
+        "LinkButton": ".widgets",
+        "ParallelizationSettings": ".widgets",
+        "ProgressBar": ".widgets",
+        "PwCodeResourceSetupWidget": ".widgets",
+        "QEAppComputationalResourcesWidget": ".widgets",
+        "ResourceDetailSettings": ".widgets",
+    },
+)
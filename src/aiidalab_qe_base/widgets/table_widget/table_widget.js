@@ -1,71 +1,359 @@
+// Fallback row height (px) used until a rendered row can be measured
+const DEFAULT_ROW_HEIGHT = 28;
+// Number of rows rendered above/below the visible window
+const OVERSCAN = 10;
+// Maximum number of pages kept in the browser in server mode
+const MAX_CACHED_PAGES = 10;
+// Typed arrays matching the binary column dtypes sent in columnar mode
+const TYPED_ARRAYS = {
+  int8: Int8Array,
+  int16: Int16Array,
+  int32: Int32Array,
+  int64: BigInt64Array,
+  uint8: Uint8Array,
+  uint16: Uint16Array,
+  uint32: Uint32Array,
+  uint64: BigUint64Array,
+  float32: Float32Array,
+  float64: Float64Array,
+};
+
+function decodeColumns(schema, columnData) {
+  return schema.map((field, j) => {
+    const TypedArray = TYPED_ARRAYS[field.dtype];
+    if (!TypedArray) {
+      return columnData[j]; // JSON column
+    }
+    const view = columnData[j];
+    let { buffer, byteOffset, byteLength } = view;
+    if (byteOffset % TypedArray.BYTES_PER_ELEMENT) {
+      // Typed arrays require aligned offsets
+      buffer = buffer.slice(byteOffset, byteOffset + byteLength);
+      byteOffset = 0;
+    }
+    return new TypedArray(
+      buffer,
+      byteOffset,
+      byteLength / TypedArray.BYTES_PER_ELEMENT,
+    );
+  });
+}
+
+function applyPatch(data, msg) {
+  if (msg.type === "append") {
+    data.push(...msg.rows);
+  } else if (msg.type === "update") {
+    for (const [index, row] of msg.rows) {
+      data[index + 1] = row;
+    }
+  }
+}
+
+function initialize({ model }) {
+  // Patch the shared model state once, regardless of the number of views
+  model.on("msg:custom", (msg) => applyPatch(model.get("data"), msg));
+}
+
 function render({ model, el }) {
-  let domElement = document.createElement("div");
   el.classList.add("custom-table");
-  let selectedIndices = [];
 
-  function drawTable() {
-    const data = model.get("data");
-    domElement.innerHTML = "";
-    let innerHTML =
-      "<table><tr>" +
-      data[0].map((header) => `<th>${header}</th>`).join("") +
-      "</tr>";
-
-    for (let i = 1; i < data.length; i++) {
+  const viewport = document.createElement("div");
+  viewport.classList.add("table-viewport");
+  const table = document.createElement("table");
+  const thead = document.createElement("thead");
+  const tbody = document.createElement("tbody");
+  table.append(thead, tbody);
+  viewport.appendChild(table);
+
+  let rowHeight = 0;
+  let selectedIds = new Set(model.get("selected_rows"));
+  let renderedIds = new Map(); // row index -> row id of rendered rows
+  let frameRequested = false;
+  let columns = null; // decoded columns in columnar mode
+  let pages = new Map(); // page index -> {rows, ids} in server mode
+  let pendingPages = new Set();
+  let visiblePages = { first: 0, last: 0 };
+
+  function getHeader() {
+    switch (model.get("_mode")) {
+      case "server":
+        return model.get("_server_header");
+      case "columns":
+        return model.get("_schema").map((field) => field.name);
+      default:
+        return model.get("data")[0] || [];
+    }
+  }
+
+  function numRows() {
+    switch (model.get("_mode")) {
+      case "server":
+        return model.get("_num_rows");
+      case "columns":
+        return columns && columns.length ? columns[0].length : 0;
+      default:
+        return Math.max(model.get("data").length - 1, 0);
+    }
+  }
+
+  function getRowData(index) {
+    // Returns the cells and id of the row, or `null` if not yet available
+    switch (model.get("_mode")) {
+      case "server": {
+        const pageSize = model.get("page_size");
+        const pageIndex = Math.floor(index / pageSize);
+        const page = pages.get(pageIndex);
+        if (!page) {
+          requestPage(pageIndex);
+          return null;
+        }
+        const i = index % pageSize;
+        return { cells: page.rows[i], id: page.ids[i] };
+      }
+      case "columns":
+        return { cells: columns.map((column) => column[index]), id: index };
+      default:
+        return { cells: model.get("data")[index + 1], id: index };
+    }
+  }
+
+  function requestPage(pageIndex) {
+    if (pendingPages.has(pageIndex)) {
+      return;
+    }
+    pendingPages.add(pageIndex);
+    const pageSize = model.get("page_size");
+    model.send({
+      type: "request_page",
+      offset: pageIndex * pageSize,
+      limit: pageSize,
+    });
+  }
+
+  function onPage(msg) {
+    const pageIndex = Math.floor(msg.offset / model.get("page_size"));
+    if (
+      msg.version !== model.get("_view_version") ||
+      !pendingPages.has(pageIndex) // stale or requested by another view
+    ) {
+      return;
+    }
+    pendingPages.delete(pageIndex);
+    pages.set(pageIndex, { rows: msg.rows, ids: msg.ids });
+    // Only keep a window of pages, evicting the ones farthest from view
+    const distance = (key) =>
+      key < visiblePages.first
+        ? visiblePages.first - key
+        : Math.max(key - visiblePages.last, 0);
+    const candidates = [...pages.keys()]
+      .filter((key) => distance(key) > 0)
+      .sort((a, b) => distance(b) - distance(a));
+    while (pages.size > MAX_CACHED_PAGES && candidates.length) {
+      pages.delete(candidates.shift());
+    }
+    requestDraw();
+  }
+
+  function resetPages() {
+    pages = new Map();
+    pendingPages = new Set();
+    drawTable();
+  }
+
+  function drawHeader() {
+    const header = getHeader();
+    const sortable = model.get("_mode") === "server";
+    const sortColumn = model.get("sort_column");
+    const arrow = model.get("sort_ascending") ? " &#9650;" : " &#9660;";
+    thead.innerHTML = header.length
+      ? "<tr>" +
+        header
+          .map((name, j) => {
+            const attributes = sortable ? ` data-column="${j}" class="sortable"` : "";
+            const indicator = sortable && name === sortColumn ? arrow : "";
+            return `<th${attributes}>${name}${indicator}</th>`;
+          })
+          .join("") +
+        "</tr>"
+      : "";
+  }
+
+  function drawRows() {
+    // Only the rows in (and around) the visible window are rendered, with
+    // spacer rows standing in for the rest to preserve the scroll height
+    const total = numRows();
+    const numColumns = getHeader().length || 1;
+    const height = rowHeight || DEFAULT_ROW_HEIGHT;
+    const viewportHeight = viewport.clientHeight || 50 * height;
+    const first = Math.max(Math.floor(viewport.scrollTop / height) - OVERSCAN, 0);
+    const last = Math.min(
+      first + Math.ceil(viewportHeight / height) + 2 * OVERSCAN,
+      total,
+    );
+
+    const pageSize = model.get("page_size");
+    visiblePages = {
+      first: Math.floor(first / pageSize),
+      last: Math.floor(Math.max(last - 1, 0) / pageSize),
+    };
+    renderedIds = new Map();
+    let innerHTML = `<tr class="spacer-row" style="height: ${first * height}px"></tr>`;
+    for (let i = first; i < last; i++) {
+      const row = getRowData(i);
+      if (!row) {
+        innerHTML += `<tr class="pending-row"><td colspan="${numColumns}">&hellip;</td></tr>`;
+        continue;
+      }
+      renderedIds.set(i, row.id);
+      const selected = selectedIds.has(row.id) ? ' class="selected-row"' : "";
       innerHTML +=
-        "<tr>" + data[i].map((cell) => `<td>${cell}</td>`).join("") + "</tr>";
-    }
-
-    innerHTML += "</table>";
-    domElement.innerHTML = innerHTML;
-
-    const rows = domElement.querySelectorAll("tr");
-    rows.forEach((row, index) => {
-      if (index > 0) {
-        row.addEventListener("click", () => {
-          const rowIndex = index - 1;
-          if (selectedIndices.includes(rowIndex)) {
-            selectedIndices = selectedIndices.filter((i) => i !== rowIndex);
-            row.classList.remove("selected-row");
-          } else {
-            selectedIndices.push(rowIndex);
-            row.classList.add("selected-row");
-          }
-          model.set("selected_rows", [...selectedIndices]);
-          model.save_changes();
-        });
-
-        row.addEventListener("mouseover", () => {
-          if (!row.classList.contains("selected-row")) {
-            row.classList.add("hover-row");
-          }
-        });
-
-        row.addEventListener("mouseout", () => {
-          row.classList.remove("hover-row");
-        });
+        `<tr data-index="${i}"${selected}>` +
+        row.cells.map((cell) => `<td>${cell}</td>`).join("") +
+        "</tr>";
+    }
+    innerHTML += `<tr class="spacer-row" style="height: ${(total - last) * height}px"></tr>`;
+    tbody.innerHTML = innerHTML;
+
+    if (!rowHeight) {
+      const row = tbody.querySelector("tr[data-index]");
+      if (row && row.offsetHeight) {
+        rowHeight = row.offsetHeight;
+        drawRows();
       }
+    }
+  }
+
+  function drawTable() {
+    drawHeader();
+    drawRows();
+  }
+
+  function updateColumns() {
+    columns =
+      model.get("_mode") === "columns"
+        ? decodeColumns(model.get("_schema"), model.get("_column_data"))
+        : null;
+    drawTable();
+  }
+
+  function requestDraw() {
+    if (frameRequested) {
+      return;
+    }
+    frameRequested = true;
+    requestAnimationFrame(() => {
+      frameRequested = false;
+      drawRows();
     });
   }
 
+  function getRow(event) {
+    return event.target.closest("tr[data-index]");
+  }
+
+  // Delegated event handling - a single set of listeners for all rows
+  tbody.addEventListener("click", (event) => {
+    const row = getRow(event);
+    if (!row) {
+      return;
+    }
+    const rowId = renderedIds.get(Number(row.dataset.index));
+    if (selectedIds.has(rowId)) {
+      selectedIds.delete(rowId);
+      row.classList.remove("selected-row");
+    } else {
+      selectedIds.add(rowId);
+      row.classList.add("selected-row");
+    }
+    model.set("selected_rows", [...selectedIds]);
+    model.save_changes();
+  });
+
+  tbody.addEventListener("mouseover", (event) => {
+    const row = getRow(event);
+    if (row && !row.classList.contains("selected-row")) {
+      row.classList.add("hover-row");
+    }
+  });
+
+  tbody.addEventListener("mouseout", (event) => {
+    const row = getRow(event);
+    if (row) {
+      row.classList.remove("hover-row");
+    }
+  });
+
+  // Server-side sorting on header click
+  thead.addEventListener("click", (event) => {
+    const cell = event.target.closest("th[data-column]");
+    if (!cell) {
+      return;
+    }
+    const name = getHeader()[Number(cell.dataset.column)];
+    if (model.get("sort_column") === name) {
+      model.set("sort_ascending", !model.get("sort_ascending"));
+    } else {
+      model.set("sort_column", name);
+      model.set("sort_ascending", true);
+    }
+    model.save_changes();
+  });
+
+  viewport.addEventListener("scroll", requestDraw);
+
   function updateSelection() {
-    const newSelection = model.get("selected_rows");
-    selectedIndices = [...newSelection]; // Synchronize the JavaScript state with the Python state
-    const rows = domElement.querySelectorAll("tr");
-    rows.forEach((row, index) => {
-      if (index > 0) {
-        if (selectedIndices.includes(index - 1)) {
-          row.classList.add("selected-row");
-        } else {
-          row.classList.remove("selected-row");
-        }
+    // Synchronize the JavaScript state with the Python state
+    selectedIds = new Set(model.get("selected_rows"));
+    tbody.querySelectorAll("tr[data-index]").forEach((row) => {
+      if (selectedIds.has(renderedIds.get(Number(row.dataset.index)))) {
+        row.classList.add("selected-row");
+      } else {
+        row.classList.remove("selected-row");
       }
     });
   }
 
-  drawTable();
-  model.on("change:data", drawTable);
-  model.on("change:selected_rows", updateSelection);
-  el.appendChild(domElement);
+  function updateMaxHeight() {
+    viewport.style.maxHeight = model.get("max_height");
+    requestDraw();
+  }
+
+  function onMessage(msg) {
+    if (msg.type === "page") {
+      onPage(msg);
+    } else if (msg.type === "append" || msg.type === "update") {
+      // The model state is already patched in `initialize`
+      requestDraw();
+    }
+  }
+
+  const listeners = {
+    "change:data": drawTable,
+    "change:_mode": updateColumns,
+    "change:_schema": updateColumns,
+    "change:_column_data": updateColumns,
+    "change:_server_header": drawTable,
+    "change:_num_rows": drawTable,
+    "change:_view_version": resetPages,
+    "change:page_size": resetPages,
+    "change:sort_column": drawHeader,
+    "change:sort_ascending": drawHeader,
+    "change:selected_rows": updateSelection,
+    "change:max_height": updateMaxHeight,
+    "msg:custom": onMessage,
+  };
+
+  updateMaxHeight();
+  updateColumns();
+  for (const [event, listener] of Object.entries(listeners)) {
+    model.on(event, listener);
+  }
+  el.appendChild(viewport);
+
+  return () => {
+    for (const [event, listener] of Object.entries(listeners)) {
+      model.off(event, listener);
+    }
+  };
 }
-export default { render };
+export default { initialize, render };
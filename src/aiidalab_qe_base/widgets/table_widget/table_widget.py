@@ -1,11 +1,403 @@
+from __future__ import annotations
+
+import datetime
+import numbers
+import typing as t
 from pathlib import Path
 
+import numpy as np
 import traitlets as tl
 from anywidget import AnyWidget
 
 
 class TableWidget(AnyWidget):
+    """A table widget with row selection.
+
+    The first row of `data` is the header. Only the rows visible in the
+    scrollable viewport (limited by `max_height`) are rendered in the browser.
+    Use `append_rows` and `update_rows` to send only changed rows to the
+    frontend rather than resyncing the whole `data` list.
+
+    Alternatively, the table can be populated in columnar mode with
+    `set_columns`, in which case numeric columns are sent to the frontend
+    as binary buffers instead of JSON, or in server mode with `serve_rows`,
+    in which case the rows are kept in the kernel, sorted and filtered
+    server-side, and sent to the frontend one page at a time on request.
+
+    `selected_rows` holds row ids. In server mode, these are the ids passed
+    to `serve_rows` (by default, the position of the row in the served rows).
+    Otherwise, these are the row indices (excluding the header row).
+    """
+
+    # Numeric dtypes with a matching JavaScript typed array
+    BINARY_DTYPES = (
+        "int8",
+        "int16",
+        "int32",
+        "int64",
+        "uint8",
+        "uint16",
+        "uint32",
+        "uint64",
+        "float32",
+        "float64",
+    )
+
     _esm = Path(__file__).parent / "table_widget.js"
     _css = Path(__file__).parent / "table_widget.css"
     data = tl.List().tag(sync=True)
     selected_rows = tl.List().tag(sync=True)
+    max_height = tl.Unicode("500px").tag(sync=True)
+
+    # One of "rows", "columns", or "server"
+    _mode = tl.Unicode("rows").tag(sync=True)
+
+    # Columnar mode
+    _schema = tl.List().tag(sync=True)
+    _column_data = tl.List().tag(sync=True)
+
+    # Server mode
+    page_size = tl.Int(100).tag(sync=True)
+    sort_column = tl.Unicode(None, allow_none=True).tag(sync=True)
+    sort_ascending = tl.Bool(True).tag(sync=True)
+    _server_header = tl.List().tag(sync=True)
+    _num_rows = tl.Int(0).tag(sync=True)
+    _view_version = tl.Int(0).tag(sync=True)
+
+    def __init__(self, **kwargs):
+        self._columns: dict[str, np.ndarray] = {}
+        self._source_rows: list[list] = []
+        self._source_ids: list = []
+        self._filter: t.Callable[[dict], bool] | None = None
+        self._view: list[int] = []
+        self._sorting = False
+        super().__init__(**kwargs)
+        self.on_msg(self._on_custom_msg)
+
+    @property
+    def columns(self) -> dict[str, np.ndarray]:
+        """The table columns, if populated in columnar mode."""
+        return self._columns
+
+    @property
+    def num_rows(self) -> int:
+        """The number of rows, excluding the header row and filtered rows."""
+        if self._mode == "server":
+            return self._num_rows
+        if self._mode == "columns":
+            return len(next(iter(self._columns.values()), []))
+        return max(len(self.data) - 1, 0)
+
+    def set_columns(self, columns: dict[str, t.Any]):
+        """Populates the table in columnar mode.
+
+        Numeric columns are sent to the frontend as little-endian binary buffers,
+        together with a small schema of column names and dtypes. Datetime columns,
+        of `datetime64` or of `datetime`/`date` objects (e.g. node `ctime`s), are
+        sent as JSON lists of ISO 8601 strings (`None` for NaT or `None`), and any
+        other column as a JSON list. Replaces any row-based `data`.
+
+        Parameters
+        ----------
+        `columns` : `dict[str, t.Any]`
+            The columns (array-like), keyed by column header.
+
+        Raises
+        ------
+        `ValueError`
+            If the columns are not one-dimensional or differ in length.
+        """
+        arrays = {str(name): np.asarray(column) for name, column in columns.items()}
+        if any(array.ndim != 1 for array in arrays.values()):
+            raise ValueError("Columns must be one-dimensional")
+        if len({len(array) for array in arrays.values()}) > 1:
+            raise ValueError("All columns must have the same length")
+
+        schema, column_data = [], []
+        for name, array in arrays.items():
+            if array.dtype.kind in "iuf":
+                if array.dtype.name not in self.BINARY_DTYPES:
+                    array = array.astype(np.float64)
+                array = np.ascontiguousarray(
+                    array,
+                    dtype=array.dtype.newbyteorder("<"),
+                )
+                arrays[name] = array
+                schema.append({"name": name, "dtype": array.dtype.name})
+                column_data.append(memoryview(array))
+            elif array.dtype.kind == "M":
+                # Sent as ISO 8601 strings, as datetimes are not JSON-serializable
+                strings = np.datetime_as_string(array)
+                schema.append({"name": name, "dtype": "json"})
+                column_data.append(
+                    [
+                        None if missing else string
+                        for string, missing in zip(strings.tolist(), np.isnat(array))
+                    ]
+                )
+            elif _is_date_column(array):
+                schema.append({"name": name, "dtype": "json"})
+                column_data.append(
+                    [None if value is None else value.isoformat() for value in array]
+                )
+            else:
+                schema.append({"name": name, "dtype": "json"})
+                column_data.append(array.tolist())
+
+        with self.hold_sync():
+            self._clear()
+            self._columns = arrays
+            self._schema = schema
+            self._column_data = column_data
+            self._mode = "columns"
+
+    def serve_rows(
+        self,
+        header: list[str],
+        rows: t.Iterable[t.Sequence],
+        row_ids: t.Iterable | None = None,
+    ):
+        """Populates the table in server mode.
+
+        The rows are kept in the kernel. The frontend only receives the header
+        and the total number of rows, and requests pages of rows as they are
+        scrolled into view. Sorting (see `sort`) and filtering (see `filter`)
+        are performed in the kernel.
+
+        Parameters
+        ----------
+        `header` : `list[str]`
+            The column headers.
+        `rows` : `t.Iterable[t.Sequence]`
+            The rows.
+        `row_ids` : `t.Iterable`, optional
+            Stable, JSON-serializable row ids used in `selected_rows`.
+            Defaults to the position of each row in `rows`.
+
+        Raises
+        ------
+        `ValueError`
+            If the number of row ids does not match the number of rows,
+            or if the row ids are not unique.
+        """
+        rows = [list(row) for row in rows]
+        ids = list(range(len(rows)) if row_ids is None else row_ids)
+        if len(ids) != len(rows):
+            raise ValueError("The number of row ids must match the number of rows")
+        if len(set(ids)) != len(ids):
+            raise ValueError("Row ids must be unique")
+
+        with self.hold_sync():
+            self._clear()
+            self._source_rows = rows
+            self._source_ids = ids
+            self._server_header = list(header)
+            self._mode = "server"
+            self._update_view()
+
+    def sort(self, column: str | None, ascending: bool = True):
+        """Sorts the rows served in server mode.
+
+        Parameters
+        ----------
+        `column` : `str | None`
+            The header of the column to sort by, or `None` to restore the
+            original order.
+        `ascending` : `bool`, optional
+            Whether to sort in ascending order.
+
+        Raises
+        ------
+        `KeyError`
+            If the column is not found in the served header.
+        """
+        if column is not None and column not in self._server_header:
+            raise KeyError(f"Column '{column}' not found")
+        # Update the view once for both traits
+        with self.hold_sync():
+            self._sorting = True
+            try:
+                self.sort_column = column
+                self.sort_ascending = ascending
+            finally:
+                self._sorting = False
+            self._update_view()
+
+    def filter(self, predicate: t.Callable[[dict], bool] | None):
+        """Filters the rows served in server mode.
+
+        Parameters
+        ----------
+        `predicate` : `t.Callable[[dict], bool] | None`
+            A function receiving a row as a dictionary keyed by column header,
+            returning whether the row is shown, or `None` to clear the filter.
+        """
+        self._filter = predicate
+        self._update_view()
+
+    def get_page(self, offset: int, limit: int) -> tuple[list[list], list]:
+        """Returns a page of the sorted and filtered rows served in server mode.
+
+        Parameters
+        ----------
+        `offset` : `int`
+            The position of the first row of the page.
+        `limit` : `int`
+            The maximum number of rows in the page.
+
+        Returns
+        -------
+        `tuple[list[list], list]`
+            The rows of the page and their ids.
+        """
+        positions = self._view[max(offset, 0) : max(offset, 0) + max(limit, 0)]
+        rows = [self._source_rows[position] for position in positions]
+        ids = [self._source_ids[position] for position in positions]
+        return rows, ids
+
+    def append_rows(self, rows: list[list]):
+        """Appends rows to the table.
+
+        Parameters
+        ----------
+        `rows` : `list[list]`
+            The rows to append.
+
+        Raises
+        ------
+        `ValueError`
+            If the table has no header row or is not in row mode.
+        """
+        if self._mode != "rows":
+            raise ValueError(f"Cannot append rows to a table in {self._mode} mode")
+        if not self.data:
+            raise ValueError("Cannot append rows to a table without a header row")
+        rows = [list(row) for row in rows]
+        # Patch in place to avoid resyncing the full `data` list
+        self.data.extend(rows)
+        self.send({"type": "append", "rows": rows})
+
+    def update_rows(self, rows: dict[int, list]):
+        """Replaces rows of the table.
+
+        Parameters
+        ----------
+        `rows` : `dict[int, list]`
+            The new rows, keyed by row index (excluding the header row).
+
+        Raises
+        ------
+        `ValueError`
+            If the table is not in row mode.
+        `IndexError`
+            If any of the row indices is out of range.
+        """
+        if self._mode != "rows":
+            raise ValueError(f"Cannot update rows of a table in {self._mode} mode")
+        num_rows = len(self.data) - 1
+        if any(not 0 <= index < num_rows for index in rows):
+            raise IndexError("Row index out of range")
+        patch = [[index, list(row)] for index, row in rows.items()]
+        # Patch in place to avoid resyncing the full `data` list
+        for index, row in patch:
+            self.data[index + 1] = row
+        self.send({"type": "update", "rows": patch})
+
+    def _clear(self):
+        """Clears the table contents of all modes."""
+        self.data = []
+        self.selected_rows = []
+        self._columns = {}
+        self._schema = []
+        self._column_data = []
+        self._source_rows = []
+        self._source_ids = []
+        self._filter = None
+        self._view = []
+        self._server_header = []
+        self._num_rows = 0
+        self._mode = "rows"
+
+    def _update_view(self):
+        """Recomputes the sorted and filtered view of the served rows."""
+        if self._mode != "server":
+            return
+        positions = range(len(self._source_rows))
+        if self._filter:
+            header = self._server_header
+            positions = [
+                position
+                for position in positions
+                if self._filter(dict(zip(header, self._source_rows[position])))
+            ]
+        if self.sort_column in self._server_header:
+            column = self._server_header.index(self.sort_column)
+            values = [self._source_rows[position][column] for position in positions]
+            # `None` values are kept last in both directions
+            present = [
+                (position, value)
+                for position, value in zip(positions, values)
+                if value is not None
+            ]
+            missing = [
+                position for position, value in zip(positions, values) if value is None
+            ]
+            present.sort(
+                key=lambda item: _sort_key(item[1]),
+                reverse=not self.sort_ascending,
+            )
+            positions = [position for position, _ in present] + missing
+        with self.hold_sync():
+            self._view = list(positions)
+            self._num_rows = len(self._view)
+            self._view_version += 1
+
+    def _on_custom_msg(self, _, content, buffers):
+        if content.get("type") != "request_page":
+            return
+        rows, ids = self.get_page(content["offset"], content["limit"])
+        self.send(
+            {
+                "type": "page",
+                "version": self._view_version,
+                "offset": content["offset"],
+                "rows": rows,
+                "ids": ids,
+            }
+        )
+
+    @tl.validate("data")
+    def _validate_data(self, proposal):
+        # Copied such that patching rows in place never mutates the caller's list
+        return list(proposal["value"])
+
+    @tl.observe("data")
+    def _on_data_change(self, change):
+        # Row-based data replaces any columnar or served data
+        if change["new"] and self._mode != "rows":
+            data = change["new"]
+            with self.hold_sync():
+                self._clear()
+                self.data = data
+
+    @tl.observe("sort_column", "sort_ascending")
+    def _on_sort_change(self, _):
+        if not self._sorting:
+            self._update_view()
+
+
+def _is_date_column(array: np.ndarray) -> bool:
+    """Returns whether the object array holds `datetime`/`date` objects (or
+    `None`), with at least one date."""
+    if array.dtype.kind != "O":
+        return False
+    values = [value for value in array if value is not None]
+    return bool(values) and all(isinstance(value, datetime.date) for value in values)
+
+
+def _sort_key(value: t.Any) -> tuple:
+    # Numbers are compared numerically, other values are grouped by type such
+    # that mixed-type columns never compare values of different types
+    if isinstance(value, numbers.Real):
+        return ("", value)
+    return (type(value).__name__, value)
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from threading import Event, Thread
-from time import time
+import logging
+import typing as t
+import weakref
+from threading import Lock, Thread, current_thread
+from time import sleep, time
 
 import ipywidgets as ipw
 import traitlets as tl
@@ -10,6 +13,10 @@ from aiida.common.exceptions import NotExistent
 from aiidalab_widgets_base import ComputationalResourcesWidget, LoadingWidget
 from IPython.display import clear_output, display
 
+from aiidalab_qe_base.instrumentation.queries import track_queries
+
+_LOGGER = logging.getLogger(__name__)
+
 
 class InfoBox(ipw.VBox):
     """The `InfoBox` component is used to provide additional info regarding a widget or an app."""
@@ -30,9 +37,110 @@ class InfoBox(ipw.VBox):
                     self.add_class(custom_class)
 
 
+class GuideDispatcher:
+    """Dispatches changes of the active guide to the live in-app guides.
+
+    A single observer is registered on the global guide manager. On guide change,
+    the active guide is indexed by section id once, and only the guides that are
+    currently displayed are updated. The remaining guides are marked as stale and
+    updated once displayed.
+    """
+
+    _instance: GuideDispatcher | None = None
+
+    def __init__(self, manager):
+        self.manager = manager
+        self._guides: dict[str, weakref.WeakSet[InAppGuide]] = {}
+        self._index: dict[str, str] | None = None
+        self._is_complete_index = False
+        self.manager.observe(
+            self._on_active_guide_change,
+            "active_guide",
+        )
+
+    @classmethod
+    def get_instance(cls, manager) -> GuideDispatcher:
+        """Returns the dispatcher of the given guide manager.
+
+        A dispatcher of a previous guide manager is disposed of.
+        """
+        if cls._instance is None or cls._instance.manager is not manager:
+            if cls._instance is not None:
+                cls._instance.dispose()
+            cls._instance = cls(manager)
+        return cls._instance
+
+    def dispose(self):
+        """Stops observing the guide manager."""
+        self.manager.unobserve(
+            self._on_active_guide_change,
+            "active_guide",
+        )
+
+    def register(self, guide: InAppGuide):
+        self._guides.setdefault(guide.identifier or "", weakref.WeakSet()).add(guide)
+
+    def unregister(self, guide: InAppGuide):
+        if guides := self._guides.get(guide.identifier or ""):
+            guides.discard(guide)
+
+    def get_guides(self, identifier: str = "") -> list[InAppGuide]:
+        """Returns the live guides with the given identifier.
+
+        Widget-based guides are registered under the empty identifier.
+        """
+        return list(self._guides.get(identifier, []))
+
+    def get_section(self, identifier: str) -> str:
+        """Returns the HTML of the guide section with the given identifier.
+
+        Parameters
+        ----------
+        `identifier` : `str`
+            The HTML `id` attribute of the guide section.
+
+        Returns
+        -------
+        `str`
+            The HTML of the guide section, or an empty string if not found.
+        """
+        if self._index is None:
+            self._index = self._build_index()
+        if identifier not in self._index:
+            if self._is_complete_index:
+                return ""
+            # Fall back to (cached) lookups if the guide could not be indexed
+            html = self.manager.get_guide_section_by_id(identifier)
+            self._index[identifier] = str(html) if html else ""
+        return self._index[identifier]
+
+    def _build_index(self) -> dict[str, str]:
+        """Indexes the sections of the active guide by their `id` attribute."""
+        content = getattr(self.manager, "content", None)
+        self._is_complete_index = hasattr(content, "find_all")
+        if not self._is_complete_index:
+            return {}
+        index = {}
+        for section in content.find_all(attrs={"id": True}):  # type: ignore
+            index.setdefault(section["id"], str(section))
+        return index
+
+    def _on_active_guide_change(self, _):
+        self._index = None
+        for guides in self._guides.values():
+            for guide in list(guides):
+                if guide.is_displayed:
+                    guide.refresh()
+                else:
+                    guide.mark_stale()
+
+
 class InAppGuide(InfoBox):
     """The `InAppGuide` is used to set up toggleable in-app guides.
 
+    Guide changes are dispatched by the `GuideDispatcher`. Guides that are not
+    displayed in the frontend are only updated once displayed.
+
     Attributes
     ----------
     `manager` : `GuideManager`
@@ -96,26 +204,53 @@ class InAppGuide(InfoBox):
         else:
             raise ValueError("No widgets or path identifier provided")
 
-        self.manager.observe(
-            self._on_active_guide_change,
-            "active_guide",
-        )
+        self._html = ""
+        self._stale = True
+
+        # Track the number of frontend views to defer updates until displayed
+        self._view_count = 0
+        self.observe(self._on_view_count_change, "_view_count")
+
+        self.dispatcher = GuideDispatcher.get_instance(self.manager)
+        self.dispatcher.register(self)
 
         # This manual toggle call is necessary because the guide
         # may be contained in a component that was not yet rendered
-        # when a guide was selected.
-        self._on_active_guide_change(None)
+        # when a guide was selected. The contents of file-based guide
+        # sections are fetched once the guide is displayed.
+        self._toggle_guide()
 
-    def _on_active_guide_change(self, _):
+    @property
+    def is_displayed(self):
+        return self._view_count is None or self._view_count > 0
+
+    def close(self):
+        self.dispatcher.unregister(self)
+        super().close()
+
+    def refresh(self):
+        """Updates the guide section w.r.t the active guide."""
+        self._stale = False
         self._update_contents()
         self._toggle_guide()
 
+    def mark_stale(self):
+        """Marks the guide section for update once displayed."""
+        self._stale = True
+
+    def _on_view_count_change(self, change):
+        if change["new"] and self._stale:
+            self.refresh()
+
     def _update_contents(self):
         """Update the contents of the guide section."""
         if not self.identifier:
             return
-        html = self.manager.get_guide_section_by_id(self.identifier)
-        self.children = [ipw.HTML(str(html))] if html else []
+        html = self.dispatcher.get_section(self.identifier)
+        if html == self._html:
+            return
+        self._html = html
+        self.children = [ipw.HTML(html)] if html else []
 
     def _toggle_guide(self):
         """Toggle the visibility of the guide section."""
@@ -223,6 +358,92 @@ class LazyLoader(ipw.VBox):
         self.rendered = True
 
 
+class _AnimationScheduler:
+    """Drives the animation of all animated progress bars from a single thread.
+
+    The thread is started when the first bar is added and exits once no
+    animated bars remain. Frames are pushed at `frame_rate` frames per second.
+    Bars are weakly referenced, such that a discarded bar does not keep the
+    thread alive. A bar failing to render a frame is logged and dropped, while
+    the other bars keep being animated.
+
+    The `clock` and whether frames are pushed from a `threaded` loop may be
+    injected, e.g. to drive frames deterministically with `step`.
+    """
+
+    def __init__(
+        self,
+        frame_rate: float = 10.0,
+        clock: t.Callable[[], float] = time,
+        threaded: bool = True,
+    ):
+        self.frame_rate = frame_rate
+        self._clock = clock
+        self._threaded = threaded
+        self._bars: weakref.WeakKeyDictionary[ProgressBar, tuple[float, float]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = Lock()
+        self._thread: Thread | None = None
+
+    @property
+    def is_running(self):
+        return self._thread is not None
+
+    def has_bar(self, bar: ProgressBar):
+        return bar in self._bars
+
+    def add(self, bar: ProgressBar):
+        with self._lock:
+            if bar in self._bars:
+                raise RuntimeError("Cannot start animation more than once!")
+            self._bars[bar] = (bar._progress_bar.value, self._clock())
+            if self._threaded and self._thread is None:
+                self._thread = Thread(target=self._animate, daemon=True)
+                self._thread.start()
+
+    def remove(self, bar: ProgressBar):
+        # Holding the lock guarantees that no frame is pushed to the bar
+        # once this method returns
+        with self._lock:
+            self._bars.pop(bar, None)
+
+    def step(self) -> bool:
+        """Pushes a frame to all animated bars.
+
+        Returns
+        -------
+        `bool`
+            Whether any animated bars remain.
+        """
+        with self._lock:
+            return self._push_frame()
+
+    def _push_frame(self) -> bool:
+        now = self._clock()
+        for bar, (v0, t0) in list(self._bars.items()):
+            try:
+                bar._set_frame((v0 + (now - t0) * bar._animation_rate) % 1.0)
+            except Exception:
+                _LOGGER.exception("Stopped animating a failing progress bar")
+                self._bars.pop(bar, None)
+        return bool(self._bars)
+
+    def _animate(self):
+        try:
+            while True:
+                sleep(1.0 / self.frame_rate)
+                with self._lock:
+                    if not self._push_frame():
+                        self._thread = None
+                        return
+        finally:
+            # Allows a new thread to be started if the loop failed
+            with self._lock:
+                if self._thread is current_thread():
+                    self._thread = None
+
+
 class ProgressBar(ipw.HBox):
     class AnimationRate(float):
         pass
@@ -233,6 +454,9 @@ class ProgressBar(ipw.HBox):
 
     _animation_rate = tl.Float()
 
+    # All animated bars share a single animation thread
+    _scheduler = _AnimationScheduler()
+
     def __init__(self, description_layout=None, *args, **kwargs):
         if description_layout is None:
             description_layout = ipw.Layout(width="auto", flex="2 1 auto")
@@ -245,30 +469,33 @@ class ProgressBar(ipw.HBox):
         tl.link((self, "description"), (self._label, "value"))
         tl.link((self, "bar_style"), (self._progress_bar, "bar_style"))
 
-        self._animate_stop_event = Event()
-        self._animate_thread = None
-
         super().__init__([self._label, self._progress_bar], *args, **kwargs)
 
-    def _animate(self, refresh_rate=0.01):
-        v0 = self._progress_bar.value
-        t0 = time()
+    @classmethod
+    def set_animation_frame_rate(cls, frame_rate: float):
+        """Sets the frame rate shared by all animated progress bars.
+
+        Parameters
+        ----------
+        `frame_rate` : `float`
+            The number of frames pushed to the frontend per second.
+        """
+        if frame_rate <= 0:
+            raise ValueError("The frame rate must be positive.")
+        cls._scheduler.frame_rate = frame_rate
+
+    def close(self):
+        self._scheduler.remove(self)
+        super().close()
 
-        while not self._animate_stop_event.wait(refresh_rate):
-            self._progress_bar.value = (v0 + (time() - t0) * self._animation_rate) % 1.0
+    def _set_frame(self, value: float):
+        self._progress_bar.value = value
 
     def _start_animate(self):
-        if self._animate_thread is not None:
-            raise RuntimeError("Cannot start animation more than once!")
-
-        self._animate_thread = Thread(target=self._animate)
-        self._animate_thread.start()
+        self._scheduler.add(self)
 
     def _stop_animate(self):
-        self._animate_stop_event.set()
-        self._animate_thread.join()
-        self._animate_stop_event.clear()
-        self._animate_thread = None
+        self._scheduler.remove(self)
 
     @tl.default("_animation_rate")
     def _default_animation_rate(self):
@@ -365,6 +592,7 @@ class QEAppComputationalResourcesWidget(ipw.VBox):
 
         tl.link((self.code_selection, "value"), (self, "value"))
 
+    @track_queries
     def update_resources(self, change):
         if change["new"]:
             try:
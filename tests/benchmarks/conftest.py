@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import typing as t
+
+import pytest
+from aiida import orm
+from aiida.common.links import LinkType
+
+# Sizes of the synthetic profile
+NUM_COMPUTERS = 20
+NUM_CODES_PER_COMPUTER = 10
+NUM_CHILD_PROCESSES = 200
+
+SYNTHETIC_CALC_JOB_PLUGIN = "benchmark.synthetic"
+
+# Loose upper bounds (in seconds) on the median duration of each benchmark, at
+# about ten times the largest medians measured on a development machine (noted
+# per benchmark), such that only gross regressions fail on shared CI runners.
+# For finer checks, compare against a stored run, e.g.
+# `pytest tests/benchmarks --benchmark-autosave` and later
+# `pytest tests/benchmarks --benchmark-compare --benchmark-compare-fail=median:25%`
+BASELINES = {
+    "get_codes": 0.35,  # 35 ms
+    "add_models": 0.15,  # 15 ms
+    "set_model_state": 0.015,  # 1.3 ms
+    "poll_results": 2.5,  # 225 ms
+}
+
+
+@pytest.fixture
+def assert_within_baseline() -> t.Callable[[t.Any, str], None]:
+    """Returns a function asserting that the median duration of a benchmark is
+    within its baseline (see `BASELINES`)."""
+
+    def _assert_within_baseline(benchmark, name: str):
+        if benchmark.stats is None:  # benchmarks disabled
+            return
+        median = benchmark.stats.stats.median
+        assert (
+            median < BASELINES[name]
+        ), f"'{name}' took {median:.3f}s (median, baseline: {BASELINES[name]}s)"
+
+    return _assert_within_baseline
+
+
+@pytest.fixture
+def synthetic_codes(aiida_computer_local, aiida_code_installed) -> list[orm.Code]:
+    """Generates (or loads) many codes spread across many configured computers.
+
+    The codes use a dedicated calculation job plugin, such that they are not
+    found by the code models of other tests.
+    """
+    codes = []
+    for i in range(NUM_COMPUTERS):
+        computer = aiida_computer_local(label=f"benchmark-computer-{i}")
+        codes += [
+            aiida_code_installed(
+                label=f"benchmark-code-{i}-{j}",
+                default_calc_job_plugin=SYNTHETIC_CALC_JOB_PLUGIN,
+                computer=computer,
+            )
+            for j in range(NUM_CODES_PER_COMPUTER)
+        ]
+    return codes
+
+
+class WorkflowNodeGenerator(t.Protocol):
+    def __call__(self, num_children: int = ...) -> orm.WorkflowNode: ...
+
+
+@pytest.fixture
+def generate_workflow_with_children(aiida_profile) -> WorkflowNodeGenerator:
+    """Generates a finished workflow node calling many finished child workflows.
+
+    The children are labeled `Child0`, `Child1`, ..., in the order of calling.
+    """
+
+    def _generate_workflow_with_children(num_children=NUM_CHILD_PROCESSES):
+        root = orm.WorkflowNode()
+        root.set_process_label("Root")
+        root.set_process_state("finished")
+        root.set_exit_status(0)
+        root.store()
+        for i in range(num_children):
+            child = orm.WorkflowNode()
+            child.set_process_label(f"Child{i}")
+            child.set_process_state("finished")
+            child.set_exit_status(0)
+            child.base.links.add_incoming(root, LinkType.CALL_WORK, f"call_{i}")
+            child.store()
+        return root
+
+    return _generate_workflow_with_children
@@ -0,0 +1,119 @@
+import typing as t
+
+import traitlets as tl
+from aiida import orm
+
+from aiidalab_qe_base.codes import get_code_index
+from aiidalab_qe_base.mixins import HasBlockers, HasModels
+from aiidalab_qe_base.models import CodeModel, Model
+from aiidalab_qe_base.panels.configuration import ConfigurationSettingsModel
+from aiidalab_qe_base.panels.results import ResultsModel
+
+if t.TYPE_CHECKING:
+    from .conftest import WorkflowNodeGenerator
+
+
+def test_get_codes(
+    benchmark,
+    assert_within_baseline,
+    default_user_email,
+    synthetic_codes: list[orm.Code],
+):
+    model = CodeModel(
+        description="synthetic",
+        default_calc_job_plugin=synthetic_codes[0].default_calc_job_plugin,
+    )
+
+    def setup():
+        # Measure the cold path, indexing the codes from the database
+        get_code_index().clear()
+        return (default_user_email,), {}
+
+    codes = benchmark.pedantic(model._get_codes, setup=setup, rounds=5)
+    assert len(codes) == len(synthetic_codes)
+    assert_within_baseline(benchmark, "get_codes")
+
+
+class TreeModel(Model, HasModels[Model], HasBlockers):
+    dependencies = ["value"]
+
+    value = tl.Int(0)
+
+    def _check_blockers(self):
+        return []
+
+
+def build_tree(depth: int, width: int) -> TreeModel:
+    root = TreeModel()
+    if depth > 1:
+        root.add_models(
+            {f"child{i}": build_tree(depth - 1, width) for i in range(width)}
+        )
+    return root
+
+
+def test_add_models(benchmark, assert_within_baseline):
+    # 1 + 4 + 16 + 64 + 256 linked models
+    root = benchmark(build_tree, depth=5, width=4)
+    root.value = 1
+    assert root.get_model("child3.child3.child3.child3").value == 1
+    assert_within_baseline(benchmark, "add_models")
+
+
+NUM_SETTINGS = 50
+
+
+class _ManySettingsModel(ConfigurationSettingsModel):
+    def get_model_state(self):
+        return {
+            f"setting{i}": getattr(self, f"setting{i}") for i in range(NUM_SETTINGS)
+        }
+
+    def set_model_state(self, parameters: dict):
+        for key, value in parameters.items():
+            setattr(self, key, value)
+
+
+ManySettingsModel = type(
+    "ManySettingsModel",
+    (_ManySettingsModel,),
+    {f"setting{i}": tl.Int(0) for i in range(NUM_SETTINGS)},
+)
+
+
+def test_confirmable_set_model_state(benchmark, assert_within_baseline):
+    model = ManySettingsModel()
+    states = [{f"setting{i}": value for i in range(NUM_SETTINGS)} for value in (1, 2)]
+
+    def set_model_state():
+        for state in states:
+            model.confirm()
+            model.set_model_state(state)
+
+    benchmark(set_model_state)
+    assert not model.confirmed
+    assert model.get_model_state() == states[-1]
+    assert_within_baseline(benchmark, "set_model_state")
+
+
+def test_poll_results(
+    benchmark,
+    assert_within_baseline,
+    generate_workflow_with_children: "WorkflowNodeGenerator",
+):
+    root = generate_workflow_with_children()
+
+    class LastChildResultsModel(ResultsModel):
+        identifier = "last_child"
+        _this_process_label = f"Child{len(root.called) - 1}"
+
+    model = LastChildResultsModel()
+    model.process_uuid = root.uuid
+
+    def poll():
+        model._completed_process = False
+        model.update_process_status_notification()
+
+    benchmark.pedantic(poll, rounds=5, iterations=1)
+    assert "FINISHED" in model.process_status_notification
+    assert_within_baseline(benchmark, "poll_results")
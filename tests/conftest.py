@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import contextlib
 import typing as t
 
 import pytest
@@ -7,6 +8,8 @@ from aiida import engine, orm
 from aiida.engine.utils import instantiate_process
 from aiida.manage import Profile, get_manager
 
+from aiidalab_qe_base.instrumentation import QueryRecorder, QueryStats
+
 pytest_plugins = ["aiida.tools.pytest_fixtures"]
 
 
@@ -193,3 +196,44 @@ def generate_mock_workchain_node(
         return workchain.node
 
     return _generate_mock_workchain_node
+
+
+class QueryBudget(t.Protocol):
+    def __call__(
+        self,
+        max_queries: int,
+        method: str | None = ...,
+        max_loads: int | None = ...,
+    ) -> t.ContextManager[QueryRecorder]: ...
+
+
+@pytest.fixture
+def query_budget(aiida_profile: Profile) -> QueryBudget:
+    """Returns a context manager asserting the queries issued in its body.
+
+    Parameters
+    ----------
+    `max_queries` : `int`
+        The maximum number of SQL queries.
+    `method` : `str`, optional
+        The qualified name of a tracked method (see `track_queries`) to which
+        the budget applies. Applies to all queries if not provided.
+    `max_loads` : `int`, optional
+        The maximum number of node loads.
+    """
+
+    @contextlib.contextmanager
+    def _query_budget(max_queries, method=None, max_loads=None):
+        with QueryRecorder() as recorder:
+            yield recorder
+        stats = recorder.stats.get(method, QueryStats()) if method else recorder.total
+        label = method or "all methods"
+        assert (
+            stats.num_queries <= max_queries
+        ), f"{stats.num_queries} queries issued by {label} (budget: {max_queries})"
+        if max_loads is not None:
+            assert (
+                stats.num_loads <= max_loads
+            ), f"{stats.num_loads} node loads by {label} (budget: {max_loads})"
+
+    return _query_budget
@@ -0,0 +1,74 @@
+from aiida import orm
+
+from aiidalab_qe_base.codes import CodeIndex
+
+
+def test_code_index(aiida_code_installed, default_user_email, pw_code):
+    index = CodeIndex()
+    pw_option = (f"pw@{pw_code.computer.label}", pw_code.uuid)
+
+    options = index.get_options(default_user_email, "quantumespresso.pw")
+    assert pw_option in options
+    assert all(
+        uuid != pw_code.uuid
+        for _, uuid in index.get_options(default_user_email, "quantumespresso.dos")
+    )
+
+    # New and modified codes are picked up
+    dos_code = aiida_code_installed(
+        label="dos",
+        default_calc_job_plugin="quantumespresso.dos",
+        computer=pw_code.computer,
+    )
+    assert (f"dos@{pw_code.computer.label}", dos_code.uuid) in index.get_options(
+        default_user_email, "quantumespresso.dos"
+    )
+    pw_code.is_hidden = True
+    assert pw_option not in index.get_options(default_user_email, "quantumespresso.pw")
+    assert pw_option in index.get_options(
+        default_user_email, "quantumespresso.pw", allow_hidden=True
+    )
+    pw_code.is_hidden = False
+
+    # Deleted codes are dropped
+    orm.Node.collection.delete(dos_code.pk)
+    assert all(
+        uuid != dos_code.uuid for _, uuid in index.get_options(default_user_email)
+    )
+
+    # Disabled computers are only offered on demand
+    authinfo = pw_code.computer.get_authinfo(orm.User.collection.get_default())
+    authinfo.enabled = False
+    try:
+        assert pw_option not in index.get_options(default_user_email)
+        assert pw_option in index.get_options(default_user_email, allow_disabled=True)
+    finally:
+        authinfo.enabled = True
+
+
+def test_code_index_user_scope(aiida_code_installed, default_user_email):
+    other_user = orm.User(email="other@example.com").store()
+    computer = orm.Computer(
+        label="other-computer",
+        hostname="localhost",
+        transport_type="core.local",
+        scheduler_type="core.direct",
+        workdir="/tmp/other",
+    ).store()
+    computer.configure(user=other_user)
+    code = aiida_code_installed(
+        label="other-pw",
+        default_calc_job_plugin="quantumespresso.pw",
+        computer=computer,
+    )
+
+    index = CodeIndex()
+    assert (
+        f"other-pw@{computer.label}",
+        code.uuid,
+    ) in index.get_options(other_user.email)
+    assert all(uuid != code.uuid for _, uuid in index.get_options(default_user_email))
+
+    # Configuring the computer for the user adds its codes
+    computer.configure()
+    assert any(uuid == code.uuid for _, uuid in index.get_options(default_user_email))
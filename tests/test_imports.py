@@ -0,0 +1,56 @@
+import subprocess
+import sys
+
+import pytest
+
+WIDGET_MODULES = (
+    "ipywidgets",
+    "IPython.display",
+    "anywidget",
+    "aiidalab_widgets_base",
+    "aiidalab_qe_base.widgets",
+)
+
+
+def get_loaded_modules(statement: str) -> set[str]:
+    """Returns the modules loaded by the statement in a fresh interpreter."""
+    script = f"import sys; {statement}; print('\\n'.join(sys.modules))"
+    output = subprocess.check_output([sys.executable, "-c", script], text=True)
+    return set(output.splitlines())
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import aiidalab_qe_base.models",
+        "from aiidalab_qe_base.models import CodeModel, PwCodeModel",
+        "from aiidalab_qe_base import mixins, utils",
+        "from aiidalab_qe_base.panels.configuration import ConfigurationSettingsModel",
+        "from aiidalab_qe_base.panels.resources import ResourceSettingsModel",
+        "from aiidalab_qe_base.plugin.panels.resources import PluginResourceSettingsModel",
+    ],
+)
+def test_headless_imports(statement):
+    """Importing the model layer must not load the widget stack."""
+    loaded = get_loaded_modules(statement)
+    assert not {
+        module
+        for module in loaded
+        if any(
+            module == widget_module or module.startswith(f"{widget_module}.")
+            for widget_module in WIDGET_MODULES
+        )
+    }
+
+
+def test_lazy_code_widget_class():
+    from aiidalab_qe_base import models, widgets
+
+    assert (
+        models.CodeModel(
+            description="",
+            default_calc_job_plugin="",
+        ).code_widget_class
+        is widgets.QEAppComputationalResourcesWidget
+    )
+    assert models.PwCodeModel().code_widget_class is widgets.PwCodeResourceSetupWidget
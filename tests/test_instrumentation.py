@@ -0,0 +1,117 @@
+import typing as t
+
+import ipywidgets as ipw
+import pytest
+from aiida import orm
+
+from aiidalab_qe_base import models
+from aiidalab_qe_base.instrumentation import (
+    CommRecorder,
+    QueryRecorder,
+    track_queries,
+)
+from aiidalab_qe_base.instrumentation.queries import UNTRACKED
+from aiidalab_qe_base.panels.results import ResultsModel
+from aiidalab_qe_base.widgets import TableWidget
+
+if t.TYPE_CHECKING:
+    from .conftest import MockWorkChainNodeGenerator, QueryBudget
+
+
+def test_query_recorder(default_user_email, pw_code):
+    model = models.PwCodeModel()
+    with QueryRecorder() as recorder:
+        model.update(default_user_email)
+    assert recorder.stats["CodeModel.update"].num_calls == 1
+    assert recorder.stats["CodeModel._get_codes"].num_queries > 0
+    assert recorder.num_queries >= recorder.stats["CodeModel._get_codes"].num_queries
+
+    recorder.reset()
+    with recorder:
+        model._get_uuid(pw_code.uuid)  # known option
+        model._get_uuid("missing@localhost")
+    assert recorder.stats["CodeModel._get_uuid"].num_calls == 2
+    assert recorder.stats["CodeModel._get_uuid"].num_loads == 1
+
+    # Not recording
+    model._get_uuid("pw@localhost")
+    assert recorder.stats["CodeModel._get_uuid"].num_calls == 2
+
+
+def test_query_recorder_loads(pw_code):
+    # Loads are counted however the loaders were imported, and the loaders
+    # are left untouched
+    load_node, load_code = orm.load_node, orm.load_code
+    with QueryRecorder() as recorder:
+        assert orm.load_node is load_node
+        load_node(pw_code.pk)
+        load_code(pw_code.uuid)
+        orm.load_computer(pw_code.computer.pk)  # not a node
+    assert recorder.num_loads == 2
+    assert orm.load_node is load_node
+
+
+def test_track_queries(default_user_email):
+    class Component:
+        @track_queries
+        def outer(self):
+            return self.inner()
+
+        @track_queries
+        def inner(self):
+            models.CodeModel(
+                description="",
+                default_calc_job_plugin="quantumespresso.pw",
+            )._get_codes(default_user_email)
+            return "result"
+
+    with QueryRecorder() as outer, QueryRecorder() as inner:
+        assert Component().outer() == "result"
+    for recorder in (outer, inner):
+        assert recorder.stats["test_track_queries.<locals>.Component.outer"].num_calls
+        # Queries are attributed to the innermost tracked method
+        assert not recorder.stats[
+            "test_track_queries.<locals>.Component.outer"
+        ].num_queries
+        assert not recorder.stats.get(UNTRACKED)
+
+
+def test_query_budget(
+    query_budget: "QueryBudget",
+    generate_mock_workchain_node: "MockWorkChainNodeGenerator",
+):
+    node = generate_mock_workchain_node()
+    model = ResultsModel()
+    model.process_uuid = node.uuid
+
+    with query_budget(5, method="HasProcess.fetch_process_node", max_loads=1):
+        assert model.fetch_process_node() is not None
+
+    with pytest.raises(AssertionError, match="budget: 0"):
+        with query_budget(0, max_loads=0):
+            model.fetch_process_node()
+
+
+def test_comm_recorder():
+    with CommRecorder() as recorder:
+        text = ipw.IntText()
+        table = TableWidget(data=[["a"], [1]])
+        before = recorder.snapshot()
+        text.value = 1
+        text.value = 2
+        table.append_rows([[2]])
+        traffic = recorder.snapshot() - before
+
+    assert before["IntText"].num_created == 1
+    assert before["TableWidget"].num_created == 1
+    assert set(traffic) == {"IntText", "TableWidget"}
+    assert traffic["IntText"].num_updates == 2
+    assert traffic["TableWidget"].num_custom == 1
+    assert traffic["TableWidget"].num_updates == 0
+    assert traffic.total.num_messages == 3
+    assert traffic.total.num_bytes > 0
+
+    # Not recording
+    text.value = 3
+    assert recorder.snapshot()["IntText"].num_updates == 2
+    assert ipw.Widget._send.__qualname__ == "Widget._send"
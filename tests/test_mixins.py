@@ -17,6 +17,7 @@ def test_has_input_structure(generate_structure_data: "StructureDataGenerator"):
 
     model = DummyModel()
     assert not model.has_structure
+    assert model.structure_positions is None
     assert not model.has_pbc
     assert not model.has_tags
 
@@ -27,6 +28,8 @@ def test_has_input_structure(generate_structure_data: "StructureDataGenerator"):
     assert not model.has_tags
 
     structure.pbc = (False, False, False)
+    assert model.has_pbc  # cached until reassigned or invalidated
+    model.invalidate_structure_descriptors()
     assert not model.has_pbc
 
     structure = generate_structure_data(
@@ -38,6 +41,20 @@ def test_has_input_structure(generate_structure_data: "StructureDataGenerator"):
     model.input_structure = structure
     assert model.has_tags
 
+    # Arrays of unstored structures are computed once per assignment
+    positions = model.structure_positions
+    assert model.structure_positions is positions
+    model.invalidate_structure_descriptors()
+    assert model.structure_positions is not positions
+
+    structure.store()
+    assert model.structure_descriptors is model.structure_descriptors
+    assert model.structure_descriptors.kind_counts == {"Si1": 1, "Si2": 1}
+    assert model.structure_positions is model.structure_descriptors.positions
+    assert model.structure_species.tolist() == [0, 1]
+    assert model.structure_cell.shape == (3, 3)
+    assert model.structure_kind_masses.shape == (2,)
+
 
 def test_has_model():
     class Child(Model):
@@ -70,6 +87,38 @@ def test_has_model():
         parent.get_model("nonexistent")
 
 
+def test_has_model_deferred_observers():
+    class Child(Model):
+        dependencies = ["protocol"]
+
+        protocol = tl.Unicode()
+
+    class Parent(Model, mixins.HasModels[Child]):
+        protocol = tl.Unicode("moderate")
+
+        def update(self):
+            self.protocol = "fast"
+            self.seen = self.get_model("child").protocol
+
+    parent = Parent()
+    child = Child()
+    parent.add_model("child", child)
+    changes = []
+    parent.observe(lambda change: changes.append(("parent", change.new)), "protocol")
+    child.observe(lambda change: changes.append(("child", change.new)), "protocol")
+
+    parent.defer_observers()
+    parent.update()
+    # Dependencies propagate within the model tree, other observers are deferred
+    assert parent.seen == "fast"
+    assert not changes
+    parent.flush_observers()
+    assert changes == [("parent", "fast"), ("child", "fast")]
+
+    parent.protocol = "precise"  # no longer deferred
+    assert sorted(changes[2:]) == [("child", "precise"), ("parent", "precise")]
+
+
 def test_has_process(generate_mock_workchain_node: "MockWorkChainNodeGenerator"):
     class DummyModel(mixins.HasProcess):
         x = tl.Int(0)
@@ -118,3 +167,52 @@ def test_has_blockers():
     assert model.is_blocked
     model.update_blocker_messages()
     assert "blocked" in model.blocker_messages
+
+
+def test_has_subscriptions():
+    class Source(tl.HasTraits):
+        x = tl.Int(0)
+
+    class Target(tl.HasTraits):
+        x = tl.Int(0)
+
+    class Component(mixins.HasSubscriptions):
+        pass
+
+    source = Source()
+    target = Target()
+    component = Component()
+    changes = []
+    live_count = mixins.Subscription.live_count()
+
+    component.subscribe(source, changes.append, "x")
+    component.dlink((source, "x"), (target, "x"), lambda x: 2 * x)
+    assert mixins.Subscription.live_count() == live_count + 2
+    source.x = 1
+    assert len(changes) == 1
+    assert target.x == 2
+
+    component.dispose_subscriptions()
+    assert not component.subscriptions
+    assert mixins.Subscription.live_count() == live_count
+    source.x = 2
+    assert len(changes) == 1
+    assert target.x == 2
+
+    with component.link((source, "x"), (target, "x")) as subscription:
+        source.x = 3
+        assert target.x == 3
+    assert subscription.is_disposed
+    source.x = 4
+    assert target.x == 3
+    assert mixins.Subscription.live_count() == live_count
+
+    kept = component.subscribe(source, changes.append, "x")
+    grouped = component.link((source, "x"), (target, "x"), group="refresh")
+    assert component.get_subscriptions("refresh") == [grouped]
+    component.dispose_subscriptions("refresh")
+    assert grouped.is_disposed
+    assert not kept.is_disposed
+    assert kept in component.subscriptions
+    assert grouped not in component.subscriptions
+    component.dispose_subscriptions()
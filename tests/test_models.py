@@ -1,4 +1,12 @@
+import pickle
+import typing as t
+
 from aiidalab_qe_base import models
+from aiidalab_qe_base.codes import get_code_index
+from aiidalab_qe_base.instrumentation import QueryRecorder
+
+if t.TYPE_CHECKING:
+    from .conftest import QueryBudget
 
 
 def test_code_model(default_user_email, pw_code):
@@ -27,6 +35,59 @@ def test_code_model(default_user_email, pw_code):
     assert model.num_nodes == 2
     assert model.num_cpus == 3
 
+    model.set_model_state(state)
+    assert model.selected == pw_code.uuid
+
+
+def test_code_model_options_index(default_user_email, pw_code):
+    model = models.CodeModel(
+        description="pw.x",
+        default_calc_job_plugin="quantumespresso.pw",
+    )
+    model.update(user_email=default_user_email)
+    full_label = f"{pw_code.label}@{pw_code.computer.label}"
+
+    with QueryRecorder() as recorder:
+        assert model._get_uuid(pw_code.uuid) == pw_code.uuid
+        assert model._get_uuid(full_label) == pw_code.uuid
+    assert not recorder.num_queries
+
+    assert model._get_uuid(pw_code.pk) == pw_code.uuid
+    recorder.reset()
+    with recorder:
+        assert model._get_uuid(str(pw_code.pk)) == pw_code.uuid  # resolved before
+    assert not recorder.num_queries
+
+    assert model._get_uuid("missing@localhost") is None
+
+    recorder.reset()
+    with recorder:
+        assert not model.update_model_state({"code": pw_code.uuid})
+    assert "CodeModel._get_uuid" not in recorder.stats  # kept as selected
+
+    model.options = []
+    assert model._get_uuid(pw_code.uuid) is None
+    assert model._get_uuid(full_label) is None
+
+    # A selection missing from the present options is not kept
+    model.selected = pw_code.uuid
+    assert model.update_model_state({"code": pw_code.uuid}) == ["selected"]
+    assert model.selected is None
+
+
+def test_code_model_query_budget(
+    query_budget: "QueryBudget",
+    default_user_email,
+    pw_code,
+):
+    model = models.PwCodeModel()
+    get_code_index().clear()
+    with query_budget(13, max_loads=0):  # indexes the user's codes
+        model.update(default_user_email)
+    assert model.selected == pw_code.uuid
+    with query_budget(6, max_loads=0):  # checks the index is up to date
+        model.update(default_user_email, refresh=True)
+
 
 def test_pw_code_model(default_user_email, pw_code):
     model = models.PwCodeModel()
@@ -43,3 +104,15 @@ def test_pw_code_model(default_user_email, pw_code):
     model.set_model_state({"parallelization": {"npool": 8}})
     assert model.parallelization_override
     assert model.npool == 8
+
+
+def test_code_model_pickling(default_user_email, pw_code):
+    model = models.PwCodeModel(name="pw")
+    model.update(user_email=default_user_email)
+    model.num_cpus = 4
+
+    clone: models.PwCodeModel = pickle.loads(pickle.dumps(model))
+    assert clone.get_model_state() == model.get_model_state()
+    clone.num_cpus = 8
+    assert clone.ntasks_per_node == 8  # observers are restored
+    assert model.num_cpus == 4
@@ -1,10 +1,18 @@
+import asyncio
+import threading
+import typing as t
+
 import pytest
 import traitlets as tl
 
+from aiidalab_qe_base.codes import get_code_index
 from aiidalab_qe_base.models.code import PwCodeModel
 from aiidalab_qe_base.panels import configuration, panel, resources, results, settings
 from aiidalab_qe_base.widgets.widgets import PwCodeResourceSetupWidget
 
+if t.TYPE_CHECKING:
+    from .conftest import QueryBudget
+
 
 class TestPanel:
     @pytest.fixture(autouse=True)
@@ -51,19 +59,202 @@ class TestConfigurationSettingsPanel:
         assert not self.panel.updated
         self.model.add_traits(dummy=tl.Unicode("dummy-trait"))
         self.panel.add_traits(dummy=tl.Unicode())
-        link = tl.dlink(
+        self.panel.dlink(
             (self.model, "dummy"),
             (self.panel, "dummy"),
+            group=self.panel.REFRESH_GROUP,
         )
+        kept = self.panel.subscribe(self.model, lambda _: None, "dummy")
         assert self.panel.dummy == self.model.dummy
-        self.panel.links.append(link)
         self.panel.refresh()
-        assert not self.panel.links
+        assert self.panel.subscriptions == [kept]  # only the refresh group
+        self.model.dummy = "changed"
+        assert self.panel.dummy == "dummy-trait"  # unlinked
         assert not self.panel.updated  # model not included - no update triggered
         self.model.include = True
         self.panel.refresh()
         assert self.panel.updated
 
+    def test_deprecated_links(self):
+        self.model.add_traits(dummy=tl.Unicode("dummy-trait"))
+        self.panel.add_traits(dummy=tl.Unicode())
+        self.panel.links.append(tl.dlink((self.model, "dummy"), (self.panel, "dummy")))
+        with pytest.warns(DeprecationWarning, match="links"):
+            self.panel.refresh()
+        assert not self.panel.links
+        self.model.dummy = "changed"
+        assert self.panel.dummy == "dummy-trait"  # unlinked
+
+        self.panel.dlink(
+            (self.model, "dummy"),
+            (self.panel, "dummy"),
+            group=self.panel.REFRESH_GROUP,
+        )
+        with pytest.warns(DeprecationWarning, match="_unsubscribe"):
+            self.panel._unsubscribe()
+        assert not self.panel.subscriptions
+
+        self.panel.links.append(tl.dlink((self.model, "dummy"), (self.panel, "dummy")))
+        with pytest.warns(DeprecationWarning, match="links"):
+            self.panel.close()
+        assert not self.panel.links
+
+    def test_default_dependencies(self):
+        class DummyModel(configuration.ConfigurationSettingsModel):
+            default_dependencies = {
+                "b": ["a"],
+                "c": ["a", "protocol"],
+            }
+            memoize_defaults = True
+
+            a = tl.Int(1)
+            protocol = tl.Unicode("moderate")
+            b = tl.Int()
+            c = tl.Unicode()
+
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, **kwargs)
+                self.computed = []
+
+            def _compute_default(self, trait):
+                self.computed.append(trait)
+                if trait == "b":
+                    return 2 * self.a
+                return f"{self.protocol}-{self.a}"
+
+        assert not configuration.ConfigurationSettingsModel.memoize_defaults
+        DummyModel._defaults_cache.clear()
+        model = DummyModel(include=True)
+        panel = configuration.ConfigurationSettingsPanel(model)
+        assert model.dirty_defaults == {"b", "c"}
+
+        panel.refresh()
+        assert sorted(model.computed) == ["b", "c"]
+        assert not model.dirty_defaults
+        assert model._get_default("b") == 2
+        assert model._get_default("c") == "moderate-1"
+
+        model.computed.clear()
+        panel.refresh()
+        assert not model.computed  # nothing changed
+
+        model.protocol = "fast"
+        assert model.dirty_defaults == {"c"}
+        panel.update()  # outdated defaults are updated despite `updated`
+        assert model.computed == ["c"]
+        assert model._get_default("c") == "fast-1"
+
+        model.computed.clear()
+        model.a = 3
+        assert model._get_default("b") == 6  # computed on demand
+        assert model.computed == ["b"]
+        assert model.dirty_defaults == {"c"}
+
+        # Memoized across instances and input changes, if opted in
+        model.computed.clear()
+        model.a = 1
+        model.protocol = "moderate"
+        assert model._get_default("c") == "moderate-1"
+        other = DummyModel()
+        assert other._get_default("b") == 2
+        assert not model.computed
+        assert not other.computed
+
+        model.memoize_defaults = False
+        model.a = 2
+        model.a = 1
+        assert model._get_default("b") == 2
+        assert model.computed == ["b"]
+
+        with pytest.raises(ValueError):
+
+            class InvalidModel(configuration.ConfigurationSettingsModel):
+                default_dependencies = {"b": ["missing"]}
+
+            InvalidModel()
+
+    def test_refresher(self):
+        class DummyModel(configuration.ConfigurationSettingsModel):
+            value = tl.Int(0)
+
+            def update(self, specific=""):
+                self.update_thread = threading.current_thread()
+                # The source of the links changes more than once
+                self.value += 1
+                self.value += 1
+
+        class Target(tl.HasTraits):
+            value = tl.Int(0)
+
+            @tl.observe("value")
+            def _on_value_change(self, _):
+                self.update_thread = threading.current_thread()
+
+        class DummyPanel(configuration.ConfigurationSettingsPanel):
+            def __init__(self, model, **kwargs):
+                super().__init__(model, **kwargs)
+                self.callback_threads = []
+                self.target = Target()
+                self.subscribe(self._model, self._on_value_change, "value")
+                self.link((self._model, "value"), (self.target, "value"))
+
+            def _on_value_change(self, _):
+                self.callback_threads.append(threading.current_thread())
+
+        panels = []
+        for identifier, include in (("a", True), ("b", True), ("c", False)):
+            model = DummyModel(include=include)
+            model.identifier = identifier
+            panels.append(DummyPanel(model))
+        # Links outside of the panels are also synced on the calling thread
+        user_target = Target()
+        tl.dlink((panels[0]._model, "value"), (user_target, "value"))
+
+        report = configuration.ConfigurationPanelRefresher().refresh(panels)
+        assert set(report.timings) == {"a", "b"}
+        assert report.skipped == ["c"]
+
+        main_thread = threading.current_thread()
+        for included in panels[:2]:
+            assert included.updated
+            assert included._model.value == 2
+            assert included._model.update_thread is not main_thread
+            assert included.callback_threads == [main_thread]
+            assert included.target.value == 2
+            assert included.target.update_thread is main_thread
+        assert user_target.value == 2
+        assert user_target.update_thread is main_thread
+        assert not panels[2].updated
+        assert panels[2]._model.value == 0
+
+        class FailingModel(DummyModel):
+            def update(self, specific=""):
+                raise RuntimeError("update failed")
+
+        model = FailingModel(include=True)
+        with pytest.raises(RuntimeError):
+            configuration.ConfigurationPanelRefresher().refresh(
+                [DummyPanel(model), panels[0]]
+            )
+        assert panels[0]._model.value == 4
+        assert len(panels[0].callback_threads) == 2
+
+        # A failing callback does not leave other panels deferred
+        class FailingPanel(DummyPanel):
+            def _on_value_change(self, _):
+                raise RuntimeError("callback failed")
+
+        failing = FailingPanel(DummyModel(include=True))
+        with pytest.raises(RuntimeError, match="callback failed"):
+            configuration.ConfigurationPanelRefresher().refresh([failing, panels[0]])
+        assert panels[0].target.value == 6
+        panels[0]._model.value = 7
+        assert panels[0].target.value == 7
+        failing.dispose_subscriptions()
+        failing.link((failing._model, "value"), (failing.target, "value"))
+        assert failing.target.value == 2
+        assert len(panels[0].callback_threads) == 4
+
 
 class TestResourcesPanel:
     @pytest.fixture(autouse=True)
@@ -96,6 +287,83 @@ class TestResourcesPanel:
         self.model.set_model_state({"codes": {"pw": code_model.get_model_state()}})
         assert code_model.selected == pw_code.uuid
 
+    def test_refresh_codes_async(self, pw_code):
+        release = threading.Event()
+        calls = []
+
+        class BlockingPwCodeModel(PwCodeModel):
+            def fetch_code_options(self, user_email="", default_code=None):
+                calls.append(user_email)
+                release.wait(timeout=10)
+                return super().fetch_code_options(user_email, default_code)
+
+        code_model = BlockingPwCodeModel(name="pw")
+        code_model.options = [("stale@localhost", "stale-uuid")]
+        code_model.selected = "stale-uuid"
+        self.model.add_model("pw", code_model)
+
+        selections = []
+        threads = set()
+
+        def on_change(_):
+            selections.append((code_model.options, code_model.selected))
+            threads.add(threading.current_thread())
+
+        code_model.observe(on_change, ["options", "selected"])
+        self.model.observe(
+            lambda _: threads.add(threading.current_thread()),
+            ["refreshing_codes", "code_refresh_progress"],
+        )
+
+        async def refresh():
+            first = self.model.refresh_codes_async()
+            assert self.model.refreshing_codes
+            # Overlapping requests are coalesced into a single follow-up refresh
+            second = self.model.refresh_codes_async()
+            assert self.model.refresh_codes_async() is second
+            assert second is not first
+
+            # Futures of the loop, resolved on its thread, are awaited
+            assert isinstance(first, asyncio.Future)
+            release.set()
+            assert await first is None
+            assert await second is None
+
+        asyncio.run(refresh())
+        assert not self.model.refreshing_codes
+        assert len(calls) == 2
+        assert self.model.code_refresh_progress == 1.0
+        assert code_model.selected == pw_code.uuid
+        # Traits are only set from the calling thread
+        assert threads == {threading.current_thread()}
+        # Observers never see a selection missing from the options
+        assert all(
+            selected in [uuid for _, uuid in options]
+            for options, selected in selections
+        )
+
+        # Without an event loop, the options are set from the worker thread
+        first = self.model.refresh_codes_async()
+        second = self.model.refresh_codes_async()
+        assert first.result(timeout=10) is None
+        assert second.result(timeout=10) is None
+        assert len(calls) in (3, 4)  # coalesced unless the first completed
+        assert not self.model.refreshing_codes
+
+    def test_panel_query_budget(self, query_budget: "QueryBudget", pw_code):
+        code_model = PwCodeModel(name="pw")
+        get_code_index().clear()
+        # Opening the panel indexes the codes and fetches the resources once
+        with query_budget(23, max_loads=1):
+            self.model.add_model("pw", code_model)
+            code_model.activate()
+            self.panel.rendered = True
+            self.panel._toggle_code(code_model)
+        assert self.panel.code_widgets["pw"].value == pw_code.uuid
+        with query_budget(8, max_loads=1):
+            code_model.selected = None
+            code_model.selected = pw_code.uuid
+
     def test_panel(self, default_user_email):
         assert not self.panel.code_widgets
         assert not self.panel.code_widgets_container.children
@@ -1,10 +1,15 @@
+import pickle
+
 import pytest
+import traitlets as tl
 
+from aiidalab_qe_base.mixins import Subscription
 from aiidalab_qe_base.models.code import PwCodeModel
 from aiidalab_qe_base.plugin.outline import PluginOutline
 from aiidalab_qe_base.plugin.panels.resources import (
     PluginResourceSettingsModel,
     PluginResourceSettingsPanel,
+    sync_plugin_codes,
 )
 
 
@@ -52,6 +57,40 @@ class TestPluginResourcePanel:
         self.model.set_model_state({"override": True})
         assert self.model.override
 
+    def test_sync_codes(self):
+        assert not self.model.sync_codes()  # already in sync
+
+        changes = []
+        self.code_model.observe(changes.append, tl.All)
+        self.model.global_codes = {
+            "quantumespresso__pw": {
+                **self.model.global_codes["quantumespresso__pw"],
+                "max_wallclock_seconds": 1200,
+            }
+        }
+        assert self.code_model.max_wallclock_seconds == 1200
+        assert [change["name"] for change in changes] == ["max_wallclock_seconds"]
+
+        # `ntasks_per_node` follows `num_cpus`, so is not set again
+        self.code_model.num_cpus = 1
+        assert sync_plugin_codes([self.model]) == {
+            self.model.identifier: {"pw": ["num_cpus"]}
+        }
+        assert self.code_model.ntasks_per_node == 4
+
+        self.model.override = True
+        self.code_model.num_nodes = 1
+        assert not sync_plugin_codes([self.model])
+
+    def test_model_pickling(self):
+        clone: PluginResourceSettingsModel = pickle.loads(pickle.dumps(self.model))
+        assert clone.get_model_state() == self.model.get_model_state()
+        clone_code_model = clone.get_model("pw")
+        assert clone_code_model is not self.code_model
+        clone.override = True
+        assert clone_code_model.override  # model links are restored
+        assert not self.code_model.override
+
     def test_panel(self):
         self.panel.render()
 
@@ -66,3 +105,16 @@ class TestPluginResourcePanel:
         self.model.override = False
         selected = self.code_model.selected
         assert code_widget.code_selection.code_select_dropdown.value == selected
+
+    def test_panel_close(self):
+        self.panel.render()
+        code_widget = self.panel.code_widgets["pw"]
+        live_count = Subscription.live_count()
+        assert self.panel.subscriptions
+
+        self.panel.close()
+        assert not self.panel.subscriptions
+        assert Subscription.live_count() < live_count
+
+        self.model.override = True
+        assert code_widget.num_cpus.disabled  # no longer linked to the model
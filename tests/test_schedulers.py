@@ -0,0 +1,67 @@
+import pytest
+
+from aiidalab_qe_base import schedulers
+
+CODE_INFO = {
+    "nodes": 2,
+    "ntasks_per_node": 3,
+    "cpus_per_task": 4,
+}
+
+
+@pytest.mark.parametrize(
+    "scheduler_type",
+    ["core.direct", "core.slurm", "core.pbspro", "core.torque", None, "unknown"],
+)
+def test_node_number_adapter(scheduler_type):
+    adapter = schedulers.get_scheduler_adapter(scheduler_type)
+    assert isinstance(adapter, schedulers.NodeNumberSchedulerAdapter)
+    assert adapter.get_resources(CODE_INFO) == {
+        "num_machines": 2,
+        "num_mpiprocs_per_machine": 3,
+        "num_cores_per_mpiproc": 4,
+    }
+
+
+def test_lsf_adapter():
+    adapter = schedulers.get_scheduler_adapter("core.lsf")
+    with pytest.warns(UserWarning, match="cpus_per_task"):
+        assert adapter.get_resources(CODE_INFO) == {
+            "tot_num_mpiprocs": 6,
+            "use_num_machines": True,
+            "num_machines": 2,
+        }
+    assert adapter.get_resources({**CODE_INFO, "nodes": 1, "cpus_per_task": 1}) == {
+        "tot_num_mpiprocs": 3,
+    }
+
+
+def test_hyperqueue_adapter():
+    adapter = schedulers.get_scheduler_adapter("hyperqueue")
+    assert adapter.get_resources(CODE_INFO) == {"num_cpus": 24}
+
+
+def test_adapter_validation():
+    adapter = schedulers.get_scheduler_adapter("core.slurm")
+    with pytest.raises(ValueError):
+        adapter.get_resources({**CODE_INFO, "ntasks_per_node": 0})
+    with pytest.raises(ValueError):
+        adapter.get_resources({"nodes": 1})
+    with pytest.raises(ValueError):
+        adapter.get_resources({**CODE_INFO, "nodes": True})
+
+
+def test_register_scheduler_adapter(monkeypatch):
+    monkeypatch.setattr(schedulers, "_ADAPTERS", dict(schedulers._ADAPTERS))
+
+    class CustomAdapter(schedulers.SchedulerAdapter):
+        def _translate(self, code_info):
+            return {"tot_num_mpiprocs": code_info["nodes"]}
+
+    schedulers.register_scheduler_adapter("custom", CustomAdapter())
+    assert schedulers.get_scheduler_adapter("custom").get_resources(CODE_INFO) == {
+        "tot_num_mpiprocs": 2
+    }
+
+    with pytest.raises(TypeError):
+        schedulers.register_scheduler_adapter("custom", object())  # type: ignore
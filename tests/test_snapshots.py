@@ -0,0 +1,176 @@
+import json
+
+import pytest
+import traitlets as tl
+
+from aiidalab_qe_base.mixins import HasBlockers, HasModels
+from aiidalab_qe_base.models import Model
+from aiidalab_qe_base.panels.settings import SettingsModel
+from aiidalab_qe_base.snapshots import ModelSnapshot, StateStore, state_key
+
+
+class DummySettingsModel(SettingsModel):
+    value = tl.Int(0)
+    options = tl.List(tl.Unicode())
+    extra = tl.Dict()
+
+    def get_model_state(self):
+        return {
+            "value": self.value,
+            "options": self.options,
+            "extra": self.extra,
+        }
+
+    def set_model_state(self, parameters: dict):
+        self.value = parameters.get("value", 0)
+        self.options = parameters.get("options", [])
+        self.extra = parameters.get("extra", {})
+
+
+class Parent(Model, HasModels[Model], HasBlockers):
+    pass
+
+
+@pytest.fixture
+def tree():
+    parent = Parent()
+    parent.add_models(
+        {
+            "a": DummySettingsModel(),
+            "b": DummySettingsModel(),
+        }
+    )
+    return parent
+
+
+def test_snapshot_capture(tree: Parent):
+    snapshot = ModelSnapshot.capture(tree)
+    assert sorted(snapshot.paths) == ["a", "b"]
+    assert snapshot.get_state("a") == {"value": 0, "options": [], "extra": {}}
+
+    same = ModelSnapshot.capture(tree)
+    assert snapshot == same
+    assert hash(snapshot) == hash(same)
+    assert not snapshot.diff(same)
+
+    tree.get_model("b").extra = {"nested": {"x": 1}}
+    changed = ModelSnapshot.capture(tree)
+    assert changed != snapshot
+
+    diff = snapshot.diff(changed)
+    assert diff.models == {"b"}
+    assert diff.changed == {("b", "extra", "nested", "x"): 1}
+    assert diff.removed == {("b", "extra")}
+
+
+def test_snapshot_restore(tree: Parent):
+    a, b = tree.get_model("a"), tree.get_model("b")
+    a.value = 1
+    b.options = ["x", "y"]
+    snapshot = ModelSnapshot.capture(tree)
+
+    a.value = 2
+    b.options = ["z"]
+    b.extra = {"k": "v"}
+
+    a_changes = []
+    a.observe(a_changes.append, "value")
+    b_changes = []
+    b.observe(b_changes.append, tl.All)
+
+    diff = snapshot.restore(tree)
+    assert diff.models == {"a", "b"}
+    assert a.value == 1
+    assert b.options == ["x", "y"]
+    assert b.extra == {}
+    assert len(a_changes) == 1
+    assert {change["name"] for change in b_changes} == {"options", "extra"}
+
+    # Nothing to restore
+    b_changes.clear()
+    assert not snapshot.restore(tree)
+    assert not b_changes
+
+
+def test_snapshot_serialization(tree: Parent):
+    tree.get_model("a").extra = {"nested": {}, "list": [1, [2, 3]]}
+    snapshot = ModelSnapshot.capture(tree)
+
+    data = json.loads(json.dumps(snapshot.to_dict()))
+    assert data["version"] == ModelSnapshot.VERSION
+    loaded = ModelSnapshot.from_dict(data)
+    assert loaded == snapshot
+    assert loaded.get_state("a")["extra"] == {"nested": {}, "list": [1, [2, 3]]}
+
+    with pytest.raises(ValueError):
+        ModelSnapshot.from_dict({**data, "version": 0})
+
+
+def test_snapshot_nested_dicts(tree: Parent):
+    a = tree.get_model("a")
+    kinds = [{"name": "Si", "mass": 28.0}, {"name": "O", "mass": 16.0}]
+    a.extra = {"kinds": kinds, "pairs": [[1, {"x": [2]}]]}
+    snapshot = ModelSnapshot.capture(tree)
+    assert snapshot.get_state("a")["extra"] == {
+        "kinds": kinds,
+        "pairs": [[1, {"x": [2]}]],
+    }
+
+    data = json.loads(json.dumps(snapshot.to_dict()))
+    assert data["states"]["a"]["extra"]["kinds"] == kinds
+    loaded = ModelSnapshot.from_dict(data)
+    assert loaded == snapshot
+
+    # A list of pairs is not confused with a dictionary
+    a.extra = {"kinds": [[["mass", 28.0], ["name", "Si"]]]}
+    assert ModelSnapshot.capture(tree) != snapshot
+
+    loaded.restore(tree)
+    assert a.extra["kinds"] == kinds
+
+
+def test_snapshot_unsupported_value(tree: Parent):
+    tree.get_model("a").extra = {"tags": {"x", "y"}}
+    with pytest.raises(TypeError, match="set.*extra.tags"):
+        ModelSnapshot.capture(tree)
+
+
+def test_state_key():
+    assert state_key({"a": 1, "b": [1, 2]}) == state_key({"b": (1, 2), "a": 1})
+    assert state_key({"a": 1}) != state_key({"a": 2})
+
+
+def test_state_store(tree: Parent):
+    a, b = tree.get_model("a"), tree.get_model("b")
+    store = StateStore(max_size=2)
+
+    first = store.add(tree)
+    assert store.add(ModelSnapshot.capture(tree)) == first  # deduplicated
+    assert len(store) == 1
+    assert store.num_states == 1  # identical states of `a` and `b` are shared
+
+    a.value = 1
+    second = store.add(tree)
+    assert len(store) == 2
+    assert store.num_states == 2
+    assert store.keys() == [second, first]
+
+    diff = store.apply(first, tree)
+    assert diff.models == {"a"}
+    assert a.value == 0
+    assert store.keys() == [first, second]
+
+    b.value = 2
+    third = store.add(tree)
+    assert second not in store  # least recently used
+    assert store.keys() == [third, first]
+    assert store.num_states == 2  # the state with `value == 1` is released
+
+    store.apply(third, tree)
+    assert (a.value, b.value) == (0, 2)
+
+    with pytest.raises(KeyError):
+        store.get(second)
+
+    with pytest.raises(ValueError):
+        StateStore(max_size=0)
@@ -0,0 +1,83 @@
+import typing as t
+
+from aiida import orm
+
+from aiidalab_qe_base import structures
+
+if t.TYPE_CHECKING:
+    from .conftest import StructureDataGenerator
+
+
+def test_structure_descriptors(generate_structure_data: "StructureDataGenerator"):
+    structure = generate_structure_data("silica")
+    descriptors = structures.get_structure_descriptors(structure)
+
+    assert descriptors.pbc == (True, True, True)
+    assert not descriptors.has_tags
+    assert descriptors.kind_names == ["Si", "O"]
+    assert descriptors.kind_counts == {"Si": 2, "O": 4}
+    assert descriptors.num_atoms == 6
+    assert descriptors.composition == structure.get_composition()
+    assert abs(descriptors.cell_volume - structure.get_cell_volume()) < 1e-8
+
+    kpoints = orm.KpointsData()
+    kpoints.set_cell_from_structure(structure)
+    kpoints.set_kpoints_mesh_from_density(0.3)
+    mesh, _ = kpoints.get_kpoints_mesh()
+    assert descriptors.get_kpoints_mesh(0.3) == mesh
+    assert descriptors.num_kpoints == descriptors.estimate_num_kpoints(
+        structures.DEFAULT_KPOINTS_DISTANCE
+    )
+
+    molecule = generate_structure_data("water", pbc=(False, False, False))
+    assert structures.get_structure_descriptors(molecule).num_kpoints == 1
+
+
+def test_structure_descriptors_cache(
+    generate_structure_data: "StructureDataGenerator",
+):
+    structure = generate_structure_data()
+    # Unstored structures may be modified and are not cached
+    assert structures.get_structure_descriptors(
+        structure
+    ) is not structures.get_structure_descriptors(structure)
+
+    structure.store()
+    descriptors = structures.get_structure_descriptors(structure)
+    assert structures.get_structure_descriptors(structure) is descriptors
+    loaded = orm.load_node(structure.pk)
+    assert structures.get_structure_descriptors(loaded) is descriptors
+
+
+def test_structure_arrays(generate_structure_data: "StructureDataGenerator"):
+    structure = generate_structure_data("silica")
+    descriptors = structures.get_structure_descriptors(structure)
+
+    assert descriptors.positions.shape == (6, 3)
+    assert descriptors.positions.tolist() == [
+        list(site.position) for site in structure.sites
+    ]
+    assert descriptors.cell.tolist() == structure.cell
+    assert descriptors.species.tolist() == [0, 0, 1, 1, 1, 1]
+    assert descriptors.kind_masses.tolist() == [kind.mass for kind in structure.kinds]
+
+    for array in (
+        descriptors.positions,
+        descriptors.cell,
+        descriptors.species,
+        descriptors.kind_masses,
+    ):
+        assert not array.flags.writeable
+
+
+def test_structure_fingerprint(generate_structure_data: "StructureDataGenerator"):
+    structure = generate_structure_data()
+    fingerprint = structures.get_structure_fingerprint(structure)
+    assert fingerprint == structures.get_structure_fingerprint(
+        generate_structure_data()
+    )
+    assert fingerprint != structures.get_structure_fingerprint(
+        generate_structure_data("silica")
+    )
+    structure.store()
+    assert structures.get_structure_fingerprint(structure) == structure.uuid
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta, timezone
 
+import numpy as np
 import pytest
 
 from aiidalab_qe_base import utils
@@ -102,3 +103,123 @@ def test_relative_time(delta, expected):
     past = now - delta
     label = utils.relative_time(past)
     assert expected in label
+
+
+def test_format_times():
+    times = [
+        datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone.utc),
+        datetime(2024, 1, 1, 12, 0, 0, tzinfo=timezone(timedelta(hours=2))),
+        datetime(2024, 6, 30, 23, 59, 59, 999999),
+    ]
+    assert utils.format_times(times) == [utils.format_time(t) for t in times]
+    values = np.array(["2024-01-01T12:00:00.5", "NaT"], dtype="datetime64[ms]")
+    assert utils.format_times(values) == ["2024-01-01 12:00:00", "NaT"]
+    assert utils.format_times([]) == []
+
+
+def test_relative_times():
+    now = datetime(2024, 3, 31, 12, 0, 0, tzinfo=timezone.utc)
+    times = [
+        now - timedelta(seconds=1),
+        now - timedelta(seconds=30),
+        now - timedelta(minutes=59, seconds=59),
+        now - timedelta(hours=5),
+        now - timedelta(days=1),
+        datetime(2024, 3, 1, 13, 0, 0, tzinfo=timezone.utc),
+        datetime(2024, 2, 29, 12, 0, 0, tzinfo=timezone.utc),
+        datetime(2023, 3, 31, 13, 0, 0, tzinfo=timezone.utc),
+        datetime(2022, 1, 1, tzinfo=timezone(timedelta(hours=-5))),
+        now + timedelta(minutes=1),  # future
+    ]
+    assert utils.relative_times(times, now) == [
+        "1 second ago",
+        "30 seconds ago",
+        "59 minutes ago",
+        "5 hours ago",
+        "1 day ago",
+        "29 days ago",
+        "1 month ago",
+        "11 months ago",
+        "2 years ago",
+        "0 second ago",
+    ]
+
+    # Months are clamped to the end of shorter months, as by `relativedelta`
+    end_of_february = datetime(2023, 2, 28, 12, 0, 0)
+    assert utils.relative_times([datetime(2023, 1, 31)], end_of_february) == [
+        "1 month ago"
+    ]
+
+    values = np.array(["2024-01-01T00:00", "2024-02-01T00:00"], dtype="datetime64[s]")
+    assert utils.relative_times(values, np.datetime64("2024-03-01")) == [
+        "2 months ago",
+        "1 month ago",
+    ]
+    assert utils.relative_times([], now) == []
+
+    # Consistent with `relative_time`, away from second boundaries
+    current = datetime.now(timezone.utc)
+    deltas = [timedelta(minutes=3, seconds=30), timedelta(days=40, hours=1)]
+    pasts = [current - delta for delta in deltas]
+    assert utils.relative_times(pasts, current) == [
+        utils.relative_time(past) for past in pasts
+    ]
+
+
+def test_nested_dict():
+    shared = [1, 2]
+    original = utils.NestedDict({"a": {"b": shared}, "c": {"d": 1}})
+    assert original == {"a": {"b": (1, 2)}, "c": {"d": 1}}
+    assert original["a"]["b"] == (1, 2)  # lists are frozen
+    assert original["a"] is original["a"]
+    assert original._data is None  # reading copies nothing
+
+    frozen = original.freeze()
+    assert original.freeze() is frozen  # cached until modified
+
+    copied = original.copy()
+    assert copied == original
+    copied["a"]["b"] = [3]
+    assert original["a"]["b"] == (1, 2)
+    assert copied["a"]["b"] == (3,)
+    assert copied != original
+
+    # Unmodified branches are shared
+    assert copied.freeze()["c"] is frozen["c"]
+    assert copied.freeze()["a"] is not frozen["a"]
+    assert original.freeze() is frozen
+
+    # Assigned mappings are copied
+    branch = {"x": 1}
+    original["e"] = branch
+    branch["x"] = 2
+    assert original["e"]["x"] == 1
+    assert original.freeze() is not frozen
+
+    del original["e"]
+    assert original.freeze() == frozen
+    assert original.to_dict() == {"a": {"b": shared}, "c": {"d": 1}}
+
+    # Branches read before a modification remain attached
+    branch_a, branch_c = original["a"], original["c"]
+    original["f"] = 1
+    branch_a["x"] = 1
+    branch_c["y"] = 2
+    assert original["a"] is branch_a
+    assert original.to_dict()["a"] == {"b": [1, 2], "x": 1}
+    assert original.to_dict()["c"] == {"d": 1, "y": 2}
+
+    # Replaced branches are detached
+    original["a"] = {"z": 0}
+    branch_a["x"] = 2
+    assert original.to_dict()["a"] == {"z": 0}
+
+    thawed = frozen.thaw()
+    thawed["c"]["d"] = 2
+    assert frozen["c"]["d"] == 1
+    assert hash(frozen["c"]) == hash(utils.FrozenNestedDict({"d": 1}))
+
+    # Lists are frozen, so any frozen dictionary is hashable
+    listed = utils.FrozenNestedDict({"kinds": [{"name": "Si"}], "cell": [[1, 0]]})
+    assert hash(listed) == hash(utils.FrozenNestedDict(listed.to_dict()))
+    assert listed.to_dict() == {"kinds": [{"name": "Si"}], "cell": [[1, 0]]}
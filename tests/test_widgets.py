@@ -1,9 +1,18 @@
+import datetime
+import json
+import sys
+import types
+
 import ipywidgets as ipw
+import numpy as np
 import pytest
 import traitlets as tl
+from bs4 import BeautifulSoup
+from ipywidgets.widgets.widget import _remove_buffers
 
 from aiidalab_qe_base.widgets import (
     HBoxWithUnits,
+    InAppGuide,
     InfoBox,
     LazyLoader,
     LinkButton,
@@ -14,6 +23,7 @@ from aiidalab_qe_base.widgets import (
     ResourceDetailSettings,
     TableWidget,
 )
+from aiidalab_qe_base.widgets.widgets import GuideDispatcher, _AnimationScheduler
 
 
 def test_infobox():
@@ -32,6 +42,101 @@ def test_infobox():
     )
 
 
+GUIDES = {
+    "guide-a": "<div id='section'>Section A</div><div id='other'>Other</div>",
+    "guide-b": "<div id='section'>Section B</div>",
+}
+
+
+@pytest.fixture
+def guide_manager(monkeypatch):
+    """Injects a minimal global guide manager of the app."""
+
+    class GuideManager(tl.HasTraits):
+        active_guide = tl.Unicode("No guides")
+
+        def __init__(self):
+            super().__init__()
+            self.content = BeautifulSoup()
+            self.lookups = 0
+            self.observe(self._on_active_guide_change, "active_guide")
+
+        @property
+        def has_guide(self):
+            return self.active_guide != "No guides"
+
+        def get_guide_section_by_id(self, content_id):
+            self.lookups += 1
+            return self.content.find(attrs={"id": content_id})
+
+        def _on_active_guide_change(self, _):
+            html = GUIDES.get(self.active_guide, "")
+            self.content = BeautifulSoup(html, "html.parser")
+
+    manager = GuideManager()
+    module = types.ModuleType("aiidalab_qe.common.guide_manager")
+    module.guide_manager = manager  # type: ignore
+    for name in ("aiidalab_qe", "aiidalab_qe.common"):
+        monkeypatch.setitem(sys.modules, name, types.ModuleType(name))
+    monkeypatch.setitem(sys.modules, "aiidalab_qe.common.guide_manager", module)
+    return manager
+
+
+def test_in_app_guide(guide_manager):
+    with pytest.raises(ValueError):
+        InAppGuide()
+
+    hidden: InAppGuide = InAppGuide(identifier="section")
+    displayed: InAppGuide = InAppGuide(identifier="section")
+    displayed._view_count = 1  # as if rendered by the frontend
+    widget_based: InAppGuide = InAppGuide(
+        children=[ipw.HTML("content")],
+        guide_id="guide-b",
+    )
+    widget_based._view_count = 1
+    assert hidden.layout.display == "none"
+    assert widget_based.layout.display == "none"
+
+    dispatcher = displayed.dispatcher
+    assert dispatcher is hidden.dispatcher
+    assert set(dispatcher.get_guides("section")) == {hidden, displayed}
+
+    guide_manager.active_guide = "guide-a"
+    assert "Section A" in displayed.children[0].value
+    assert displayed.layout.display == "flex"
+    assert widget_based.layout.display == "none"
+    assert not hidden.children  # deferred until displayed
+    assert guide_manager.lookups == 0  # served from the section index
+
+    hidden._view_count = 1
+    assert "Section A" in hidden.children[0].value
+    assert hidden.layout.display == "flex"
+
+    guide_manager.active_guide = "guide-b"
+    assert "Section B" in displayed.children[0].value
+    assert widget_based.layout.display == "flex"
+
+    hidden.close()
+    assert dispatcher.get_guides("section") == [displayed]
+
+
+def test_guide_dispatcher_manager_change(guide_manager):
+    def get_dispatchers(manager) -> list:
+        observers = manager._trait_notifiers["active_guide"]["change"]
+        return [getattr(observer, "__self__", None) for observer in observers]
+
+    dispatcher = GuideDispatcher.get_instance(guide_manager)
+    assert dispatcher in get_dispatchers(guide_manager)
+
+    other_manager = type(guide_manager)()
+    other = GuideDispatcher.get_instance(other_manager)
+    assert other is not dispatcher
+    assert GuideDispatcher.get_instance(other_manager) is other
+    # The previous dispatcher no longer observes its manager
+    assert dispatcher not in get_dispatchers(guide_manager)
+    assert other in get_dispatchers(other_manager)
+
+
 def test_link_button():
     btn: LinkButton = LinkButton(description="Open", link="#", disabled=False)
     assert "disabled" not in btn._dom_classes
@@ -48,6 +153,146 @@ def test_table_widget():
     assert table.selected_rows == [1]
 
 
+def test_table_widget_patches():
+    table: TableWidget = TableWidget()
+    with pytest.raises(ValueError):
+        table.append_rows([[1, 2]])
+
+    data = [["h1", "h2"], [1, 2]]
+    table.data = data
+    messages = []
+    table.send = messages.append
+
+    table.append_rows([(3, 4), (5, 6)])
+    assert table.data == [["h1", "h2"], [1, 2], [3, 4], [5, 6]]
+    assert data == [["h1", "h2"], [1, 2]]  # caller's list is not mutated
+    assert messages[-1] == {"type": "append", "rows": [[3, 4], [5, 6]]}
+
+    table.update_rows({0: [7, 8]})
+    assert table.data[1] == [7, 8]
+    assert messages[-1] == {"type": "update", "rows": [[0, [7, 8]]]}
+
+    with pytest.raises(IndexError):
+        table.update_rows({3: [0, 0]})
+
+
+def test_table_widget_columns():
+    table: TableWidget = TableWidget(data=[["h1"], [1]])
+    table.set_columns(
+        {
+            "energy": np.array([1.0, 2.0, 3.0]),
+            "index": np.arange(3, dtype=np.int16),
+            "label": ["a", "b", "c"],
+        }
+    )
+    assert not table.data
+    assert table._schema == [
+        {"name": "energy", "dtype": "float64"},
+        {"name": "index", "dtype": "int16"},
+        {"name": "label", "dtype": "json"},
+    ]
+    energy, index, label = table._column_data
+    assert bytes(energy) == np.array([1.0, 2.0, 3.0], dtype="<f8").tobytes()
+    assert bytes(index) == np.arange(3, dtype="<i2").tobytes()
+    assert label == ["a", "b", "c"]
+    assert list(table.columns) == ["energy", "index", "label"]
+
+    _, _, buffers = _remove_buffers(table.get_state())
+    assert len(buffers) == 2  # numeric columns are sent as binary buffers
+
+    with pytest.raises(ValueError):
+        table.append_rows([[1, 2, "d"]])
+
+    with pytest.raises(ValueError):
+        table.set_columns({"a": [1, 2], "b": [1]})
+
+    table.set_columns(
+        {"time": np.array(["2024-01-01T12:00:00", "NaT"], dtype="datetime64[s]")}
+    )
+    assert table._schema == [{"name": "time", "dtype": "json"}]
+    assert table._column_data == [["2024-01-01T12:00:00", None]]
+    json.dumps(_remove_buffers(table.get_state())[0])  # serializable
+
+    # As queried for node `ctime`s
+    ctime = datetime.datetime(2024, 1, 1, 12, tzinfo=datetime.timezone.utc)
+    table.set_columns(
+        {
+            "ctime": np.array([ctime, None], dtype=object),
+            "date": [datetime.date(2024, 1, 2), datetime.date(2024, 1, 3)],
+        }
+    )
+    assert table._schema == [
+        {"name": "ctime", "dtype": "json"},
+        {"name": "date", "dtype": "json"},
+    ]
+    assert table._column_data == [
+        ["2024-01-01T12:00:00+00:00", None],
+        ["2024-01-02", "2024-01-03"],
+    ]
+    json.dumps(_remove_buffers(table.get_state())[0])  # serializable
+
+    table.data = [["h1"], [1]]
+    assert not table._schema
+    assert not table._column_data
+    assert not table.columns
+
+
+def test_table_widget_server_mode():
+    table: TableWidget = TableWidget()
+    rows = [["b", 2], ["a", 3], ["c", 1], ["d", None]]
+    table.serve_rows(["name", "value"], rows, row_ids=["id-b", "id-a", "id-c", "id-d"])
+    assert not table.data
+    assert table.num_rows == 4
+    assert table.get_page(1, 2) == ([["a", 3], ["c", 1]], ["id-a", "id-c"])
+
+    version = table._view_version
+    table.sort("value")
+    assert table._view_version == version + 1  # single view update
+    assert table.get_page(0, 4)[1] == ["id-c", "id-b", "id-a", "id-d"]
+    table.sort("name", ascending=False)
+    assert table.get_page(0, 4)[1] == ["id-d", "id-c", "id-b", "id-a"]
+    table.sort("value", ascending=False)
+    assert table.get_page(0, 4)[1] == ["id-a", "id-b", "id-c", "id-d"]  # None last
+    with pytest.raises(KeyError):
+        table.sort("missing")
+
+    table.filter(lambda row: row["value"] is not None and row["value"] > 1)
+    assert table.num_rows == 2
+    assert table.get_page(0, 10)[1] == ["id-a", "id-b"]  # still sorted
+    table.filter(None)
+    assert table.num_rows == 4
+
+    messages = []
+    table.send = messages.append
+    table._on_custom_msg(table, {"type": "request_page", "offset": 0, "limit": 1}, [])
+    assert messages[-1] == {
+        "type": "page",
+        "version": table._view_version,
+        "offset": 0,
+        "rows": [["a", 3]],
+        "ids": ["id-a"],
+    }
+
+    with pytest.raises(ValueError):
+        table.append_rows([["e", 5]])
+    with pytest.raises(ValueError):
+        table.serve_rows(["name"], [["a"], ["b"]], row_ids=[0])
+    with pytest.raises(ValueError):
+        table.serve_rows(["name"], [["a"], ["b"]], row_ids=[0, 0])
+
+    # Mixed-type columns are sorted by type, then value
+    table.serve_rows(["value"], [["b"], [2], [None], [1.5], ["a"]])
+    table.sort("value")
+    assert table.get_page(0, 5)[0] == [[1.5], [2], ["a"], ["b"], [None]]
+    table.sort("value", ascending=False)
+    assert table.get_page(0, 5)[0] == [["b"], ["a"], [2], [1.5], [None]]
+
+    table.data = [["h1"], [1]]
+    assert table._mode == "rows"
+    assert not table._server_header
+    assert table.num_rows == 1
+
+
 def test_hbox_with_units():
     widget: ipw.IntText = ipw.IntText(value=5)
     box: HBoxWithUnits = HBoxWithUnits(widget, "eV")
@@ -84,6 +329,84 @@ def test_progress_bar():
     pb.value = 0.5
 
 
+@pytest.fixture
+def animation_clock(monkeypatch) -> list[float]:
+    """Replaces the animation scheduler of progress bars by one driven by
+    `step`, whose clock reads the returned (mutable) time."""
+    now = [0.0]
+    scheduler = _AnimationScheduler(clock=lambda: now[0], threaded=False)
+    monkeypatch.setattr(ProgressBar, "_scheduler", scheduler)
+    return now
+
+
+def test_progress_bar_animation(animation_clock: list[float]):
+    pb1: ProgressBar = ProgressBar()
+    pb2: ProgressBar = ProgressBar()
+    scheduler = ProgressBar._scheduler
+
+    pb1.value = ProgressBar.AnimationRate(1.0)
+    pb2.value = ProgressBar.AnimationRate(0.5)
+    assert scheduler.has_bar(pb1)
+    assert scheduler.has_bar(pb2)
+    animation_clock[0] = 0.25
+    assert scheduler.step()
+    assert pb1._progress_bar.value == 0.25
+    assert pb2._progress_bar.value == 0.125
+
+    pb1.value = 0.5
+    assert not scheduler.has_bar(pb1)
+    animation_clock[0] = 0.5
+    assert scheduler.step()
+    assert pb1._progress_bar.value == 0.5  # no longer animated
+    assert pb2._progress_bar.value == 0.25
+
+    pb2.value = 0.0
+    assert not scheduler.step()
+
+    # Closed bars stop being animated
+    pb1.value = ProgressBar.AnimationRate(1.0)
+    pb1.close()
+    assert not scheduler.has_bar(pb1)
+    assert not scheduler.step()
+
+    with pytest.raises(ValueError):
+        ProgressBar.set_animation_frame_rate(0)
+
+
+def test_progress_bar_animation_failure(animation_clock: list[float]):
+    class BrokenBar(ProgressBar):
+        def _set_frame(self, value):
+            raise RuntimeError("broken")
+
+    scheduler = ProgressBar._scheduler
+    broken: ProgressBar = BrokenBar()
+    pb: ProgressBar = ProgressBar()
+    broken.value = ProgressBar.AnimationRate(1.0)
+    pb.value = ProgressBar.AnimationRate(1.0)
+
+    animation_clock[0] = 0.5
+    assert scheduler.step()  # the other bar is still animated
+    assert not scheduler.has_bar(broken)
+    assert pb._progress_bar.value == 0.5
+
+    # The failing bar may be animated again
+    broken.value = 0.0
+    broken.value = ProgressBar.AnimationRate(1.0)
+    assert scheduler.has_bar(broken)
+
+
+def test_progress_bar_animation_thread():
+    scheduler = _AnimationScheduler(frame_rate=100)
+    pb: ProgressBar = ProgressBar()
+    scheduler.add(pb)
+    thread = scheduler._thread
+    assert scheduler.is_running
+    scheduler.remove(pb)
+    assert thread is not None
+    thread.join(timeout=10)
+    assert not scheduler.is_running  # exits once no bars remain
+
+
 def test_resource_detail_settings():
     widget: ResourceDetailSettings = ResourceDetailSettings()
     params = {